@@ -4,7 +4,7 @@ API REST pour déclencher les robots RPA Sage X3
 FastAPI avec endpoints pour chaque module
 """
 from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import os
@@ -18,6 +18,7 @@ import shutil
 from modules.lettrage.lettrage_robot import LettrageRobot
 from modules.bonne_commande.bonne_commande_robot import BonneCommandeRobot
 from core.logger import Logger
+from core.metrics import REGISTRY, CONTENT_TYPE, observe_task
 
 app = FastAPI(
     title="Sage X3 RPA API",
@@ -31,6 +32,19 @@ logger = Logger.get_logger('api', 'api')
 # Stockage des tâches en cours
 tasks_status: Dict[str, Dict[str, Any]] = {}
 
+# Tâches de l'API par module et statut (calculé à chaque export /metrics)
+API_TASKS = REGISTRY.gauge('rpa_api_tasks', "Tâches lancées via l'API par module et statut", ('module', 'status'))
+
+
+def collect_api_tasks():
+    """Mettre à jour la jauge des tâches de l'API"""
+    API_TASKS.clear()
+    for task in list(tasks_status.values()):
+        API_TASKS.inc(module=task['module'], status=task['status'])
+
+
+REGISTRY.register_collector(collect_api_tasks)
+
 # Dossier pour les fichiers uploadés
 UPLOAD_DIR = Path("data/input/excel/api_uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -58,6 +72,7 @@ class TaskStatus(BaseModel):
     task_id: str
     status: str  # pending, running, completed, failed
     module: str
+    created_at: Optional[str] = None
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
@@ -68,11 +83,23 @@ class TaskStatus(BaseModel):
 # FONCTIONS D'EXÉCUTION EN ARRIÈRE-PLAN
 # ============================================================================
 
+def _task_metrics(task_id: str) -> Dict[str, Any]:
+    """Adapter une tâche de l'API au format attendu par observe_task"""
+    task = tasks_status[task_id]
+    return {
+        'task_type': task['module'],
+        'created_at': task.get('created_at'),
+        'started_at': task.get('started_at'),
+        'completed_at': task.get('completed_at'),
+    }
+
+
 def execute_lettrage(task_id: str, excel_file: str, url: str, headless: bool):
     """Exécuter le lettrage en arrière-plan"""
     try:
         tasks_status[task_id]['status'] = 'running'
         tasks_status[task_id]['started_at'] = datetime.now().isoformat()
+        observe_task(_task_metrics(task_id))
         
         logger.info(f"🚀 Démarrage tâche lettrage: {task_id}")
         
@@ -87,6 +114,7 @@ def execute_lettrage(task_id: str, excel_file: str, url: str, headless: bool):
         
         tasks_status[task_id]['status'] = 'completed'
         tasks_status[task_id]['completed_at'] = datetime.now().isoformat()
+        observe_task(_task_metrics(task_id), status='completed')
         tasks_status[task_id]['result'] = {
             'total': summary.get('total', 0),
             'succes': summary.get('succes', 0),
@@ -101,6 +129,7 @@ def execute_lettrage(task_id: str, excel_file: str, url: str, headless: bool):
         tasks_status[task_id]['status'] = 'failed'
         tasks_status[task_id]['completed_at'] = datetime.now().isoformat()
         tasks_status[task_id]['error'] = str(e)
+        observe_task(_task_metrics(task_id), status='failed')
 
 
 def execute_bonne_commande(task_id: str, excel_file: str, headless: bool):
@@ -108,6 +137,7 @@ def execute_bonne_commande(task_id: str, excel_file: str, headless: bool):
     try:
         tasks_status[task_id]['status'] = 'running'
         tasks_status[task_id]['started_at'] = datetime.now().isoformat()
+        observe_task(_task_metrics(task_id))
         
         logger.info(f"🚀 Démarrage tâche bonne commande: {task_id}")
         
@@ -122,6 +152,7 @@ def execute_bonne_commande(task_id: str, excel_file: str, headless: bool):
         
         tasks_status[task_id]['status'] = 'completed'
         tasks_status[task_id]['completed_at'] = datetime.now().isoformat()
+        observe_task(_task_metrics(task_id), status='completed')
         tasks_status[task_id]['result'] = {
             'total': summary.get('total', 0),
             'succes': summary.get('succes', 0),
@@ -136,6 +167,7 @@ def execute_bonne_commande(task_id: str, excel_file: str, headless: bool):
         tasks_status[task_id]['status'] = 'failed'
         tasks_status[task_id]['completed_at'] = datetime.now().isoformat()
         tasks_status[task_id]['error'] = str(e)
+        observe_task(_task_metrics(task_id), status='failed')
 
 
 # ============================================================================
@@ -153,7 +185,8 @@ async def root():
             "bonne_commande": "/api/bonne-commande",
             "upload": "/api/upload",
             "status": "/api/task/{task_id}",
-            "tasks": "/api/tasks"
+            "tasks": "/api/tasks",
+            "metrics": "/metrics"
         }
     }
 
@@ -167,6 +200,17 @@ async def health():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Exporter les métriques au format texte Prometheus
+
+    Profondeur de file, latences des tâches, durées des étapes,
+    compteurs succès/échec, navigateurs ouverts, envois web en attente
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.post("/api/lettrage", response_model=TaskStatus)
 async def trigger_lettrage(request: LettrageRequest, background_tasks: BackgroundTasks):
     """
@@ -196,6 +240,7 @@ async def trigger_lettrage(request: LettrageRequest, background_tasks: Backgroun
         'task_id': task_id,
         'status': 'pending',
         'module': 'lettrage',
+        'created_at': datetime.now().isoformat(),
         'started_at': None,
         'completed_at': None,
         'result': None,
@@ -239,6 +284,7 @@ async def trigger_bonne_commande(request: BonneCommandeRequest, background_tasks
         'task_id': task_id,
         'status': 'pending',
         'module': 'bonne_commande',
+        'created_at': datetime.now().isoformat(),
         'started_at': None,
         'completed_at': None,
         'result': None,
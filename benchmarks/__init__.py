@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de débit des robots (serveur Syracuse local, jeux de données synthétiques)
+"""
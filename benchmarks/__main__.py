@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Lancer les benchmarks de débit
+
+Exemples d'utilisation:
+    python -m benchmarks                                  # tous les robots, 10/100/1000 lignes
+    python -m benchmarks --robots lettrage --sizes 10,100
+    python -m benchmarks --save-baseline                  # mettre à jour la baseline
+    python -m benchmarks --check                          # échoue (code 1) en cas de régression
+    python -m benchmarks --browser-profiles standard,performance  # comparer les profils Chrome
+"""
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.datasets import SIZES
+from benchmarks.gate import BASELINE_DIR, charger_baseline, comparer, comparer_profils, sauvegarder_baseline
+from benchmarks.runner import ROBOTS, executer_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks de débit des robots Sage X3')
+    parser.add_argument('--robots', default=','.join(ROBOTS), help='Robots à mesurer (séparés par des virgules)')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in SIZES), help='Tailles des fichiers')
+    parser.add_argument('--baseline', default=str(BASELINE_DIR / 'baseline.json'), help='Fichier de baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='Enregistrer les résultats comme baseline')
+    parser.add_argument('--check', action='store_true', help='Comparer à la baseline et échouer si régression')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Dégradation tolérée (0.15 = 15%%)')
+    parser.add_argument('--latency-ms', type=int, default=None, help='Latence du serveur local')
+    parser.add_argument('--failure-rate', type=float, default=None, help="Taux d'échec du serveur local")
+    parser.add_argument('--headed', action='store_true', help='Afficher Chrome')
+    parser.add_argument('--browser-profiles', default='standard',
+                        help='Profils Chrome à mesurer (standard, performance, séparés par des virgules)')
+    parser.add_argument('--output', default=None, help='Fichier JSON des résultats')
+    args = parser.parse_args()
+
+    stand_in_config = {k: v for k, v in {
+        'latency_ms': args.latency_ms,
+        'failure_rate': args.failure_rate,
+    }.items() if v is not None}
+
+    profils = [p.strip() for p in args.browser_profiles.split(',') if p.strip()]
+    resultats = []
+    with tempfile.TemporaryDirectory(prefix='rpa_bench_') as dossier:
+        for nom in [r.strip() for r in args.robots.split(',') if r.strip()]:
+            for rows in [int(s) for s in args.sizes.split(',') if s.strip()]:
+                for profil in profils:
+                    resultats.append(executer_benchmark(nom, rows, Path(dossier), headless=not args.headed,
+                                                        stand_in_config=stand_in_config,
+                                                        browser_profile=profil))
+
+    print(json.dumps(resultats, indent=2, ensure_ascii=False))
+    if len(profils) > 1:
+        print("🌐 Profils Chrome comparés au profil standard:")
+        for ligne in comparer_profils(resultats):
+            print(f"   - {ligne}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(resultats, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    if args.check:
+        regressions = comparer(resultats, charger_baseline(Path(args.baseline)), args.tolerance)
+        if regressions:
+            print("❌ Régressions détectées:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("✅ Aucune régression")
+
+    if args.save_baseline:
+        print(f"💾 Baseline: {sauvegarder_baseline(Path(args.baseline), resultats)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Jeux de données synthétiques des benchmarks
+
+Les fichiers Excel sont produits par les générateurs de tests/fixtures ; les
+données à charger dans le serveur Syracuse local en sont dérivées pour que
+chaque ligne soit traitable.
+"""
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from tests.fixtures.generators import GENERATEURS
+
+SIZES = (10, 100, 1000)
+
+# Distributions des benchmarks : ≈20 lignes par fournisseur, sans bruit
+DISTRIBUTIONS = {
+    'bonne_commande': lambda rows: {'fournisseurs': max(1, rows // 20), 'das_par_fournisseur': 4,
+                                    'repartition': 'uniforme'},
+    'receiption': lambda rows: {'fournisseurs': max(1, rows // 20), 'bcs_par_fournisseur': 4,
+                                'repartition': 'uniforme'},
+    'lettrage': lambda rows: {'fournisseurs': rows},
+    'facturation': lambda rows: {'fournisseurs': rows},
+}
+
+
+def _donnees_syracuse(robot: str, df: pd.DataFrame) -> Dict[str, List[Dict]]:
+    """Données du serveur local correspondant au fichier d'entrée"""
+    if robot == 'bonne_commande':
+        das = df.drop_duplicates('Numero_DA')
+        return {'das': [{'numero': r.Numero_DA, 'acheteur': r.Acheteur, 'fournisseur': r.Code_Fournisseur}
+                        for r in das.itertuples(index=False)]}
+
+    if robot == 'receiption':
+        commandes = []
+        for (fournisseur, n_bc), groupe in df.groupby(['CodeFrs', 'N_BC'], sort=False):
+            lignes = groupe.drop_duplicates('CodeArticle')
+            commandes.append({
+                'fournisseur': fournisseur,
+                'bc': n_bc,
+                'date': groupe['DateBC'].iloc[0].strftime('%d/%m/%Y'),
+                'articles': [{'code': code, 'quantite': int(qte)}
+                             for code, qte in zip(lignes['CodeArticle'], lignes['Quantite'])],
+            })
+        return {'commandes': commandes}
+
+    if robot == 'lettrage':
+        ecritures = []
+        for compte, code, facture, avis in zip(df['Compte'], df['Code'], df['Facture'], df['N-Avis']):
+            ecritures.append({'compte': compte, 'code': code, 'numero': facture, 'type': 'FAF',
+                              'date': '02/01/2026', 'credit': '1 200,00', 'libelle': 'Facture'})
+            ecritures.append({'compte': compte, 'code': code, 'numero': avis, 'type': 'REG',
+                              'date': '15/01/2026', 'debit': '1 200,00', 'libelle': 'Règlement'})
+        return {'ecritures': ecritures}
+
+    if robot == 'facturation':
+        return {'receptions': [{'fournisseur': r.Code, 'br': r.BR, 'montant_ht': '200.00', 'taxe': '-40.00'}
+                               for r in df.itertuples(index=False)]}
+
+    raise ValueError(f"Robot inconnu: {robot}")
+
+
+def generer_dataset(robot: str, rows: int, dossier: Path) -> Tuple[Path, Dict[str, List[Dict]]]:
+    """
+    Générer le fichier Excel d'un robot et les données Syracuse associées
+
+    Args:
+        robot: Nom du robot (bonne_commande, receiption, lettrage, facturation)
+        rows: Nombre de lignes du fichier
+        dossier: Dossier de sortie
+
+    Returns:
+        (chemin du fichier Excel, données à charger dans le serveur local)
+    """
+    df = GENERATEURS[robot](rows, seed=0, **DISTRIBUTIONS[robot](rows))
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+    excel_path = dossier / f"bench_{robot}_{rows}.xlsx"
+    df.to_excel(excel_path, index=False)
+    return excel_path, _donnees_syracuse(robot, df)
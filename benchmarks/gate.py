@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Baselines JSON et contrôle de régression des benchmarks
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASELINE_DIR = Path(__file__).resolve().parent / 'baselines'
+
+# métrique -> sens d'amélioration ('higher' = plus grand est meilleur)
+GATED_METRICS = {
+    'rows_per_minute': 'higher',
+    'p95_row_seconds': 'lower',
+    'webdriver_calls_per_row': 'lower',
+    'slept_seconds_per_row': 'lower',
+}
+
+
+def cle(resultat: Dict[str, Any]) -> str:
+    """Clé d'un résultat dans la baseline (robot/lignes, suffixée du profil Chrome s'il n'est pas standard)"""
+    profil = resultat.get('browser_profile') or 'standard'
+    suffixe = '' if profil == 'standard' else f"/{profil}"
+    return f"{resultat['robot']}/{resultat['rows']}{suffixe}"
+
+
+def charger_baseline(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Charger une baseline ({} si absente)"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def sauvegarder_baseline(path: Path, resultats: List[Dict[str, Any]]) -> Path:
+    """
+    Enregistrer les résultats comme nouvelle baseline (fusion avec l'existante)
+
+    Args:
+        path: Fichier JSON de baseline
+        resultats: Résultats de benchmark
+
+    Returns:
+        Chemin du fichier écrit
+    """
+    path = Path(path)
+    existants = charger_baseline(path)
+    existants.update({cle(r): r for r in resultats if not r.get('error')})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'updated_at': datetime.now().isoformat(timespec='seconds'), 'results': existants},
+                  f, indent=2, ensure_ascii=False, sort_keys=True)
+    return path
+
+
+def comparer(resultats: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+             tolerance: float = 0.15) -> List[str]:
+    """
+    Comparer des résultats à la baseline
+
+    Args:
+        resultats: Résultats du benchmark courant
+        baseline: Baseline chargée (charger_baseline)
+        tolerance: Dégradation relative tolérée (0.15 = 15 %)
+
+    Returns:
+        Liste des régressions (vide si aucune)
+    """
+    regressions = []
+    for resultat in resultats:
+        if resultat.get('error'):
+            regressions.append(f"{cle(resultat)}: exécution en erreur ({resultat['error']})")
+            continue
+        reference = baseline.get(cle(resultat))
+        if not reference:
+            continue
+        for metrique, sens in GATED_METRICS.items():
+            actuel, attendu = resultat.get(metrique), reference.get(metrique)
+            if actuel is None or attendu is None:
+                continue
+            if sens == 'higher':
+                degrade = actuel < attendu * (1 - tolerance)
+            else:
+                # Seuil absolu minimal pour ignorer le bruit autour de zéro
+                degrade = actuel > attendu * (1 + tolerance) and actuel - attendu > 0.01
+            if degrade:
+                regressions.append(f"{cle(resultat)}: {metrique} {attendu} → {actuel}")
+    return regressions
+
+
+def comparer_profils(resultats: List[Dict[str, Any]], reference: str = 'standard') -> List[str]:
+    """
+    Comparer chaque profil Chrome au profil de référence, à robot et taille égaux
+
+    Args:
+        resultats: Résultats du benchmark courant (plusieurs profils)
+        reference: Profil de référence
+
+    Returns:
+        Une ligne par résultat comparé (débit et appels WebDriver par ligne)
+    """
+    references = {
+        (r['robot'], r['rows']): r for r in resultats
+        if (r.get('browser_profile') or 'standard') == reference and not r.get('error')
+    }
+    lignes = []
+    for resultat in resultats:
+        base = references.get((resultat['robot'], resultat['rows']))
+        if not base or base is resultat or resultat.get('error'):
+            continue
+        gain = resultat['rows_per_minute'] / base['rows_per_minute'] - 1 if base['rows_per_minute'] else 0.0
+        lignes.append(
+            f"{cle(resultat)}: {base['rows_per_minute']} → {resultat['rows_per_minute']} lignes/min "
+            f"({gain:+.0%}), p95 {base['p95_row_seconds']}s → {resultat['p95_row_seconds']}s"
+        )
+    return lignes
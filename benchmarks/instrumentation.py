@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentation d'un robot pendant un benchmark
+
+- appels WebDriver : chaque commande passe par WebDriver.execute (y compris
+  celles des WebElement), qui est donc le seul point compté
+- temps d'attente : time.sleep est enveloppé ; les attentes internes de
+  Selenium (polling de WebDriverWait) ne sont pas comptées
+- latence par unité de travail : intervalle entre deux add_result
+"""
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class BenchmarkProbe:
+    """Compteurs collectés pendant l'exécution d'un robot"""
+
+    def __init__(self):
+        self.webdriver_calls = 0
+        self.slept_seconds = 0.0
+        self.row_latencies: List[float] = []
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self._last_mark = None
+
+    def mark_start(self):
+        """Début de la mesure"""
+        self.started_at = self._last_mark = time.perf_counter()
+
+    def mark_row(self):
+        """Fin d'une unité de travail (un résultat ajouté au rapport)"""
+        now = time.perf_counter()
+        if self._last_mark is not None:
+            self.row_latencies.append(now - self._last_mark)
+        self._last_mark = now
+
+    def mark_end(self):
+        """Fin de la mesure"""
+        self.finished_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def summary(self, rows: int) -> Dict[str, Any]:
+        """
+        Résumé des mesures
+
+        Args:
+            rows: Nombre de lignes du fichier d'entrée
+
+        Returns:
+            Dictionnaire de métriques (rows_per_minute, p50/p95, appels et attentes par ligne)
+        """
+        latences = np.array(self.row_latencies) if self.row_latencies else np.array([0.0])
+        rows = max(rows, 1)
+        return {
+            'rows': rows,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'rows_per_minute': round(rows / self.elapsed * 60, 3) if self.elapsed else 0.0,
+            'p50_row_seconds': round(float(np.percentile(latences, 50)), 3),
+            'p95_row_seconds': round(float(np.percentile(latences, 95)), 3),
+            'webdriver_calls_per_row': round(self.webdriver_calls / rows, 2),
+            'slept_seconds_per_row': round(self.slept_seconds / rows, 3),
+            'work_units': len(self.row_latencies),
+        }
+
+
+@contextmanager
+def instrumenter(robot) -> Iterator[BenchmarkProbe]:
+    """
+    Instrumenter un robot (WebDriver, time.sleep, add_result, input)
+
+    Les pauses interactives input() encore présentes dans certains robots
+    sont neutralisées pendant le benchmark.
+
+    Args:
+        robot: Instance de robot (BaseRobot)
+
+    Yields:
+        BenchmarkProbe alimentée pendant l'exécution
+    """
+    probe = BenchmarkProbe()
+    execute_original = WebDriver.execute
+    sleep_original = time.sleep
+    input_original = builtins.input
+    add_result_original = robot.add_result
+
+    def execute(self, driver_command, params=None):
+        probe.webdriver_calls += 1
+        return execute_original(self, driver_command, params)
+
+    def sleep(seconds):
+        appelant = sys._getframe(1).f_globals.get('__name__', '')
+        if not appelant.startswith('selenium'):
+            probe.slept_seconds += seconds
+        return sleep_original(seconds)
+
+    def add_result(result):
+        probe.mark_row()
+        return add_result_original(result)
+
+    WebDriver.execute = execute
+    time.sleep = sleep
+    builtins.input = lambda *args, **kwargs: ''
+    robot.add_result = add_result
+    try:
+        probe.mark_start()
+        yield probe
+    finally:
+        probe.mark_end()
+        WebDriver.execute = execute_original
+        time.sleep = sleep_original
+        builtins.input = input_original
+        del robot.add_result
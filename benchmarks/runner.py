@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Exécution d'un robot contre le serveur Syracuse local et collecte des métriques
+"""
+import importlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from benchmarks.datasets import generer_dataset
+from benchmarks.instrumentation import instrumenter
+from benchmarks.stand_in import serveur_local
+from core.logger import Logger
+from tests.syracuse_mock import module_url, rediriger_robot
+
+logger = Logger.get_logger('benchmarks', 'benchmarks')
+
+# nom -> (module, classe, code fonction Sage passé en paramètre url)
+ROBOTS = {
+    'lettrage': ('modules.lettrage.lettrage_robot', 'LettrageRobot', 'LETTRAGE'),
+    'bonne_commande': ('modules.bonne_commande.bonne_commande_robot', 'BonneCommandeRobot', None),
+    'receiption': ('modules.receiption.ReceiptionRobot', 'ReceiptionRobot', None),
+    'facturation': ('modules.facturation.FacturationRobot', 'FacturationRobot', 'GESPIH'),
+}
+
+# Serveur local : latences réalistes mais courtes, tirages reproductibles
+DEFAULT_STAND_IN_CONFIG = {
+    'latency_ms': 30,
+    'page_latency_ms': 100,
+    'save_latency_ms': 150,
+    'bc_generation_ms': 500,
+    'seed': 42,
+}
+
+
+def _creer_robot(nom: str, headless: bool, browser_profile: Optional[str] = None):
+    module_name, class_name, _ = ROBOTS[nom]
+    robot_class = getattr(importlib.import_module(module_name), class_name)
+    robot = robot_class(headless=headless)
+    robot.driver_manager.headless = headless
+    if browser_profile:
+        robot.driver_manager.browser_profile = browser_profile
+    # Pas d'envoi des résultats vers l'endpoint web pendant un benchmark
+    if hasattr(robot, 'web_endpoint_config'):
+        robot.web_endpoint_config = dict(robot.web_endpoint_config, enabled=False)
+    return robot
+
+
+def executer_benchmark(nom: str, rows: int, dossier: Path, headless: bool = True,
+                       stand_in_config: Optional[Dict[str, Any]] = None,
+                       browser_profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Exécuter un robot sur un jeu de données synthétique
+
+    Args:
+        nom: Nom du robot (voir ROBOTS)
+        rows: Nombre de lignes du fichier d'entrée
+        dossier: Dossier de travail (fichiers Excel générés)
+        headless: Chrome sans interface
+        stand_in_config: Surcharges de configuration du serveur local
+        browser_profile: Profil Chrome ('standard', 'performance'; défaut: celui du robot)
+
+    Returns:
+        Métriques du benchmark (voir BenchmarkProbe.summary)
+    """
+    excel_file, data = generer_dataset(nom, rows, dossier)
+    config = dict(DEFAULT_STAND_IN_CONFIG, **(stand_in_config or {}))
+
+    with serveur_local(config, data) as base_url:
+        robot = _creer_robot(nom, headless, browser_profile)
+        rediriger_robot(robot, base_url)
+        function_code = ROBOTS[nom][2]
+        url = module_url(base_url, function_code) if function_code else None
+
+        logger.info(f"⏱️ Benchmark {nom} ({rows} lignes, profil {robot.driver_manager.browser_profile}) sur {base_url}")
+        with instrumenter(robot) as probe:
+            try:
+                robot.run(excel_file=str(excel_file), url=url)
+            except Exception as e:
+                logger.error(f"❌ Benchmark {nom} ({rows} lignes) interrompu: {e}")
+                probe.error = str(e)
+
+    resultat = probe.summary(rows)
+    resultat.update({'robot': nom, 'browser_profile': robot.driver_manager.browser_profile, 'error': probe.error})
+    logger.info(f"📊 {nom}/{rows}: {resultat['rows_per_minute']} lignes/min, "
+                f"p95 {resultat['p95_row_seconds']}s, {resultat['webdriver_calls_per_row']} appels/ligne")
+    return resultat
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Serveur Syracuse local des benchmarks (tests/syracuse_mock servi par uvicorn dans un thread)
+"""
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import uvicorn
+
+from tests.syracuse_mock import create_app
+
+
+def _port_libre(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serveur_local(config: Optional[Dict[str, Any]] = None,
+                  data: Optional[Dict[str, List[Dict]]] = None,
+                  host: str = '127.0.0.1',
+                  timeout: float = 10) -> Iterator[str]:
+    """
+    Démarrer un serveur Syracuse de substitution le temps d'un benchmark
+
+    Args:
+        config: Configuration du serveur (latence, taux d'échec, ...)
+        data: Données initiales
+        host: Interface d'écoute
+        timeout: Délai max de démarrage en secondes
+
+    Yields:
+        URL de base du serveur (ex: http://127.0.0.1:53124)
+    """
+    port = _port_libre(host)
+    server = uvicorn.Server(uvicorn.Config(create_app(config, data), host=host, port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, name='syracuse-stand-in', daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + timeout
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            server.should_exit = True
+            raise RuntimeError(f"Serveur Syracuse local non démarré sur {host}:{port}")
+        time.sleep(0.05)
+
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=timeout)
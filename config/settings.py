@@ -24,6 +24,10 @@ SAGE_CONFIG = {
     'password': os.getenv('SAGE_PASSWORD', 'ZAINAB@2023'),
     'environment': os.getenv('SAGE_ENVIRONMENT', 'PREPROD'),
     'timeout': int(os.getenv('SAGE_TIMEOUT', '10')),
+    # Version de Sage: clé des stratégies de sélection apprises (utils/selector_strategies.py)
+    'version': os.getenv('SAGE_VERSION', 'defaut'),
+    # Lancer Chrome + connexion en arrière-plan pendant la lecture de l'Excel
+    'connexion_anticipee': os.getenv('SAGE_CONNEXION_ANTICIPEE', 'True').lower() == 'true',
 }
 # Configuration Sage X3
 SAGE_CONFIG_TEST = {
@@ -37,9 +41,23 @@ SAGE_CONFIG_TEST = {
 # Configuration Selenium
 SELENIUM_CONFIG = {
     'profile_path': os.getenv('CHROME_PROFILE_PATH', str(BASE_DIR / 'chrome_profile')),
+    # 'partage' : tous les robots utilisent profile_path (un seul Chrome à la fois, session Sage conservée)
+    # 'isole' : un profil par session copié du modèle (robots en parallèle possibles, connexion à chaque session)
+    'profile_mode': os.getenv('CHROME_PROFILE_MODE', 'partage'),
+    # Modèle pré-rempli par scripts/seed_chrome_profile.py (défaut: profile_path)
+    'profile_template': os.getenv('CHROME_PROFILE_TEMPLATE', '') or os.getenv('CHROME_PROFILE_PATH', str(BASE_DIR / 'chrome_profile')),
+    # Dossier des profils de session (vide = /dev/shm si profile_tmpfs, sinon dossier temporaire)
+    'profile_root': os.getenv('CHROME_PROFILE_ROOT', ''),
+    'profile_tmpfs': os.getenv('CHROME_PROFILE_TMPFS', 'True').lower() == 'true',
+    # Profils libérés gardés pour les sessions suivantes (0 = supprimés)
+    'profile_recycle': int(os.getenv('CHROME_PROFILE_RECYCLE', '2')),
     'headless': os.getenv('CHROME_HEADLESS', 'False').lower() == 'true',
     'download_dir': str(OUTPUT_DIR / 'rapports'),
     'page_load_timeout': int(os.getenv('PAGE_LOAD_TIMEOUT', '90')),
+    # 'standard' : Chrome complet
+    # 'performance' : images, polices et médias bloqués, animations coupées, chargement 'eager'
+    'browser_profile': os.getenv('CHROME_BROWSER_PROFILE', 'standard'),
+    'window_size': os.getenv('CHROME_WINDOW_SIZE', '1600,1000'),
 }
 
 # Configuration Base de données
@@ -70,6 +88,21 @@ LOGGING_CONFIG = {
     'console_enabled': True,
 }
 
+# Configuration Métriques (format Prometheus)
+METRICS_CONFIG = {
+    'enabled': os.getenv('METRICS_ENABLED', 'True').lower() == 'true',
+    'worker_host': os.getenv('METRICS_WORKER_HOST', '0.0.0.0'),
+    'worker_port': int(os.getenv('METRICS_WORKER_PORT', '9108')),
+}
+
+# Configuration Validation des fichiers Excel
+VALIDATION_CONFIG = {
+    # Marques autorisées (séparées par des virgules), vide = pas de contrôle
+    'marques': [m.strip() for m in os.getenv('VALIDATION_MARQUES', '').split(',') if m.strip()],
+    # Règles métier des fichiers (codes T..., BC..., doublons, montants >= 0) : lignes non conformes rejetées
+    'regles_metier': os.getenv('VALIDATION_REGLES_METIER', 'False').lower() == 'true',
+}
+
 # Configuration Modules
 MODULES_CONFIG = {
     'lettrage': {
@@ -77,10 +110,30 @@ MODULES_CONFIG = {
         'max_retries': 3,
         'retry_delay': 3,  # secondes
         'save_incremental': True,
+        'taille_lot': int(os.getenv('LETTRAGE_TAILLE_LOT', '500')),  # lignes Excel lues par lot
+        # Profil Chrome du robot (vide = SELENIUM_CONFIG['browser_profile'])
+        'browser_profile': os.getenv('LETTRAGE_BROWSER_PROFILE', ''),
+    },
+    'bonne_commande': {
+        # 'fournisseur' : articles → DAs → BC par fournisseur
+        # 'lot' : articles de tous les fournisseurs, puis DAs, puis une seule génération BC
+        'mode': os.getenv('BONNE_COMMANDE_MODE', 'fournisseur'),
+        # Durée (s) pendant laquelle un article confirmé n'est pas retouché (0 = désactivé)
+        'cache_articles_ttl': int(os.getenv('ARTICLE_CACHE_TTL', '86400')),
+        'browser_profile': os.getenv('BONNE_COMMANDE_BROWSER_PROFILE', ''),
+    },
+    'receiption': {
+        'browser_profile': os.getenv('RECEIPTION_BROWSER_PROFILE', ''),
     },
     'facturation': {
         'enabled': False,
         'max_retries': 3,
+        # 'ligne' : écran rechargé pour chaque facture
+        # 'session' : écran ouvert une fois, factures enchaînées et regroupées par fournisseur
+        'mode': os.getenv('FACTURATION_MODE', 'ligne'),
+        # Pause avant enregistrement pour vérification des informations saisies
+        'validation_manuelle': os.getenv('FACTURATION_VALIDATION_MANUELLE', 'true').lower() == 'true',
+        'browser_profile': os.getenv('FACTURATION_BROWSER_PROFILE', ''),
     },
     'reporting': {
         'enabled': False,
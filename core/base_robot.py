@@ -4,19 +4,46 @@ Classe de base pour tous les robots RPA
 """
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 import pandas as pd
 from pathlib import Path
 import base64
+import re
+import threading
+from urllib.parse import unquote
 
 from core.sage_connector import SageConnector
 from core.driver_manager import DriverManager
+from core.form_filler import FormFiller
+from core.label_locators import LabelLocatorCache
 from core.logger import Logger
-from config.settings import OUTPUT_DIR
+from core.metrics import ROBOT_RESULTS_TOTAL, ROBOT_RUNS_TOTAL, step_timer
+from config.settings import MODULES_CONFIG, OUTPUT_DIR, SAGE_CONFIG
+from utils.selector_strategies import StrategyRegistry
+from selenium.common.exceptions import (StaleElementReferenceException, TimeoutException,
+                                        UnexpectedAlertPresentException, WebDriverException)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Statuts de ligne considérés comme réussis (Inchangé = rien à modifier dans Sage)
+STATUTS_SUCCES = ('Succes', 'Inchangé')
+
+
+def ecran_depuis_url(url: str, defaut: str) -> str:
+    """
+    Code fonction Sage d'une URL Syracuse (paramètre f=GESITM/2//M/)
+
+    Args:
+        url: URL du module
+        defaut: Valeur si le code est absent
+
+    Returns:
+        Code fonction (ex: 'GESITM')
+    """
+    correspondance = re.search(r'[?&]f=([A-Za-z0-9_]+)', unquote(unquote(url or '')))
+    return correspondance.group(1).upper() if correspondance else defaut
+
 class BaseRobot(ABC):
     """Classe de base abstraite pour tous les robots"""
     
@@ -31,8 +58,15 @@ class BaseRobot(ABC):
         self.logger = Logger.get_logger(self.__class__.__name__, module_name)
         
         # Composants réutilisables
-        self.driver_manager = DriverManager()
+        self.driver_manager = DriverManager(
+            browser_profile=MODULES_CONFIG.get(module_name, {}).get('browser_profile') or None
+        )
         self.sage_connector = SageConnector(self.driver_manager)
+        self.form_filler = FormFiller(self.driver_manager)
+        self.labels = LabelLocatorCache(self.driver_manager)
+        self.strategies = StrategyRegistry()
+        # Écran courant (code fonction Sage), clé des stratégies apprises
+        self.ecran = module_name
         
         # Données
         self.resultats = []
@@ -43,6 +77,10 @@ class BaseRobot(ABC):
         self.error_screenshot = None
         self.popup_messages = []
 
+        # Connexion lancée en arrière-plan par run()
+        self._connexion_anticipee: Optional[threading.Thread] = None
+        self._connexion_anticipee_ok: Optional[bool] = None
+
         self.logger.info(f"🤖 Initialisation robot: {self.__class__.__name__}")
     
     @abstractmethod
@@ -59,10 +97,59 @@ class BaseRobot(ABC):
         """
         Connexion à Sage X3
         
+        Si run() a lancé la connexion en arrière-plan, attend simplement
+        qu'elle se termine au lieu de se reconnecter.
+        
         Returns:
             True si connexion réussie
         """
-        return self.sage_connector.connect()
+        if self._connexion_anticipee is not None:
+            return self._attendre_connexion_anticipee()
+        
+        with self.etape('connexion'):
+            return self.sage_connector.connect()
+
+    def demarrer_connexion_anticipee(self):
+        """
+        Lancer le navigateur et la connexion Sage dans un thread
+        
+        La lecture et la validation de l'Excel se font pendant ce temps ;
+        le premier connect_sage() rejoint le thread.
+        """
+        if self._connexion_anticipee is not None or self.sage_connector.is_connected:
+            return
+        
+        def connecter():
+            try:
+                with self.etape('connexion'):
+                    self._connexion_anticipee_ok = self.sage_connector.connect()
+            except Exception as e:
+                self.logger.error(f"❌ Erreur connexion anticipée: {e}")
+                self._connexion_anticipee_ok = False
+        
+        self.logger.info("🚀 Connexion Sage lancée en arrière-plan")
+        self._connexion_anticipee = threading.Thread(
+            target=connecter, name=f"connexion-{self.module_name}", daemon=True
+        )
+        self._connexion_anticipee.start()
+
+    def _attendre_connexion_anticipee(self) -> Optional[bool]:
+        """
+        Attendre la fin de la connexion lancée en arrière-plan
+        
+        Returns:
+            Résultat de la connexion, None si aucune n'était en cours
+        """
+        thread = self._connexion_anticipee
+        if thread is None:
+            return None
+        
+        if thread.is_alive():
+            self.logger.info("⏳ Attente de la connexion Sage en cours...")
+        with self.etape('attente_connexion'):
+            thread.join()
+        self._connexion_anticipee = None
+        return self._connexion_anticipee_ok
 
     def disconnect_sage(self) -> bool:
         """
@@ -71,6 +158,7 @@ class BaseRobot(ABC):
         Returns:
             True si déconnexion réussie
         """
+        self._attendre_connexion_anticipee()
         return self.sage_connector.disconnect()
 
     def navigate_to_module(self, url: str) -> bool:
@@ -83,7 +171,22 @@ class BaseRobot(ABC):
         Returns:
             True si navigation réussie
         """
-        return self.sage_connector.navigate_to_module(url)
+        self.ecran = ecran_depuis_url(url, self.module_name)
+        with self.etape('navigation'):
+            return self.sage_connector.navigate_to_module(url)
+
+    def etape(self, nom: str):
+        """
+        Chronométrer une étape du robot (métrique rpa_step_duration_seconds)
+
+        Args:
+            nom: Nom de l'étape (connexion, articles, das, ...)
+
+        Exemple:
+            with self.etape('articles'):
+                ...
+        """
+        return step_timer(self.module_name, nom)
 
     def close_module(self, confirm_abandon: bool = False) -> bool:
         """
@@ -103,15 +206,42 @@ class BaseRobot(ABC):
 
             self.logger.info("🔒 Fermeture du module en cours...")
 
-            # Envoyer ESCAPE pour sortir des formulaires/champs
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-            time.sleep(0.5)
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+            def fermer_apres_echap():
+                # Envoyer ESCAPE pour sortir des formulaires/champs
+                driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+                time.sleep(0.5)
+                driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+
+                s_page_close = driver.find_element(By.CSS_SELECTOR, "a.s_page_close")
+                s_page_close.click()
+                time.sleep(1)
+                return True
+
+            def fermer_direct():
+                s_page_close = driver.find_element(By.CSS_SELECTOR, "a.s_page_close")
+                s_page_close.click()
+
+                # Fermée quand le bouton disparaît avec la page ou qu'une confirmation s'affiche
+                def page_changee(_):
+                    try:
+                        s_page_close.is_displayed()
+                    except StaleElementReferenceException:
+                        return True
+                    return bool(self.driver_manager.read_alerts())
 
-            # Cliquer sur le bouton de fermeture de page
-            s_page_close = driver.find_element(By.CSS_SELECTOR, "a.s_page_close")
-            s_page_close.click()
-            time.sleep(1)
+                try:
+                    WebDriverWait(driver, 5, poll_frequency=0.2).until(page_changee)
+                    return True
+                except TimeoutException:
+                    return None
+
+            # ESC d'abord (sortie des champs en édition) ; clic direct seulement si ce chemin échoue
+            variante, _ = self.strategies.essayer(f"{self.ecran}/fermeture", [
+                ('echap', fermer_apres_echap),
+                ('direct', fermer_direct),
+            ])
+            if not variante:
+                raise RuntimeError("bouton de fermeture de page introuvable")
 
             # Gérer la popup de confirmation si nécessaire
             if confirm_abandon:
@@ -143,6 +273,7 @@ class BaseRobot(ABC):
             result: Dictionnaire contenant les résultats
         """
         self.resultats.append(result)
+        ROBOT_RESULTS_TOTAL.inc(robot=self.__class__.__name__, statut=str(result.get('statut', 'inconnu')))
         self.logger.debug(f"Résultat ajouté: {result}")
     
     def save_report(self, filename: str = None, incremental: bool = False) -> Path:
@@ -196,8 +327,9 @@ class BaseRobot(ABC):
         
         summary = {
             'total': len(df),
-            'succes': len(df[df.get('statut', '') == 'Succes']) if 'statut' in df.columns else 0,
-            'echecs': len(df[df.get('statut', '') != 'Succes']) if 'statut' in df.columns else 0,
+            'succes': int(df['statut'].isin(STATUTS_SUCCES).sum()) if 'statut' in df.columns else 0,
+            'echecs': int((~df['statut'].isin(STATUTS_SUCCES)).sum()) if 'statut' in df.columns else 0,
+            'inchanges': int((df['statut'] == 'Inchangé').sum()) if 'statut' in df.columns else 0,
             'timestamp': self.timestamp,
             'module': self.module_name,
         }
@@ -214,6 +346,8 @@ class BaseRobot(ABC):
         self.logger.info(f"Total: {summary['total']}")
         self.logger.info(f"✅ Succès: {summary['succes']}")
         self.logger.info(f"❌ Échecs: {summary['echecs']}")
+        if summary.get('inchanges'):
+            self.logger.info(f"⏭️ Inchangés: {summary['inchanges']}")
         
         if summary['total'] > 0:
             taux = (summary['succes'] / summary['total']) * 100
@@ -221,23 +355,41 @@ class BaseRobot(ABC):
         
         self.logger.info("="*80)
     
-    def wait_for_spinner_to_disappear(self, driver, timeout: int = 60):
+    def wait_for_spinner_to_disappear(self, driver, timeout: int = 60,
+                                      progression: Optional[Callable[[float], None]] = None) -> bool:
         """
         Attendre que le spinner de chargement disparaisse
 
         Args:
             driver: Instance du driver Selenium
             timeout: Temps maximum d'attente en secondes
+            progression: Appelée avec le temps écoulé pendant les longues attentes
+                (par défaut: message de log toutes les 30 s)
+
+        Returns:
+            True si le spinner a disparu avant l'échéance
         """
+        self.logger.info("⏳ Attente disparition du spinner...")
+        if progression is None:
+            progression = lambda ecoule: self.logger.info(f"⏳ Traitement Sage en cours ({ecoule:.0f}s / {timeout}s)")
 
+        try:
+            return self.driver_manager.wait_spinner(timeout, progress=progression)
+        except WebDriverException as e:
+            # Page rechargée pendant l'attente, script bloqué... : repli sur le polling Selenium
+            self.logger.warning(f"⚠️ Attente côté navigateur interrompue ({e.__class__.__name__}), repli sur le polling")
 
         try:
-            self.logger.info("⏳ Attente disparition du spinner...")
             WebDriverWait(driver, timeout).until(
                 EC.invisibility_of_element_located((By.ID, "s_lock_long_spin"))
             )
-        except Exception as e:
-            pass
+            return True
+        except TimeoutException:
+            self.logger.error(f"⏱️ Spinner toujours affiché après {timeout}s")
+            return False
+        except WebDriverException as e:
+            self.logger.warning(f"⚠️ Attente du spinner impossible: {e}")
+            return False
 
     def get_input_by_label(self, label_name: str):
         """
@@ -252,21 +404,31 @@ class BaseRobot(ABC):
         Raises:
             Exception: Si le label ou l'input n'est pas trouvé
         """
-        driver = self.driver_manager.driver
         try:
-            input_element = driver.find_element(By.XPATH,
-                f"//label[contains(@class, 's-field-title') and contains(text(), '{label_name}')]/following::input[1]"
-            )
-            return input_element
+            return self.labels.trouver(label_name)
         except Exception as e:
             self.logger.error(f"❌ Erreur: impossible de trouver l'input pour le label '{label_name}': {e}")
             raise
 
+    def lire_valeurs_par_labels(self, labels: List[str]) -> Dict[str, Any]:
+        """
+        Lire en un seul appel les valeurs des inputs associés à plusieurs labels
+
+        Args:
+            labels: Textes des labels (même recherche que get_input_by_label)
+
+        Returns:
+            {label: valeur} (booléen pour une case à cocher, None si introuvable)
+        """
+        return self.labels.lire(self.form_filler, labels)
+
     def cleanup(self):
         """Nettoyage et déconnexion"""
         try:
+            self._attendre_connexion_anticipee()
             if self.sage_connector:
                 self.sage_connector.disconnect()
+            self.strategies.sauvegarder()
             self.logger.info("✅ Nettoyage terminé")
         except Exception as e:
             self.logger.error(f"❌ Erreur nettoyage: {e}")
@@ -280,16 +442,23 @@ class BaseRobot(ABC):
         try:
             self.logger.info(f"🚀 Démarrage: {self.__class__.__name__}")
             
+            # Chrome + connexion en parallèle de la lecture Excel
+            if SAGE_CONFIG['connexion_anticipee']:
+                self.demarrer_connexion_anticipee()
+            
             # Exécuter la logique métier
-            result = self.execute(*args, **kwargs)
+            with self.etape('execution'):
+                result = self.execute(*args, **kwargs)
             
             # Générer le rapport final
             self.log_summary()
             self.save_report()
             
+            ROBOT_RUNS_TOTAL.inc(robot=self.__class__.__name__, outcome='success')
             return result
             
         except Exception as e:
+            ROBOT_RUNS_TOTAL.inc(robot=self.__class__.__name__, outcome='failure')
             self.logger.error(f"❌ Erreur fatale: {e}")
             import traceback
             self.logger.error(traceback.format_exc())
@@ -338,35 +507,16 @@ class BaseRobot(ABC):
             driver = self.driver_manager.driver
             popup_message = None
 
-            # Essayer de trouver une popup avec le message d'erreur (format Sage)
+            # Popups Sage relevées par l'observateur __rpa (ouvertes, ou refermées depuis la dernière lecture)
             try:
-                from selenium.webdriver.common.by import By
-                pre_elements = driver.find_elements(By.CSS_SELECTOR, "pre.s_alertbox_msg")
-                if pre_elements and len(pre_elements) > 0:
-                    popup_message = pre_elements[0].text
+                popups = self.driver_manager.read_alerts() or self.driver_manager.new_alerts()
+                if popups:
+                    popup_message = popups[-1]['message'] or popups[-1]['titre']
                     self.logger.info(f"📋 Message popup trouvé: {popup_message}")
-            except:
-                pass
-
-            # Essayer d'autres sélecteurs de popup
-            if not popup_message:
-                try:
-                    from selenium.webdriver.common.by import By
-                    alert_elements = driver.find_elements(By.CSS_SELECTOR, "article.s_alertbox_content")
-                    if alert_elements and len(alert_elements) > 0:
-                        popup_message = alert_elements[0].text
-                        self.logger.info(f"📋 Message popup trouvé (alertbox): {popup_message}")
-                except:
-                    pass
-
-            # Essayer les alertes JavaScript
-            if not popup_message:
-                try:
-                    alert = driver.switch_to.alert
-                    popup_message = alert.text
-                    self.logger.info(f"📋 Message alert JavaScript trouvé: {popup_message}")
-                except:
-                    pass
+            except UnexpectedAlertPresentException:
+                # Alerte JavaScript native: elle bloque tout script, on la lit directement
+                popup_message = driver.switch_to.alert.text
+                self.logger.info(f"📋 Message alert JavaScript trouvé: {popup_message}")
 
             if popup_message:
                 self.popup_messages.append({
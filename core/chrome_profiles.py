@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Profils Chrome isolés par session
+Chaque navigateur reçoit son propre dossier user-data-dir, copié d'un profil
+modèle (pré-rempli avec le cache statique de Syracuse par
+scripts/seed_chrome_profile.py), de préférence en mémoire (/dev/shm) :
+plusieurs robots peuvent tourner en parallèle sans se disputer le verrou
+du profil, et le démarrage à froid ne relit pas le disque.
+En fin de session le profil est supprimé, ou gardé pour la session suivante.
+Activé par CHROME_PROFILE_MODE=isole : le modèle ne contient pas de session
+Sage, chaque session se connecte donc avec le formulaire (sauf profil recyclé).
+"""
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from core.logger import Logger
+
+# Fichiers propres à un Chrome en cours d'exécution : jamais copiés du modèle
+FICHIERS_EXCLUS = (
+    'SingletonLock', 'SingletonSocket', 'SingletonCookie',
+    'DevToolsActivePort', 'RunningChromeVersion', 'Crashpad', 'BrowserMetrics',
+)
+RAM = Path('/dev/shm')
+
+
+def racine_par_defaut(tmpfs: bool = True) -> Path:
+    """Dossier des profils de session : /dev/shm si disponible et demandé, sinon le dossier temporaire"""
+    if tmpfs and RAM.is_dir() and os.access(RAM, os.W_OK):
+        return RAM / 'sage_rpa_chrome'
+    return Path(tempfile.gettempdir()) / 'sage_rpa_chrome'
+
+
+def _processus_actif(pid: int) -> bool:
+    """Le processus existe-t-il encore ?"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ChromeProfilePool:
+    """Allocation des profils de session à partir d'un profil modèle"""
+
+    def __init__(self, template: Optional[str], racine: Optional[str] = None,
+                 tmpfs: bool = True, recycler: int = 2):
+        """
+        Initialiser le pool
+
+        Args:
+            template: Profil modèle (None ou absent = profil vierge)
+            racine: Dossier des profils de session (défaut: /dev/shm ou dossier temporaire)
+            tmpfs: Préférer un dossier en mémoire quand racine n'est pas fournie
+            recycler: Nombre de profils libérés gardés pour réutilisation (0 = toujours supprimer)
+        """
+        self.logger = Logger.get_logger('ChromeProfilePool', 'core')
+        self.template = Path(template) if template else None
+        self.racine = Path(racine) if racine else racine_par_defaut(tmpfs)
+        self.recycler = recycler
+
+    def allouer(self) -> Path:
+        """
+        Fournir un profil réservé à la session courante
+
+        Returns:
+            Chemin du profil (à passer en user-data-dir)
+        """
+        self.racine.mkdir(parents=True, exist_ok=True)
+        self.nettoyer_orphelins()
+        destination = self.racine / f"actif-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        # Un profil recyclé se réserve par renommage (atomique entre workers)
+        for libre in sorted(self.racine.glob('libre-*')):
+            try:
+                os.rename(libre, destination)
+                self.logger.info(f"♻️ Profil Chrome recyclé: {destination}")
+                return destination
+            except OSError:
+                continue
+
+        if self.template and self.template.is_dir():
+            shutil.copytree(self.template, destination, symlinks=True,
+                            ignore=shutil.ignore_patterns(*FICHIERS_EXCLUS))
+            self.logger.info(f"📁 Profil Chrome copié du modèle: {destination}")
+        else:
+            destination.mkdir()
+            self.logger.info(f"📁 Profil Chrome vierge (pas de modèle): {destination}")
+        return destination
+
+    def liberer(self, profil: Path):
+        """
+        Rendre un profil en fin de session (gardé pour la suivante ou supprimé)
+
+        Args:
+            profil: Chemin retourné par allouer()
+        """
+        profil = Path(profil)
+        if not profil.exists():
+            return
+        for nom in FICHIERS_EXCLUS:
+            chemin = profil / nom
+            if chemin.is_symlink() or chemin.is_file():
+                chemin.unlink()
+
+        if len(list(self.racine.glob('libre-*'))) < self.recycler:
+            try:
+                os.rename(profil, self.racine / f"libre-{uuid.uuid4().hex[:8]}")
+                return
+            except OSError as e:
+                self.logger.warning(f"⚠️ Recyclage du profil impossible: {e}")
+        shutil.rmtree(profil, ignore_errors=True)
+
+    def nettoyer_orphelins(self):
+        """Supprimer les profils de sessions dont le processus n'existe plus (arrêt brutal)"""
+        for profil in self.racine.glob('actif-*'):
+            try:
+                pid = int(profil.name.split('-')[1])
+            except (IndexError, ValueError):
+                continue
+            if not _processus_actif(pid):
+                self.logger.info(f"🗑️ Profil orphelin supprimé: {profil.name}")
+                shutil.rmtree(profil, ignore_errors=True)
@@ -8,25 +8,88 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 from config.settings import SELENIUM_CONFIG
+from core.chrome_profiles import ChromeProfilePool
 from core.logger import Logger
+from core.metrics import BROWSERS_LIVE
+
+# Bibliothèque JS injectée à la demande dans chaque page (window.__rpa)
+RPA_HELPERS_JS = (Path(__file__).parent / 'static' / 'rpa_helpers.js').read_text(encoding='utf-8')
+RPA_ABSENT = '__rpa_absent__'
+JS_APPEL_RPA = f"""
+if (!window.__rpa) {{ return '{RPA_ABSENT}'; }}
+return window.__rpa[arguments[0]].apply(null, arguments[1]);
+"""
+JS_APPEL_RPA_ASYNC = f"""
+var callback = arguments[arguments.length - 1];
+if (!window.__rpa) {{ return callback('{RPA_ABSENT}'); }}
+window.__rpa[arguments[0]].apply(null, arguments[1].concat([callback]));
+"""
+
+# Lignes des arbres de sélection (commandes, réceptions)
+TREE_ROWS = ".s-grid-table-body tr.s-grid-row"
+
+# Profils Chrome (SELENIUM_CONFIG['browser_profile'], surchargeable par robot)
+STANDARD = 'standard'
+PERFORMANCE = 'performance'
+
+# Profil 'performance' : ressources sans effet sur les étapes automatisées
+RESSOURCES_BLOQUEES = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav',
+]
+JS_SANS_ANIMATIONS = """
+(function () {
+    function poser() {
+        var style = document.createElement('style');
+        style.textContent = '*, *::before, *::after { animation: none !important; '
+            + 'transition: none !important; scroll-behavior: auto !important; }';
+        (document.head || document.documentElement).appendChild(style);
+    }
+    if (document.documentElement) { poser(); } else { document.addEventListener('DOMContentLoaded', poser); }
+})();
+"""
 
 class DriverManager:
     """Gestionnaire de WebDriver Selenium"""
     
-    def __init__(self, headless: bool = None, profile_path: str = None):
+    def __init__(self, headless: bool = None, profile_path: str = None, browser_profile: str = None):
         """
         Initialiser le gestionnaire de driver
         
         Args:
             headless: Mode sans interface graphique
-            profile_path: Chemin du profil Chrome
+            profile_path: Chemin du profil Chrome (fourni: profil partagé, sinon selon profile_mode)
+            browser_profile: 'standard' ou 'performance' (défaut: SELENIUM_CONFIG)
         """
         self.logger = Logger.get_logger('DriverManager', 'core')
         self.driver = None
         self.headless = headless if headless is not None else SELENIUM_CONFIG['headless']
         self.profile_path = profile_path or SELENIUM_CONFIG['profile_path']
+        # Profil de session alloué au démarrage (mode 'isole'), rendu à l'arrêt
+        self.profile_pool = None
+        if not profile_path and SELENIUM_CONFIG['profile_mode'] == 'isole':
+            self.profile_pool = ChromeProfilePool(
+                SELENIUM_CONFIG['profile_template'],
+                racine=SELENIUM_CONFIG['profile_root'] or None,
+                tmpfs=SELENIUM_CONFIG['profile_tmpfs'],
+                recycler=SELENIUM_CONFIG['profile_recycle'],
+            )
+        self.session_profile = None
+        self.browser_profile = browser_profile or SELENIUM_CONFIG['browser_profile']
+        if self.browser_profile not in (STANDARD, PERFORMANCE):
+            raise ValueError(f"Profil Chrome inconnu: {self.browser_profile}")
         self.page_load_timeout = SELENIUM_CONFIG['page_load_timeout']
+        # Timeout des scripts asynchrones hors appels __rpa (défaut Selenium)
+        self.script_timeout = 30
+        # Dernière popup du journal __rpa déjà consultée (remis à zéro à chaque injection)
+        self.alert_seq = 0
+        # Incrémenté à chaque nouvelle page ou changement d'onglet (caches liés à la page)
+        self.page_generation = 0
     
     def start(self) -> webdriver.Chrome:
         """
@@ -40,15 +103,22 @@ class DriverManager:
             return self.driver
         
         try:
+            if self.profile_pool:
+                self.session_profile = self.profile_pool.allouer()
+                self.profile_path = str(self.session_profile)
             options = self._get_chrome_options()
             self.driver = webdriver.Chrome(options=options)
             self.driver.set_page_load_timeout(self.page_load_timeout)
-            
-            self.logger.info(f"✅ Driver Chrome démarré (headless={self.headless})")
+            self.driver.set_script_timeout(self.script_timeout)
+            BROWSERS_LIVE.inc()
+            self._appliquer_profil_onglet()
+
+            self.logger.info(f"✅ Driver Chrome démarré (headless={self.headless}, profil={self.browser_profile})")
             return self.driver
             
         except Exception as e:
             self.logger.error(f"❌ Erreur démarrage driver: {e}")
+            self._liberer_profil()
             raise
     
     def _get_chrome_options(self) -> Options:
@@ -85,8 +155,27 @@ class DriverManager:
         # Garder le navigateur ouvert
         options.add_experimental_option("detach", True)
         
+        if self.browser_profile == PERFORMANCE:
+            # Rendre la main dès DOMContentLoaded : SageConnector attend ensuite la page Syracuse
+            options.page_load_strategy = 'eager'
+            options.add_argument(f"--window-size={SELENIUM_CONFIG['window_size']}")
+            options.add_experimental_option("prefs", dict(prefs, **{
+                "profile.managed_default_content_settings.images": 2,
+            }))
+        
         return options
     
+    def _appliquer_profil_onglet(self):
+        """Blocage des ressources et CSS sans animations (DevTools, à refaire pour chaque onglet)"""
+        if self.browser_profile != PERFORMANCE:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': RESSOURCES_BLOQUEES})
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': JS_SANS_ANIMATIONS})
+        except Exception as e:
+            self.logger.warning(f"⚠️ Profil performance partiellement appliqué: {e}")
+    
     def wait_for_element(self, by: By, value: str, timeout: int = 10):
         """
         Attendre qu'un élément soit présent
@@ -159,6 +248,218 @@ class DriverManager:
             element
         )
     
+    def inject_helpers(self):
+        """Injecter la bibliothèque window.__rpa dans la page courante"""
+        self.driver.execute_script(RPA_HELPERS_JS)
+        self.alert_seq = 0
+        self.page_changed()
+        self.logger.debug("💉 Bibliothèque __rpa injectée")
+
+    def page_changed(self):
+        """Signaler une nouvelle page (navigation, actualisation, onglet) aux caches liés à la page"""
+        self.page_generation += 1
+
+    def switch_window(self, handle: str):
+        """
+        Basculer vers un onglet (les caches de la page précédente ne s'appliquent plus)
+
+        Args:
+            handle: Handle de l'onglet
+        """
+        self.driver.switch_to.window(handle)
+        self.page_changed()
+
+    def new_tab(self) -> str:
+        """
+        Ouvrir un nouvel onglet et basculer dessus
+
+        Returns:
+            Handle du nouvel onglet
+        """
+        self.driver.switch_to.new_window('tab')
+        self.page_changed()
+        self._appliquer_profil_onglet()
+        return self.driver.current_window_handle
+
+    def rpa_call(self, method: str, *args) -> Any:
+        """
+        Appeler une primitive de window.__rpa (injectée au premier appel sur la page)
+
+        Args:
+            method: Nom de la primitive (readGrid, treeRows, ...)
+            *args: Arguments transmis à la primitive
+
+        Returns:
+            Résultat de la primitive
+        """
+        resultat = self.driver.execute_script(JS_APPEL_RPA, method, list(args))
+        if resultat == RPA_ABSENT:
+            self.inject_helpers()
+            resultat = self.driver.execute_script(JS_APPEL_RPA, method, list(args))
+        return resultat
+
+    def read_grid(self, rows_selector: str) -> List[Dict[str, Any]]:
+        """
+        Lire toutes les lignes d'une grille en un seul appel
+
+        Args:
+            rows_selector: Sélecteur CSS des lignes (ex: ".s-grid-table-body tr.s-grid-row"),
+                ou XPath s'il commence par '/' ou '('
+
+        Returns:
+            Lignes {index, visible, niveau, texte, checkbox_id, coche, replie, valeurs}
+        """
+        return self.rpa_call('readGrid', rows_selector) or []
+
+    def find_tree_rows(self, text: str = None, level: Optional[int] = None,
+                       rows_selector: str = TREE_ROWS, contains: bool = False) -> List[Dict[str, Any]]:
+        """
+        Trouver les lignes d'arbre par libellé et niveau
+
+        Args:
+            text: Début du libellé (ou partie du libellé si contains=True)
+            level: Niveau dans l'arbre (0 = parent, 1 = enfant), None = tous
+            rows_selector: Sélecteur CSS des lignes
+            contains: Rechercher le texte n'importe où dans le libellé
+
+        Returns:
+            Lignes correspondantes (même format que read_grid)
+        """
+        return self.rpa_call('treeRows', rows_selector, text, level, contains) or []
+
+    def tick_checkboxes(self, ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Cocher une liste de cases en un seul appel
+
+        Args:
+            ids: Identifiants des checkboxes
+
+        Returns:
+            {'coches': [...], 'deja': [...], 'absents': [...]}
+        """
+        return self.rpa_call('tickCheckboxes', list(ids)) or {'coches': [], 'deja': [], 'absents': list(ids)}
+
+    def click_in_row(self, rows_selector: str, index: int, target_selector: str) -> bool:
+        """
+        Cliquer un élément d'une ligne de grille repérée par son index
+
+        Args:
+            rows_selector: Sélecteur CSS des lignes
+            index: Index de la ligne (champ 'index' de read_grid)
+            target_selector: Sélecteur CSS de l'élément dans la ligne
+
+        Returns:
+            True si l'élément a été trouvé et cliqué
+        """
+        return bool(self.rpa_call('clickInRow', rows_selector, index, target_selector))
+
+    def read_alerts(self) -> List[Dict[str, Any]]:
+        """
+        Lire les popups d'alerte ouvertes
+
+        Returns:
+            Popups {titre, message, boutons}
+        """
+        return self.rpa_call('readAlerts') or []
+
+    def rpa_call_async(self, method: str, timeout: float, *args) -> Any:
+        """
+        Appeler une primitive asynchrone de window.__rpa (dernier argument: callback)
+
+        Args:
+            method: Nom de la primitive (waitSpinner, waitAlert, ...)
+            timeout: Durée maximale côté navigateur en secondes
+            *args: Arguments transmis avant le callback
+
+        Returns:
+            Valeur transmise au callback
+        """
+        # Timeout élargi le temps de l'appel seulement: il s'applique à tout le driver
+        self.driver.set_script_timeout(timeout + 5)
+        try:
+            resultat = self.driver.execute_async_script(JS_APPEL_RPA_ASYNC, method, list(args))
+            if resultat == RPA_ABSENT:
+                self.inject_helpers()
+                resultat = self.driver.execute_async_script(JS_APPEL_RPA_ASYNC, method, list(args))
+            return resultat
+        finally:
+            self.driver.set_script_timeout(self.script_timeout)
+
+    def click_alert_button(self, labels: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Cliquer un bouton de la popup ouverte la plus récente
+
+        Args:
+            labels: Libellés acceptés par ordre de préférence (ex: ['Oui', 'OK'])
+
+        Returns:
+            Popup traitée {titre, message, boutons, bouton}, None si aucune
+        """
+        return self.rpa_call('clickAlertButton', list(labels))
+
+    def new_alerts(self) -> List[Dict[str, Any]]:
+        """
+        Popups apparues depuis la dernière consultation, même déjà refermées
+
+        Returns:
+            Popups {seq, titre, message, boutons, ouverte} enregistrées par l'observateur
+        """
+        depuis = self.alert_seq
+        popups = self.rpa_call('alertLog', depuis) or []
+        if depuis and not self.alert_seq:
+            # Nouvelle page: journal réinjecté, tout est nouveau
+            popups = self.rpa_call('alertLog', 0) or []
+        if popups:
+            self.alert_seq = popups[-1]['seq']
+        return popups
+
+    def wait_spinner(self, timeout: float = 60, progress: Optional[Callable[[float], None]] = None,
+                     chunk: float = 30) -> bool:
+        """
+        Attendre la disparition du spinner, résolue côté navigateur (MutationObserver)
+
+        L'attente est découpée en tranches d'au plus 'chunk' secondes pour rester
+        sous les délais du protocole WebDriver et signaler la progression.
+
+        Args:
+            timeout: Échéance stricte en secondes
+            progress: Appelée avec le temps écoulé (s) à la fin de chaque tranche
+            chunk: Durée maximale d'un appel execute_async_script
+
+        Returns:
+            True si le spinner a disparu, False si l'échéance est atteinte
+        """
+        debut = time.monotonic()
+        while True:
+            tranche = max(0.0, min(chunk, timeout - (time.monotonic() - debut)))
+            etat = self.rpa_call_async('waitSpinner', tranche, int(tranche * 1000)) or {}
+            if not etat.get('visible'):
+                return True
+
+            ecoule = time.monotonic() - debut
+            if ecoule >= timeout:
+                self.logger.error(f"⏱️ Spinner toujours affiché après {ecoule:.0f}s (échéance {timeout:.0f}s)")
+                return False
+            if progress:
+                progress(ecoule)
+
+    def wait_alert(self, timeout: float = 5, quiet: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        Attendre l'ouverture d'une popup, ou la fin de l'activité de la page
+
+        Un MutationObserver répond dès qu'une popup apparaît ; sans popup,
+        l'appel rend la main quand le spinner a disparu et que la page n'a
+        plus bougé pendant 'quiet' secondes.
+
+        Args:
+            timeout: Attente maximale en secondes
+            quiet: Durée de calme qui conclut à l'absence de popup
+
+        Returns:
+            Popups ouvertes (même format que read_alerts), liste vide sinon
+        """
+        return self.rpa_call_async('waitAlert', timeout, int(timeout * 1000), int(quiet * 1000)) or []
+
     def refresh_page(self):
         """Actualiser la page"""
         self.driver.refresh()
@@ -190,6 +491,14 @@ class DriverManager:
                 self.logger.error(f"❌ Erreur arrêt driver: {e}")
             finally:
                 self.driver = None
+                BROWSERS_LIVE.dec()
+                self._liberer_profil()
+
+    def _liberer_profil(self):
+        """Rendre le profil de session au pool (Chrome doit être arrêté)"""
+        if self.profile_pool and self.session_profile:
+            self.profile_pool.liberer(self.session_profile)
+            self.session_profile = None
     
     def __enter__(self):
         """Context manager: entrée"""
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Saisie groupée de champs Syracuse
+Un formulaire est décrit par une liste de FormField (cible, valeur, stratégie) :
+- 'clavier' : clic + une seule frappe (Ctrl+A, valeur, TAB), sans pauses fixes,
+  pour les champs qui déclenchent un contrôle serveur (fournisseur, prix...)
+- 'script' : les champs consécutifs sont posés en un seul execute_script qui
+  déclenche focus / input / change / blur comme une saisie réelle
+Les valeurs finales sont ensuite relues en un seul appel.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from core.driver_manager import DriverManager
+from core.logger import Logger
+
+CLAVIER = 'clavier'
+SCRIPT = 'script'
+
+Cible = Union[Tuple[str, str], WebElement]
+
+# Résolution d'une cible côté navigateur: élément transmis ou {by, value}
+JS_RESOUDRE = """
+function resoudre(cible) {
+    if (!cible) { return null; }
+    if (cible.nodeType) { return cible; }
+    if (cible.by === 'id') { return document.getElementById(cible.value); }
+    if (cible.by === 'css selector') { return document.querySelector(cible.value); }
+    if (cible.by === 'xpath') {
+        return document.evaluate(cible.value, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return null;
+}
+"""
+
+JS_APPLIQUER = JS_RESOUDRE + """
+var absents = [];
+arguments[0].forEach(function (champ) {
+    var input = resoudre(champ.cible);
+    if (!input) { absents.push(champ.nom); return; }
+    var proto = input instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    var simuler = !document.hasFocus();
+    input.focus();
+    if (simuler) { input.dispatchEvent(new FocusEvent('focus')); input.dispatchEvent(new FocusEvent('focusin', {bubbles: true})); }
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(input, champ.valeur);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+    input.blur();
+    if (simuler) { input.dispatchEvent(new FocusEvent('blur')); input.dispatchEvent(new FocusEvent('focusout', {bubbles: true})); }
+});
+return absents;
+"""
+
+JS_LIRE = JS_RESOUDRE + """
+return arguments[0].map(function (cible) {
+    var input = resoudre(cible);
+    if (!input) { return null; }
+    return input.type === 'checkbox' ? input.checked : input.value;
+});
+"""
+
+
+def par_label(label: str) -> Tuple[str, str]:
+    """Localisateur de l'input associé à un label Syracuse (cf. get_input_by_label)"""
+    return (By.XPATH,
+            f"//label[contains(@class, 's-field-title') and contains(text(), '{label}')]/following::input[1]")
+
+
+def valeurs_identiques(actuelle: Any, cible: str, numerique: bool = False) -> bool:
+    """
+    Comparer une valeur lue dans Sage à la valeur cible du fichier
+
+    Args:
+        actuelle: Valeur lue (None si champ introuvable)
+        cible: Valeur à écrire
+        numerique: Comparer comme nombres (1 234,50 == 1234.5)
+
+    Returns:
+        True si aucune modification n'est nécessaire
+    """
+    if actuelle is None:
+        return False
+    actuelle, cible = str(actuelle).strip(), str(cible).strip()
+    if numerique:
+        try:
+            return float(actuelle.replace(' ', '').replace('\xa0', '').replace(',', '.')) == \
+                float(cible.replace(' ', '').replace(',', '.'))
+        except ValueError:
+            pass
+    return actuelle.upper() == cible.upper()
+
+
+class FormField:
+    """Description d'un champ à saisir"""
+
+    def __init__(self, cible: Cible, valeur: Any, strategie: str = CLAVIER, nom: Optional[str] = None,
+                 synchro: bool = False, numerique: bool = False, verifier: bool = True):
+        """
+        Décrire un champ
+
+        Args:
+            cible: Localisateur (By, valeur) ou WebElement déjà trouvé
+            valeur: Valeur à saisir
+            strategie: 'clavier' ou 'script'
+            nom: Nom du champ dans les logs et le rapport d'écarts
+            synchro: Attendre la fin du spinner après validation (contrôle serveur)
+            numerique: Relecture comparée comme un nombre (Sage reformate les montants)
+            verifier: Inclure le champ dans la relecture finale
+        """
+        if strategie not in (CLAVIER, SCRIPT):
+            raise ValueError(f"Stratégie de saisie inconnue: {strategie}")
+        self.cible = cible
+        self.valeur = '' if valeur is None else str(valeur)
+        self.strategie = strategie
+        self.nom = nom or (cible[1] if isinstance(cible, tuple) else 'champ')
+        self.synchro = synchro
+        self.numerique = numerique
+        self.verifier = verifier
+
+
+class FormFiller:
+    """Moteur de saisie déclarative des formulaires Syracuse"""
+
+    def __init__(self, driver_manager: DriverManager, timeout: int = 10):
+        """
+        Initialiser le moteur
+
+        Args:
+            driver_manager: DriverManager du robot
+            timeout: Attente maximale d'un champ ou du spinner (secondes)
+        """
+        self.logger = Logger.get_logger('FormFiller', 'core')
+        self.driver_manager = driver_manager
+        self.timeout = timeout
+
+    def remplir(self, champs: Sequence[FormField], verifier: bool = True) -> Dict[str, Tuple[str, Any]]:
+        """
+        Saisir les champs dans l'ordre puis relire les valeurs finales
+
+        Args:
+            champs: Champs à saisir (les champs 'script' consécutifs partent ensemble)
+            verifier: Relire les valeurs en un seul appel après saisie
+
+        Returns:
+            Écarts de relecture {nom: (valeur attendue, valeur lue)}
+
+        Raises:
+            NoSuchElementException / TimeoutException: Si un champ est introuvable
+        """
+        lot: List[FormField] = []
+        for champ in champs:
+            if champ.strategie == SCRIPT:
+                lot.append(champ)
+                continue
+            self._saisir_script(lot)
+            lot = []
+            self._saisir_clavier(champ)
+        self._saisir_script(lot)
+
+        if not verifier:
+            return {}
+        return self.verifier(champs)
+
+    def verifier(self, champs: Sequence[FormField]) -> Dict[str, Tuple[str, Any]]:
+        """
+        Comparer en une lecture les valeurs affichées aux valeurs attendues
+
+        Args:
+            champs: Champs saisis
+
+        Returns:
+            Écarts {nom: (valeur attendue, valeur lue)}
+        """
+        a_verifier = [c for c in champs if c.verifier]
+        if not a_verifier:
+            return {}
+
+        lues = self.lire([c.cible for c in a_verifier])
+        ecarts = {
+            c.nom: (c.valeur, lue) for c, lue in zip(a_verifier, lues)
+            if not valeurs_identiques(lue, c.valeur, numerique=c.numerique)
+        }
+        for nom, (attendue, lue) in ecarts.items():
+            self.logger.warning(f"⚠️ Relecture {nom}: attendu '{attendue}', lu '{lue}'")
+        return ecarts
+
+    def lire(self, cibles: Sequence[Cible]) -> List[Any]:
+        """
+        Lire plusieurs champs en un seul execute_script
+
+        Args:
+            cibles: Localisateurs (By.ID, By.XPATH, By.CSS_SELECTOR) ou WebElements
+
+        Returns:
+            Valeurs dans l'ordre (booléen pour une case à cocher, None si introuvable)
+        """
+        driver = self.driver_manager.driver
+        return driver.execute_script(JS_LIRE, [self._cible_js(c) for c in cibles]) or []
+
+    def _saisir_clavier(self, champ: FormField):
+        """Clic puis une seule frappe: sélection, valeur et TAB (change + blur réels)"""
+        driver = self.driver_manager.driver
+        if isinstance(champ.cible, tuple):
+            element = WebDriverWait(driver, self.timeout).until(EC.element_to_be_clickable(champ.cible))
+        else:
+            element = champ.cible
+
+        element.click()
+        element.send_keys(Keys.CONTROL, 'a', Keys.NULL, champ.valeur, Keys.TAB)
+
+        if champ.synchro:
+            self._attendre_spinner()
+
+    def _saisir_script(self, champs: List[FormField]):
+        """Poser un lot de champs en un seul appel JavaScript"""
+        if not champs:
+            return
+        driver = self.driver_manager.driver
+        absents = driver.execute_script(JS_APPLIQUER, [
+            {'nom': c.nom, 'cible': self._cible_js(c.cible), 'valeur': c.valeur} for c in champs
+        ])
+        if absents:
+            raise NoSuchElementException(f"Champ(s) introuvable(s): {', '.join(absents)}")
+        if any(c.synchro for c in champs):
+            self._attendre_spinner()
+
+    def _attendre_spinner(self):
+        """Attendre la fin du traitement serveur déclenché par la saisie"""
+        if not self.driver_manager.wait_spinner(self.timeout):
+            raise TimeoutException(f"Spinner toujours affiché après {self.timeout}s")
+
+    @staticmethod
+    def _cible_js(cible: Cible):
+        """Forme transmissible à execute_script d'une cible"""
+        if isinstance(cible, tuple):
+            by, valeur = cible
+            if by not in (By.ID, By.XPATH, By.CSS_SELECTOR):
+                raise ValueError(f"Localisateur non supporté pour la saisie groupée: {by}")
+            return {'by': by, 'value': valeur}
+        return cible
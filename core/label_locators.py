@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Cache des inputs associés aux labels Syracuse
+Au lieu d'évaluer //label[...]/following::input[1] sur tout le document à
+chaque recherche, un seul parcours (window.__rpa.labelInputs) associe tous les
+labels de l'écran à leur input. Le cache est propre à la page : il est vidé
+quand DriverManager change de page ou d'onglet, et rechargé si un localisateur
+ne trouve plus son élément.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from core.driver_manager import DriverManager
+from core.form_filler import FormFiller, par_label
+from core.logger import Logger
+
+
+class LabelLocatorCache:
+    """Localisateurs label -> input de la page courante"""
+
+    def __init__(self, driver_manager: DriverManager):
+        """
+        Initialiser le cache
+
+        Args:
+            driver_manager: DriverManager du robot
+        """
+        self.logger = Logger.get_logger('LabelLocatorCache', 'core')
+        self.driver_manager = driver_manager
+        self.entrees: List[Tuple[str, Tuple[str, str]]] = []
+        self.generation: Optional[int] = None
+
+    def invalider(self):
+        """Oublier les localisateurs (changement d'écran)"""
+        self.entrees = []
+        self.generation = None
+
+    def charger(self):
+        """Associer en un seul appel tous les labels de l'écran à leur input"""
+        entrees = self.driver_manager.rpa_call('labelInputs') or []
+        self.entrees = [
+            (e['label'], (By.ID, e['id']) if e.get('id') else
+             (By.CSS_SELECTOR, f"[data-rpa-label='{e['cle']}']"))
+            for e in entrees
+        ]
+        # Lue après l'appel: une injection déclenchée par rpa_call appartient à cette page
+        self.generation = self.driver_manager.page_generation
+        self.logger.debug(f"🏷️ {len(self.entrees)} label(s) indexé(s)")
+
+    def _chercher(self, label: str) -> Optional[Tuple[str, str]]:
+        """Localisateur en cache du premier label contenant le texte, None si inconnu"""
+        if self.generation != self.driver_manager.page_generation:
+            self.charger()
+        for texte, locator in self.entrees:
+            if label in texte:
+                return locator
+        return None
+
+    def localiser(self, label: str, verifier: bool = True) -> Tuple[str, str]:
+        """
+        Localisateur de l'input associé à un label (même règle que par_label)
+
+        Args:
+            label: Texte du label (premier label qui le contient)
+            verifier: Contrôler que le localisateur trouve encore l'input
+                (cache rechargé une fois sinon, comme trouver)
+
+        Returns:
+            (By, valeur) issu du cache, ou l'XPath par_label si le label est inconnu
+        """
+        locator = self._chercher(label)
+        if locator is not None and verifier and not self.driver_manager.driver.find_elements(*locator):
+            self.charger()
+            locator = self._chercher(label)
+        return locator or par_label(label)
+
+    def trouver(self, label: str) -> WebElement:
+        """
+        Input associé à un label, cache rechargé une fois si l'élément a disparu
+
+        Args:
+            label: Texte du label
+
+        Returns:
+            WebElement de l'input
+
+        Raises:
+            NoSuchElementException: Si aucun input n'est associé au label
+        """
+        driver = self.driver_manager.driver
+        try:
+            return driver.find_element(*self.localiser(label, verifier=False))
+        except (NoSuchElementException, StaleElementReferenceException):
+            self.charger()
+            return driver.find_element(*self.localiser(label, verifier=False))
+
+    def lire(self, form_filler: FormFiller, labels: Sequence[str]) -> Dict[str, Any]:
+        """
+        Lire en un seul appel les valeurs des inputs de plusieurs labels
+
+        Args:
+            form_filler: Moteur de lecture
+            labels: Textes des labels
+
+        Returns:
+            {label: valeur} (None si introuvable même après rechargement du cache)
+        """
+        labels = list(labels)
+        valeurs = form_filler.lire([self.localiser(label, verifier=False) for label in labels])
+        if any(v is None for v in valeurs):
+            self.charger()
+            valeurs = form_filler.lire([self.localiser(label, verifier=False) for label in labels])
+        return dict(zip(labels, valeurs))
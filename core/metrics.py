@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+Métriques numériques au format texte Prometheus
+Registre minimal (compteurs, jauges, histogrammes) partagé par l'API et les workers
+"""
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+import time
+
+from config.settings import METRICS_CONFIG
+from core.logger import Logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bornes par défaut (secondes)
+STEP_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900)
+TASK_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200, 14400)
+
+
+def _escape(value: str) -> str:
+    """Échapper une valeur de label"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Formater les labels {a="x",b="y"}"""
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """Formater une valeur numérique"""
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base commune des métriques (nom, aide, labels)"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels attendus {self.labelnames}, reçus {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def clear(self):
+        """Vider toutes les séries"""
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Un compteur ne peut pas diminuer")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Jauge (valeur instantanée)"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif (buckets, somme, nombre)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = STEP_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            serie = self._values.get(key)
+            if serie is None:
+                serie = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self._values[key] = serie
+            for i, borne in enumerate(self.buckets):
+                if value <= borne:
+                    serie['buckets'][i] += 1
+            serie['sum'] += value
+            serie['count'] += 1
+
+    def count(self, **labels) -> int:
+        serie = self._values.get(self._key(labels))
+        return serie['count'] if serie else 0
+
+    @contextmanager
+    def time(self, **labels):
+        """Chronométrer un bloc de code"""
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - debut, **labels)
+
+    def _render_series(self, key, serie) -> List[str]:
+        lines = []
+        for borne, nombre in zip(self.buckets, serie['buckets']):
+            le = f'le="{_format_value(borne)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {nombre}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(serie['sum'])}")
+        lines.append(f"{self.name}_count{labels} {serie['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registre des métriques d'un processus"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self.logger = Logger.get_logger('Metrics', 'core')
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                return self._metrics[metric.name]
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = STEP_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], None]):
+        """
+        Enregistrer une fonction appelée juste avant chaque export
+        (pour les valeurs calculées à la demande, ex: profondeur de file)
+        """
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Exporter toutes les métriques au format texte Prometheus
+
+        Returns:
+            Texte d'exposition
+        """
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                self.logger.warning(f"⚠️ Collecteur de métriques en erreur: {e}")
+
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# REGISTRE ET MÉTRIQUES DU FRAMEWORK
+# ============================================================================
+
+REGISTRY = MetricsRegistry()
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    'rpa_queue_depth', "Tâches dans la file d'attente par type et statut", ('task_type', 'status'))
+TASK_WAIT_SECONDS = REGISTRY.histogram(
+    'rpa_task_wait_seconds', "Latence file d'attente (queued -> started)", ('task_type',), TASK_BUCKETS)
+TASK_DURATION_SECONDS = REGISTRY.histogram(
+    'rpa_task_duration_seconds', "Durée d'exécution (started -> finished)", ('task_type', 'status'), TASK_BUCKETS)
+STEP_DURATION_SECONDS = REGISTRY.histogram(
+    'rpa_step_duration_seconds', "Durée des étapes des robots", ('module', 'step'), STEP_BUCKETS)
+ROBOT_RUNS_TOTAL = REGISTRY.counter(
+    'rpa_robot_runs_total', "Exécutions de robots par issue", ('robot', 'outcome'))
+ROBOT_RESULTS_TOTAL = REGISTRY.counter(
+    'rpa_robot_results_total', "Lignes de résultat produites par statut", ('robot', 'statut'))
+SAGE_LOGINS_TOTAL = REGISTRY.counter(
+    'rpa_sage_logins_total', "Connexions Sage X3 par issue (session, login, failure)", ('outcome',))
+BROWSERS_LIVE = REGISTRY.gauge(
+    'rpa_browsers_live', "Navigateurs Chrome actuellement ouverts")
+WEB_DELIVERY_BACKLOG = REGISTRY.gauge(
+    'rpa_web_delivery_backlog', "Envois de résultats web en cours")
+WEB_DELIVERY_TOTAL = REGISTRY.counter(
+    'rpa_web_delivery_total', "Envois de résultats web par issue", ('outcome',))
+
+
+def step_timer(module: str, step: str):
+    """
+    Chronométrer une étape de robot
+
+    Exemple:
+        with step_timer('lettrage', 'recherche'):
+            ...
+    """
+    return STEP_DURATION_SECONDS.time(module=module, step=step)
+
+
+def observe_task(task: Dict, status: Optional[str] = None, now: Optional[datetime] = None):
+    """
+    Enregistrer les latences d'une tâche de la file (dates ISO)
+
+    Args:
+        task: Tâche (created_at, started_at, completed_at)
+        status: Statut final si la tâche est terminée (completed, failed)
+        now: Date de référence (par défaut maintenant)
+    """
+    now = now or datetime.now()
+    task_type = task.get('task_type', 'bon_commande')
+
+    def _parse(value):
+        try:
+            return datetime.fromisoformat(value) if value else None
+        except (TypeError, ValueError):
+            return None
+
+    created = _parse(task.get('created_at'))
+    started = _parse(task.get('started_at'))
+
+    if status is None:
+        if created:
+            TASK_WAIT_SECONDS.observe(max((now - created).total_seconds(), 0.0), task_type=task_type)
+    elif started:
+        finished = _parse(task.get('completed_at')) or now
+        TASK_DURATION_SECONDS.observe(max((finished - started).total_seconds(), 0.0),
+                                      task_type=task_type, status=status)
+
+
+def collect_queue_depth():
+    """Mettre à jour la profondeur de la file d'attente (fichier JSON partagé)"""
+    from utils.queue_manager import load_queue
+
+    QUEUE_DEPTH.clear()
+    for task in load_queue():
+        status = task.get('status')
+        if status in ('pending', 'processing'):
+            QUEUE_DEPTH.inc(task_type=task.get('task_type', 'bon_commande'), status=status)
+
+
+REGISTRY.register_collector(collect_queue_depth)
+
+
+# ============================================================================
+# EXPORTEUR HTTP LOCAL (WORKERS)
+# ============================================================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Handler HTTP servant /metrics"""
+
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_exporter(port: int = None, host: str = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Démarrer l'exporteur /metrics dans un thread daemon
+
+    Args:
+        port: Port d'écoute (défaut: METRICS_CONFIG['worker_port'])
+        host: Interface d'écoute (défaut: METRICS_CONFIG['worker_host'])
+
+    Returns:
+        Serveur démarré ou None si désactivé / en erreur
+    """
+    logger = Logger.get_logger('Metrics', 'core')
+    if not METRICS_CONFIG['enabled']:
+        logger.info("ℹ️ Métriques désactivées (config)")
+        return None
+
+    port = METRICS_CONFIG['worker_port'] if port is None else port
+    host = host or METRICS_CONFIG['worker_host']
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.error(f"❌ Impossible de démarrer l'exporteur de métriques sur {host}:{port}: {e}")
+        return None
+
+    thread = threading.Thread(target=server.serve_forever, name='metrics-exporter', daemon=True)
+    thread.start()
+    logger.info(f"📈 Exporteur de métriques: http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Pages de modules Sage X3 gardées ouvertes entre deux traitements
+Chaque fonction (GESITM, GESPSH, ...) vit dans son propre onglet Chrome ;
+on bascule d'un onglet à l'autre au lieu de recharger la page.
+"""
+from typing import Callable, Dict, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from core.driver_manager import DriverManager
+from core.logger import Logger
+
+
+class ModuleSessionManager:
+    """Gestionnaire des onglets de modules Sage"""
+
+    def __init__(self, driver_manager: DriverManager, naviguer: Callable[[str], bool],
+                 fermer_page: Callable[..., bool]):
+        """
+        Initialiser le gestionnaire
+
+        Args:
+            driver_manager: DriverManager du robot
+            naviguer: Fonction de navigation (ex: robot.navigate_to_module)
+            fermer_page: Fonction de fermeture de page (ex: robot.close_module)
+        """
+        self.logger = Logger.get_logger('ModuleSessionManager', 'core')
+        self.driver_manager = driver_manager
+        self.naviguer = naviguer
+        self.fermer_page = fermer_page
+
+        self.onglets: Dict[str, str] = {}
+        self.invalides = set()
+
+    def ouvrir(self, cle: str, url: str, pret: Optional[Tuple[str, str]] = None,
+               recharger: bool = False) -> bool:
+        """
+        Afficher le module demandé, en réutilisant son onglet si possible
+
+        Args:
+            cle: Identifiant du module (ex: 'GESITM')
+            url: URL du module
+            pret: Localisateur présent quand la page est utilisable
+            recharger: Forcer le rechargement (écrans qui agissent au chargement)
+
+        Returns:
+            True si le module est affiché
+        """
+        driver = self.driver_manager.driver
+        handle = self.onglets.get(cle)
+
+        if handle and handle in driver.window_handles:
+            self.driver_manager.switch_window(handle)
+            if not recharger and cle not in self.invalides and self._page_valide(pret):
+                self.logger.info(f"↪️ Module {cle} déjà ouvert, onglet réutilisé")
+                return True
+
+            self.logger.info(f"🔄 Rechargement du module {cle}")
+            self.fermer_page(confirm_abandon=True)
+        else:
+            if self.onglets:
+                self.driver_manager.new_tab()
+            self.onglets[cle] = driver.current_window_handle
+
+        self.invalides.discard(cle)
+        return self.naviguer(url)
+
+    def invalider(self, cle: str):
+        """
+        Marquer la page d'un module comme à recharger (après une erreur)
+
+        Args:
+            cle: Identifiant du module
+        """
+        if cle in self.onglets:
+            self.invalides.add(cle)
+
+    def fermer_tout(self):
+        """Fermer proprement les pages ouvertes et ne garder que le premier onglet"""
+        driver = self.driver_manager.driver
+        if not driver or not self.onglets:
+            return
+
+        handles = list(self.onglets.values())
+        for cle, handle in list(self.onglets.items()):
+            try:
+                if handle not in driver.window_handles:
+                    continue
+                self.driver_manager.switch_window(handle)
+                self.fermer_page(confirm_abandon=True)
+                if handle != handles[0]:
+                    driver.close()
+            except Exception as e:
+                self.logger.warning(f"⚠️ Fermeture module {cle} impossible: {e}")
+
+        try:
+            self.driver_manager.switch_window(handles[0])
+        except Exception:
+            pass
+
+        self.onglets.clear()
+        self.invalides.clear()
+
+    def _page_valide(self, pret: Optional[Tuple[str, str]]) -> bool:
+        """Page sans popup ouverte et, si fourni, avec son élément caractéristique"""
+        driver = self.driver_manager.driver
+        try:
+            # Sortir du champ en cours d'édition, puis attendre que la page se stabilise
+            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+            # Popups encore affichées seulement: Syracuse garde les popups refermées dans le DOM
+            if self.driver_manager.wait_alert(timeout=2, quiet=0.15):
+                return False
+            return bool(driver.find_elements(*pret)) if pret else True
+        except Exception:
+            return False
@@ -5,12 +5,27 @@ Connecteur réutilisable pour Sage X3
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import time
 from config.settings import SAGE_CONFIG, SAGE_CONFIG_TEST
 from core.driver_manager import DriverManager
 from core.logger import Logger
+from core.metrics import SAGE_LOGINS_TOTAL
 from selenium.webdriver.common.keys import Keys
 
+# Éléments qui identifient l'état de la page après chargement
+LOGIN_FORM = (By.NAME, "login")
+OK_POPUP = (By.XPATH, "//button[text()='OK']")
+REFRESH_POPUP = (By.XPATH, "//button[contains(text(), 'Actualiser')]")
+
+# Page de module Syracuse utilisable : document analysé, page (ou popup) rendue, spinner absent
+JS_PAGE_PRETE = """
+if (document.readyState === 'loading') { return false; }
+var spinner = document.getElementById('s_lock_long_spin');
+if (spinner && spinner.getClientRects().length && getComputedStyle(spinner).visibility !== 'hidden') { return false; }
+return !!document.querySelector('a.s_page_close, .s_alertbox, input[name="login"]');
+"""
+
 class SageConnector:
     """Gestion de la connexion à Sage X3"""
     
@@ -26,10 +41,16 @@ class SageConnector:
         self.driver = None
         self.is_connected = False
     
-    def connect(self) -> bool:
+    def connect(self, timeout: int = 30) -> bool:
         """
         Se connecter à Sage X3
         
+        Si le profil Chrome contient encore une session valide, le
+        formulaire de connexion n'est pas rempli.
+        
+        Args:
+            timeout: Attente maximale de la page d'accueil (secondes)
+        
         Returns:
             True si connexion réussie
         """
@@ -41,47 +62,90 @@ class SageConnector:
             # Naviguer vers Sage X3
             self.logger.info(f"🔗 Connexion à: {SAGE_CONFIG['url']}")
             self.driver.get(SAGE_CONFIG['url'])
-            time.sleep(2)
             
-            # Remplir le formulaire de connexion
-            username_field = self.driver.find_element(By.NAME, "login")
-            password_field = self.driver.find_element(By.NAME, "password")
-            
-            username_field.send_keys(SAGE_CONFIG['username'])
-            password_field.send_keys(SAGE_CONFIG['password'])
-            
-            # Cliquer sur le bouton de connexion
-            login_button = self.driver.find_element(By.ID, "go-basic")
-            login_button.click()
-            time.sleep(3)
-            
-            # Gérer la popup éventuelle
-            try:
-                ok_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[text()='OK']"))
-                )
-                ok_button.click()
-                self.logger.info("✅ Popup fermée")
-            except:
-                pass
+            if self._attendre_etat_page(timeout) == 'session':
+                self.logger.info("✅ Session Sage X3 encore valide, connexion ignorée")
+                SAGE_LOGINS_TOTAL.inc(outcome='session')
+            else:
+                self._login(timeout)
+                SAGE_LOGINS_TOTAL.inc(outcome='login')
             
-            time.sleep(2)
             self.is_connected = True
             self.logger.info("✅ Connexion Sage X3 réussie")
             return True
             
         except Exception as e:
+            SAGE_LOGINS_TOTAL.inc(outcome='failure')
             self.logger.error(f"❌ Erreur connexion Sage X3: {e}")
             self.is_connected = False
             return False
     
+    def _landing(self) -> tuple:
+        """Localisateur du menu utilisateur, présent uniquement une fois connecté"""
+        return (By.XPATH, f"//a[contains(text(), '{SAGE_CONFIG['titular']}')]")
+    
+    def _attendre_etat_page(self, timeout: int, popup_actualiser: bool = False) -> str:
+        """
+        Attendre que la page affiche un état reconnu
+        
+        Args:
+            timeout: Attente maximale (secondes)
+            popup_actualiser: Reconnaître aussi la popup 'Actualiser'
+        
+        Returns:
+            'session' (connecté), 'login' (formulaire) ou 'actualiser' (popup)
+        """
+        etats = [('session', self._landing()), ('login', LOGIN_FORM)]
+        if popup_actualiser:
+            etats.insert(0, ('actualiser', REFRESH_POPUP))
+        
+        def etat(driver):
+            for nom, locator in etats:
+                if driver.find_elements(*locator):
+                    return nom
+            return False
+        
+        return WebDriverWait(self.driver, timeout).until(etat)
+    
+    def _login(self, timeout: int):
+        """
+        Remplir le formulaire de connexion et attendre la page d'accueil
+        
+        Args:
+            timeout: Attente maximale de la page d'accueil (secondes)
+        """
+        username_field = self.driver.find_element(*LOGIN_FORM)
+        password_field = self.driver.find_element(By.NAME, "password")
+        
+        username_field.send_keys(SAGE_CONFIG['username'])
+        password_field.send_keys(SAGE_CONFIG['password'])
+        
+        # Cliquer sur le bouton de connexion
+        login_button = self.driver.find_element(By.ID, "go-basic")
+        login_button.click()
+        
+        # Attendre la page d'accueil ou la popup éventuelle
+        landing = self._landing()
+        WebDriverWait(self.driver, timeout).until(
+            lambda d: d.find_elements(*landing) or d.find_elements(*OK_POPUP)
+        )
+        
+        # Gérer la popup éventuelle (peut suivre l'affichage de l'accueil)
+        try:
+            ok_button = WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable(OK_POPUP))
+            ok_button.click()
+            self.logger.info("✅ Popup fermée")
+            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located(landing))
+        except TimeoutException:
+            pass
+    
     def navigate_to_module(self, url: str, wait_time: int = 10) -> bool:
         """
         Naviguer vers un module Sage X3
         
         Args:
             url: URL du module
-            wait_time: Temps d'attente après navigation
+            wait_time: Attente maximale de la page Syracuse après navigation
         
         Returns:
             True si navigation réussie
@@ -89,12 +153,21 @@ class SageConnector:
         try:
             self.logger.info(f"🔗 Navigation vers le module")
             self.driver.get(url)
-            time.sleep(wait_time)
+            self.driver_manager.page_changed()
             
-            # Attendre que la page soit chargée
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-            )
+            # Attendre que Syracuse ait rendu la page (indispensable en chargement 'eager')
+            try:
+                WebDriverWait(self.driver, wait_time, poll_frequency=0.2).until(
+                    lambda driver: driver.execute_script(JS_PAGE_PRETE)
+                )
+            except TimeoutException:
+                self.logger.warning(f"⚠️ Page Syracuse non reconnue après {wait_time}s, on continue")
+
+            # Observateur de popups actif dès le chargement
+            try:
+                self.driver_manager.inject_helpers()
+            except Exception as e:
+                self.logger.warning(f"⚠️ Injection __rpa différée: {e}")
             
             self.logger.info("✅ Module chargé")
             return True
@@ -112,21 +185,25 @@ class SageConnector:
         """
         try:
             actualiser_btn = WebDriverWait(self.driver, 2).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Actualiser')]"))
+                EC.element_to_be_clickable(REFRESH_POPUP)
             )
             actualiser_btn.click()
             self.logger.info("✅ Popup 'Actualiser' cliquée")
-            time.sleep(2)
             return True
         except:
             return False
     
-    def refresh_with_popup_handling(self, max_attempts: int = 3) -> bool:
+    def refresh_with_popup_handling(self, max_attempts: int = 3, timeout: int = 10) -> bool:
         """
         Actualiser la page en gérant la popup
         
+        Attend l'état réel de la page plutôt que des délais fixes ; si la
+        session a expiré, seul le formulaire de connexion est rejoué (le
+        navigateur n'est pas relancé).
+        
         Args:
             max_attempts: Nombre max de tentatives
+            timeout: Attente maximale de la page après actualisation (secondes)
         
         Returns:
             True si actualisation réussie
@@ -136,15 +213,18 @@ class SageConnector:
                 self.logger.info(f"🔄 Actualisation (tentative {attempt}/{max_attempts})")
                 
                 self.driver.refresh()
-                time.sleep(2)
+                self.driver_manager.page_changed()
                 
                 # Gérer la popup
-                self.handle_refresh_popup()
+                etat = self._attendre_etat_page(timeout, popup_actualiser=True)
+                if etat == 'actualiser':
+                    self.handle_refresh_popup()
+                    etat = self._attendre_etat_page(timeout)
                 
-                # Attendre le chargement
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-                )
+                if etat == 'login':
+                    self.logger.info("🔑 Session expirée, reconnexion")
+                    self._login(timeout)
+                    SAGE_LOGINS_TOTAL.inc(outcome='login')
                 
                 self.logger.info(f"✅ Actualisation réussie (tentative {attempt})")
                 return True
@@ -184,15 +264,9 @@ class SageConnector:
     def click_oui_if_popup(self,driver, timeout=3):
         """Clique sur Oui si un popup avec bouton Oui apparaît"""
         try:
-            # Vérifier d'abord si le popup est présent
-            popup = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "s_alertbox_footer"))
-            )
-            
-            # Chercher le bouton Oui dans le popup
-            oui_button = popup.find_element(By.XPATH, ".//a[@aria-label='Oui']")
-            oui_button.click()
-            
+            # Rend la main dès l'apparition d'une popup (ou quand la page est calme)
+            if self.driver_manager.wait_alert(timeout=timeout):
+                self.driver_manager.click_alert_button(['Oui'])
         except:
             # Si le popup n'est pas trouvé, ne rien faire
             pass
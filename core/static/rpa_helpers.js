@@ -0,0 +1,280 @@
+/*
+ * Bibliothèque injectée dans les pages Syracuse (window.__rpa)
+ * Primitives groupées appelées par DriverManager : une lecture ou une action
+ * sur toute une grille coûte un seul aller-retour WebDriver.
+ */
+(function () {
+    var VERSION = 8;
+    if (window.__rpa && window.__rpa.version === VERSION) { return; }
+
+    function estVisible(node) {
+        if (!node) { return false; }
+        for (var n = node; n && n.nodeType === 1; n = n.parentElement) {
+            if (n.style && n.style.display === 'none') { return false; }
+        }
+        return true;
+    }
+
+    function valeur(input) {
+        return input.type === 'checkbox' ? input.checked : input.value;
+    }
+
+    function niveau(ligne) {
+        var cellule = ligne.querySelector('td.s-tree-cell');
+        if (!cellule) { return null; }
+        var padding = parseInt(cellule.style.paddingLeft || '0', 10) || 0;
+        return Math.round(padding / 22);
+    }
+
+    function decrireLigne(ligne, index) {
+        var checkbox = ligne.querySelector("input[type='checkbox']");
+        var desc = ligne.querySelector('.s-tree-node-desc-value');
+        var picker = ligne.querySelector('a.s-tree-node-picker');
+        return {
+            index: index,
+            visible: estVisible(ligne),
+            niveau: niveau(ligne),
+            texte: desc ? desc.textContent.trim() : '',
+            checkbox_id: checkbox ? checkbox.id : null,
+            coche: checkbox ? checkbox.checked : null,
+            replie: picker ? picker.classList.contains('s-btn-dir_up') : null,
+            valeurs: Array.prototype.map.call(ligne.querySelectorAll('.s-inplace-input'), valeur)
+        };
+    }
+
+    /* Sélecteur CSS, ou XPath s'il commence par '/' ou '(' */
+    function lignes(selecteur) {
+        if (selecteur.charAt(0) === '/' || selecteur.charAt(0) === '(') {
+            var resultat = [];
+            var snapshot = document.evaluate(selecteur, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < snapshot.snapshotLength; i++) { resultat.push(snapshot.snapshotItem(i)); }
+            return resultat;
+        }
+        return Array.prototype.slice.call(document.querySelectorAll(selecteur));
+    }
+
+    var rpa = { version: VERSION };
+
+    /* Toutes les lignes d'une grille, valeurs des cellules comprises */
+    rpa.readGrid = function (selecteur) {
+        return lignes(selecteur).map(decrireLigne);
+    };
+
+    /* Lignes d'arbre dont le libellé commence par (ou contient) un texte */
+    rpa.treeRows = function (selecteur, texte, niveauAttendu, contient) {
+        var resultat = [];
+        lignes(selecteur).forEach(function (ligne, index) {
+            var info = decrireLigne(ligne, index);
+            if (niveauAttendu !== null && niveauAttendu !== undefined && info.niveau !== niveauAttendu) { return; }
+            if (texte && !(contient ? info.texte.indexOf(texte) >= 0 : info.texte.indexOf(texte) === 0)) { return; }
+            resultat.push(info);
+        });
+        return resultat;
+    };
+
+    /* Cocher des cases par id (clic sur le label, comme un utilisateur) */
+    rpa.tickCheckboxes = function (ids) {
+        var bilan = { coches: [], deja: [], absents: [] };
+        ids.forEach(function (id) {
+            var checkbox = document.getElementById(id);
+            if (!checkbox) { bilan.absents.push(id); return; }
+            if (checkbox.checked) { bilan.deja.push(id); return; }
+            var label = document.querySelector("label[for='" + id + "']");
+            (label || checkbox).scrollIntoView({ block: 'center' });
+            (label || checkbox).click();
+            if (!checkbox.checked) { checkbox.click(); }
+            (checkbox.checked ? bilan.coches : bilan.absents).push(id);
+        });
+        return bilan;
+    };
+
+    /* Cliquer un élément d'une ligne repérée par son index (ex: picker de dépliage) */
+    rpa.clickInRow = function (selecteur, index, cible) {
+        var ligne = lignes(selecteur)[index];
+        var element = ligne ? ligne.querySelector(cible) : null;
+        if (!element) { return false; }
+        element.click();
+        return true;
+    };
+
+    function boutonsAlerte(box) {
+        return Array.prototype.slice.call(box.querySelectorAll('.s_alertbox_footer a, .s_alertbox_footer button'));
+    }
+
+    function libelleBouton(bouton) {
+        return bouton.getAttribute('aria-label') || bouton.textContent.trim();
+    }
+
+    function decrireAlerte(box) {
+        var titre = box.querySelector('.s_alertbox_title');
+        var message = box.querySelector('.s_alertbox_msg');
+        return {
+            titre: titre ? titre.textContent.trim() : '',
+            message: message ? message.textContent.trim() : '',
+            boutons: boutonsAlerte(box).map(libelleBouton)
+        };
+    }
+
+    function alertesOuvertes() {
+        return lignes('.s_alertbox').filter(function (box) {
+            return document.contains(box) && estVisible(box);
+        });
+    }
+
+    /* Popups d'alerte ouvertes: titre, message et boutons */
+    rpa.readAlerts = function () {
+        return alertesOuvertes().map(decrireAlerte);
+    };
+
+    /* Cliquer, dans la popup la plus récente, le premier bouton trouvé parmi les libellés */
+    rpa.clickAlertButton = function (libelles) {
+        var boxes = alertesOuvertes();
+        for (var i = boxes.length - 1; i >= 0; i--) {
+            var boutons = boutonsAlerte(boxes[i]);
+            for (var j = 0; j < libelles.length; j++) {
+                for (var k = 0; k < boutons.length; k++) {
+                    if (libelleBouton(boutons[k]) === libelles[j]) {
+                        var info = decrireAlerte(boxes[i]);
+                        info.bouton = libelles[j];
+                        boutons[k].click();
+                        return info;
+                    }
+                }
+            }
+        }
+        return null;
+    };
+
+    /* Journal de toutes les popups apparues depuis l'injection (observateur permanent) */
+    var journal = [];
+
+    function enregistrer(node) {
+        var boxes = node.matches && node.matches('.s_alertbox') ? [node]
+            : (node.querySelectorAll ? Array.prototype.slice.call(node.querySelectorAll('.s_alertbox')) : []);
+        boxes.forEach(function (box) {
+            if (box.__rpaSeq) { return; }
+            box.__rpaSeq = journal.length + 1;
+            journal.push({ seq: box.__rpaSeq, box: box, apparue: Date.now() });
+        });
+    }
+
+    lignes('.s_alertbox').forEach(enregistrer);
+    new MutationObserver(function (mutations) {
+        mutations.forEach(function (mutation) {
+            Array.prototype.forEach.call(mutation.addedNodes, enregistrer);
+        });
+    }).observe(document.body, { childList: true, subtree: true });
+
+    /* Popups apparues après le numéro 'depuis' (ouvertes ou déjà refermées) */
+    rpa.alertLog = function (depuis) {
+        return journal.slice(depuis || 0).map(function (entree) {
+            var info = decrireAlerte(entree.box);
+            info.seq = entree.seq;
+            info.apparue = entree.apparue;
+            info.ouverte = document.contains(entree.box);
+            return info;
+        });
+    };
+
+    /* Spinner Syracuse affiché ? */
+    rpa.spinnerVisible = function () {
+        var spinner = document.getElementById('s_lock_long_spin');
+        return !!spinner && spinner.getClientRects().length > 0 &&
+            window.getComputedStyle(spinner).visibility !== 'hidden';
+    };
+
+    /* Attendre la disparition du spinner (callback d'execute_async_script)
+     * Résolu par un MutationObserver dès que #s_lock_long_spin disparaît ;
+     * à l'échéance, le callback reçoit visible=true. */
+    rpa.waitSpinner = function (timeoutMs, callback) {
+        var debut = Date.now();
+        var fini = false;
+        var observateur = null;
+        var limite = null;
+
+        function terminer(visible) {
+            if (fini) { return; }
+            fini = true;
+            if (observateur) { observateur.disconnect(); }
+            clearTimeout(limite);
+            callback({ visible: visible, duree: Date.now() - debut });
+        }
+
+        if (!rpa.spinnerVisible()) { return terminer(false); }
+        observateur = new MutationObserver(function () {
+            if (!rpa.spinnerVisible()) { terminer(false); }
+        });
+        observateur.observe(document.body, {
+            childList: true, subtree: true, attributes: true, attributeFilter: ['style', 'class', 'hidden']
+        });
+        limite = setTimeout(function () { terminer(rpa.spinnerVisible()); }, timeoutMs);
+    };
+
+    /* Attendre une popup (MutationObserver) ou le calme de la page, sans délai fixe */
+    rpa.waitAlert = function (timeoutMs, calmeMs, callback) {
+        var fini = false;
+        var minuterieCalme = null;
+        var observateur = null;
+
+        function terminer() {
+            if (fini) { return; }
+            fini = true;
+            if (observateur) { observateur.disconnect(); }
+            clearTimeout(minuterieCalme);
+            clearTimeout(limite);
+            callback(rpa.readAlerts());
+        }
+
+        function armerCalme() {
+            clearTimeout(minuterieCalme);
+            minuterieCalme = setTimeout(function () {
+                if (rpa.spinnerVisible()) { return armerCalme(); }
+                terminer();
+            }, calmeMs);
+        }
+
+        var limite = setTimeout(terminer, timeoutMs);
+        if (rpa.readAlerts().length) { return terminer(); }
+        observateur = new MutationObserver(function () {
+            // Syracuse garde les popups refermées dans le DOM: seules les popups affichées comptent
+            if (alertesOuvertes().length) { return terminer(); }
+            armerCalme();
+        });
+        observateur.observe(document.body, { childList: true, subtree: true, attributes: true, attributeFilter: ['style', 'class'] });
+        armerCalme();
+    };
+
+    /* Associer en un seul parcours chaque label de champ à l'input qui le suit
+     * (même règle que //label/following::input[1]) : {label, id, cle}.
+     * Les inputs sans id sont marqués d'un attribut data-rpa-label propre à ce
+     * parcours : une clé d'une autre page ne peut désigner aucun élément. */
+    var parcours = 0;
+    rpa.labelInputs = function () {
+        parcours += 1;
+        var jeton = Date.now().toString(36) + '-' + parcours;
+        var resultat = [];
+        var enAttente = [];
+        var k = 0;
+        var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_ELEMENT);
+        for (var n = walker.currentNode; n; n = walker.nextNode()) {
+            if (n.tagName === 'LABEL' && n.classList.contains('s-field-title')) {
+                enAttente.push(n);
+            } else if (n.tagName === 'INPUT' && enAttente.length) {
+                var suivants = enAttente.filter(function (label) { return !label.contains(n); });
+                if (!suivants.length) { continue; }
+                var cle = null;
+                if (!n.id) {
+                    cle = jeton + '-' + (k++);
+                    n.setAttribute('data-rpa-label', cle);
+                }
+                suivants.forEach(function (label) {
+                    resultat.push({ label: label.textContent.trim(), id: n.id || null, cle: cle });
+                });
+                enAttente = enAttente.filter(function (label) { return label.contains(n); });
+            }
+        }
+        return resultat;
+    };
+
+    window.__rpa = rpa;
+})();
@@ -8,6 +8,7 @@ import time
 from utils.result_sender import ResultSender
 from config.web_endpoint import WEB_ENDPOINT_CONFIG
 from core.logger import Logger
+from core.metrics import WEB_DELIVERY_BACKLOG, WEB_DELIVERY_TOTAL
 
 
 class WebResultMixin:
@@ -59,6 +60,8 @@ class WebResultMixin:
         logger.info(f"📡 URL: {self.web_endpoint_config['url']}")
         logger.info(f"📊 Mode: {self.web_endpoint_config['mode']}")
         
+        WEB_DELIVERY_BACKLOG.inc()
+        result = None
         try:
             # Formater les données selon le type de robot
             data = self._format_results_for_web(email_f)
@@ -125,11 +128,16 @@ class WebResultMixin:
             logger.error(f"❌ Erreur envoi web: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            return {
+            result = {
                 'success': False,
                 'error': str(e),
                 'message': f'Erreur critique: {str(e)}'
             }
+            return result
+        
+        finally:
+            WEB_DELIVERY_BACKLOG.dec()
+            WEB_DELIVERY_TOTAL.inc(outcome='success' if result and result.get('success') else 'failure')
     
     def _format_results_for_web(self, email_f: str = None) -> Dict[str, Any]:
         """
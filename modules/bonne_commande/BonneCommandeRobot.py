@@ -16,6 +16,7 @@ from collections import defaultdict
 from core.base_robot import BaseRobot
 from core.web_result_mixin import WebResultMixin
 from utils.excel_handler import ExcelHandler
+from utils.ingestion import lire_excel_module, regrouper_fournisseur_da
 import re
 
 
@@ -249,40 +250,7 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
         self.logger.info("📖 LECTURE DU FICHIER EXCEL")
         self.logger.info("="*80)
         
-        df = self.excel_handler.read_excel(
-            excel_file,
-            required_columns=[
-                'Numero_DA', 
-                'Acheteur', 
-                'Code_Fournisseur',
-                'Email_Fournisseur',
-                'TEL_Fournisseu', 
-                'Code_Article', 
-                'Montant',
-                'Marque',
-                'Affaire'
-            ]
-        )
-        
-        self.logger.info(f"✅ {len(df)} lignes lues")
-        
-        # Vérifier les données vides
-        lignes_invalides = []
-        for idx, row in df.iterrows():
-            colonnes_vides = []
-            for col in ['Numero_DA', 'Code_Fournisseur', 'Code_Article', 'Montant', 'Marque']:
-                if pd.isna(row[col]) or str(row[col]).strip() == '':
-                    colonnes_vides.append(col)
-            
-            if colonnes_vides:
-                lignes_invalides.append(idx)
-                self.logger.warning(f"⚠️ Ligne {idx+1} ignorée - Colonnes vides: {', '.join(colonnes_vides)}")
-        
-        if lignes_invalides:
-            df = df.drop(df.index[lignes_invalides])
-            self.logger.warning(f"⚠️ {len(lignes_invalides)} ligne(s) invalide(s) ignorée(s)")
-        
-        self.logger.info(f"✅ {len(df)} lignes valides à traiter")
+        df = lire_excel_module(excel_file, 'bonne_commande', self.excel_handler)
         return df
     
     def _regrouper_donnees(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -292,52 +260,7 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
         self.logger.info("="*80)
 
         # Structure: {code_fournisseur: {email, tel, das, tous_articles}}
-        fournisseurs = {}
-
-        for _, row in df.iterrows():
-            code_fournisseur = str(row['Code_Fournisseur'])
-            email = str(row['Email_Fournisseur'])
-            tel = str(row['TEL_Fournisseu'])
-            numero_da = str(row['Numero_DA'])
-            acheteur = str(row['Acheteur'])
-            code_article = str(row['Code_Article'])
-            montant = str(row['Montant'])
-            marque = str(row['Marque'])
-            affaire = str(row['Affaire'])
-
-            # Initialiser le fournisseur s'il n'existe pas
-            if code_fournisseur not in fournisseurs:
-                fournisseurs[code_fournisseur] = {
-                    'fournisseur': code_fournisseur,
-                    'email': email,
-                    'tel': tel,
-                    'das': {},
-                    'tous_articles': {}
-                }
-
-            # Ajouter la DA si elle n'existe pas pour ce fournisseur
-            if numero_da not in fournisseurs[code_fournisseur]['das']:
-                fournisseurs[code_fournisseur]['das'][numero_da] = {
-                    'acheteur': acheteur,
-                    'articles': []
-                }
-
-            # Ajouter l'article à la DA
-            fournisseurs[code_fournisseur]['das'][numero_da]['articles'].append({
-                'code': code_article,
-                'montant': montant,
-                'marque': marque,
-                'affaire': affaire
-            })
-
-            # Ajouter l'article unique pour ce fournisseur
-            if code_article not in fournisseurs[code_fournisseur]['tous_articles']:
-                fournisseurs[code_fournisseur]['tous_articles'][code_article] = {
-                    'montant': montant,
-                    'fournisseur': code_fournisseur,
-                    'marque': marque,
-                    'affaire': affaire
-                }
+        fournisseurs = regrouper_fournisseur_da(df)
 
         return fournisseurs
     
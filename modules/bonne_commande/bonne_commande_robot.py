@@ -4,7 +4,7 @@ Module BonneCommand - Robot principal OPTIMISÉ avec VALIDATION STRICTE
 Si UN SEUL échec → ARRÊT COMPLET, pas de génération de BC
 Envoi automatique des résultats vers endpoint web
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -13,21 +13,28 @@ from selenium.webdriver.support import expected_conditions as EC
 import time
 from collections import defaultdict
 
-from core.base_robot import BaseRobot
+from config.settings import MODULES_CONFIG
+from core.base_robot import BaseRobot, STATUTS_SUCCES
+from core.form_filler import FormField, valeurs_identiques
+from core.module_sessions import ModuleSessionManager
 from core.web_result_mixin import WebResultMixin
+from utils.article_cache import ArticleCache
 from utils.excel_handler import ExcelHandler
+from utils.ingestion import lire_excel_module, regrouper_fournisseur_da
 import re
 
 
 class BonneCommandeRobot(BaseRobot, WebResultMixin):
     """Robot pour la gestion automatique des bons de commande avec validation stricte et envoi web"""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, mode: str = None):
         """
         Initialiser le robot bonne de commande
         
         Args:
             headless: Mode sans interface
+            mode: 'fournisseur' (un cycle complet par fournisseur) ou 'lot'
+                  (phases regroupées, une seule génération BC)
         """
         # Initialiser BaseRobot
         BaseRobot.__init__(self, 'bonne_commande')
@@ -43,6 +50,9 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
         self.url_demande_achat = "http://192.168.1.241:8124/syracuse-main/html/main.html?url=%2Ftrans%2Fx3%2Ferp%2FBASE1%2F%24sessions%3Ff%3DGESPSH%252F2%252F%252FM%252F%26profile%3D~(loc~%27fr-FR~role~%278ecdb3d1-8ca7-40ca-af08-76cb58c70740~ep~%27cb006c17-58a5-4b98-9f2b-474ec03472a3~appConn~())"
         self.url_bonne_commande = "http://192.168.1.241:8124/syracuse-main/html/main.html?url=%2Ftrans%2Fx3%2Ferp%2FBASE1%2F%24sessions%3Ff%3DXBCAUTO%252F2%252F%252FM%252F"
 
+        # Pages GESITM / GESPSH / XBCAUTO gardées ouvertes d'un fournisseur à l'autre
+        self.modules = ModuleSessionManager(self.driver_manager, self.navigate_to_module, self.close_module)
+
         # Compteurs pour validation stricte
         self.articles_traites = 0
         self.articles_echec = 0
@@ -50,7 +60,14 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
         self.das_echec = 0
         self.validation_passed = False
 
-        self.logger.info(f"🤖 Robot Bonne de Commande initialisé (MODE STRICT + ENVOI WEB)")
+        # Articles confirmés lors des tâches précédentes
+        self.cache_articles = ArticleCache(ttl=MODULES_CONFIG['bonne_commande']['cache_articles_ttl'])
+
+        self.mode = mode or MODULES_CONFIG['bonne_commande']['mode']
+        if self.mode not in ('fournisseur', 'lot'):
+            raise ValueError(f"Mode inconnu: {self.mode} (attendu: 'fournisseur' ou 'lot')")
+
+        self.logger.info(f"🤖 Robot Bonne de Commande initialisé (MODE STRICT + ENVOI WEB, mode {self.mode})")
 
     def execute(self, excel_file: str, url: str = None):
         """
@@ -75,152 +92,78 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
             # 4. CONNEXION SAGE
             self.connect_sage()
 
-            # 5. TRAITER CHAQUE FOURNISSEUR SÉPARÉMENT
-            for idx_fournisseur, (code_fournisseur, data_fournisseur) in enumerate(fournisseurs.items(), 1):
-                self.logger.info("" + "="*80)
-                self.logger.info(f"🏢 TRAITEMENT FOURNISSEUR {idx_fournisseur}/{len(fournisseurs)}: {code_fournisseur}")
-                self.logger.info("="*80)
-
-                # Réinitialiser les compteurs et résultats pour ce fournisseur
-                self.articles_traites = 0
-                self.articles_echec = 0
-                self.das_traitees = 0
-                self.das_echec = 0
-                self.validation_passed = False
-                self.bc_numbers = []
-                self.message_final = ""
-
-                # IMPORTANT: Vider les résultats précédents pour ce nouveau fournisseur
-                self.results = []
-
-                # IMPORTANT: Réinitialiser les erreurs du fournisseur précédent
-                self.error_screenshot = None
-                self.popup_messages = []
-
-                # PHASE 1 : TRAITER LES ARTICLES DE CE FOURNISSEUR
-                self.logger.info("="*80)
-                self.logger.info(f"🔧 PHASE 1 : TRAITEMENT DES ARTICLES - Fournisseur {code_fournisseur}")
-                self.logger.info("="*80)
-                articles_ok = self._traiter_tous_articles(data_fournisseur)
-
-                if not articles_ok:
-                    self.logger.error("" + "="*80)
-                    self.logger.error(f"❌ ÉCHEC PHASE 1 pour fournisseur {code_fournisseur}")
-                    self.logger.error("❌ ARRÊT DU PROCESSUS - BC NON GÉNÉRÉ pour ce fournisseur")
-                    self.logger.error("="*80)
-
-                    # Ajouter un résultat final d'échec pour ce fournisseur
-                    self.add_result({
-                        'type': 'BILAN_FINAL',
-                        'fournisseur': code_fournisseur,
-                        'phase': 'Articles',
-                        'statut': 'ECHEC',
-                        'articles_traites': self.articles_traites,
-                        'articles_echec': self.articles_echec,
-                        'das_traitees': 0,
-                        'das_echec': 0,
-                        'bc_genere': False,
-                        'message': f'Échec lors du traitement des articles pour fournisseur {code_fournisseur} ({self.articles_echec} échec(s)). BC non généré.'
-                    })
-                    self.save_report()
-
-                    # ✨ ENVOYER LES RÉSULTATS VERS LE WEB MÊME EN CAS D'ÉCHEC
-                    self.logger.info("✨ Envoi des résultats vers l'endpoint web...")
-                    web_result = self.send_results_to_web(email_achteur)
-                    if web_result and web_result.get('success'):
-                        self.logger.info("✅ Résultats envoyés vers l'endpoint web avec succès")
-                    elif web_result and not web_result.get('success'):
-                        self.logger.warning(f"⚠️ Échec envoi web: {web_result.get('message')}")
-
-                    continue  # Passer au fournisseur suivant
-
-                # PHASE 2 : TRAITER LES DEMANDES D'ACHAT DE CE FOURNISSEUR
-                self.logger.info("" + "="*80)
-                self.logger.info(f"📋 PHASE 2 : TRAITEMENT DES DEMANDES D'ACHAT - Fournisseur {code_fournisseur}")
-                self.logger.info("="*80)
-                das_ok = self._traiter_toutes_das(data_fournisseur)
-
-                if not das_ok:
-                    self.logger.error("" + "="*80)
-                    self.logger.error(f"❌ ÉCHEC PHASE 2 pour fournisseur {code_fournisseur}")
-                    self.logger.error("❌ ARRÊT DU PROCESSUS - BC NON GÉNÉRÉ pour ce fournisseur")
-                    self.logger.error("="*80)
-
-                    # Ajouter un résultat final d'échec pour ce fournisseur
-                    self.add_result({
-                        'type': 'BILAN_FINAL',
-                        'fournisseur': code_fournisseur,
-                        'phase': 'Demandes_Achat',
-                        'statut': 'ECHEC',
-                        'articles_traites': self.articles_traites,
-                        'articles_echec': self.articles_echec,
-                        'das_traitees': self.das_traitees,
-                        'das_echec': self.das_echec,
-                        'bc_genere': False,
-                        'message': f'Échec lors du traitement des DAs pour fournisseur {code_fournisseur} ({self.das_echec} échec(s)). BC non généré.'
-                    })
-                    self.save_report()
-
-                    # ✨ ENVOYER LES RÉSULTATS VERS LE WEB MÊME EN CAS D'ÉCHEC
-                    self.logger.info("✨ Envoi des résultats vers l'endpoint web...")
-                    web_result = self.send_results_to_web(email_achteur)
-                    if web_result and web_result.get('success'):
-                        self.logger.info("✅ Résultats envoyés vers l'endpoint web avec succès")
-                    elif web_result and not web_result.get('success'):
-                        self.logger.warning(f"⚠️ Échec envoi web: {web_result.get('message')}")
-
-                    continue  # Passer au fournisseur suivant
-
-                # PHASE 3 : GÉNÉRER LE BON DE COMMANDE POUR CE FOURNISSEUR
-                self.logger.info("" + "="*80)
-                self.logger.info(f"✅ VALIDATION COMPLÈTE RÉUSSIE - Fournisseur {code_fournisseur}")
-                self.logger.info("="*80)
-                self.logger.info(f"✅ Articles traités avec succès: {self.articles_traites}/{self.articles_traites + self.articles_echec}")
-                self.logger.info(f"✅ DAs traitées avec succès: {self.das_traitees}/{self.das_traitees + self.das_echec}")
-
-                bc_numbers = self._generer_bon_de_commande(data_fournisseur)
-                bc_genere = len(bc_numbers) > 0
-
-                # Déterminer le statut final basé sur la génération de BC
-                statut_final = 'SUCCES' if bc_genere else 'ECHEC'
-                message_final = f'Tous les traitements réussis pour fournisseur {code_fournisseur}. BC généré avec succès: {bc_numbers}' if bc_genere else f'Articles et DAs traités avec succès pour fournisseur {code_fournisseur} mais échec de génération BC.'
-
-                # Mettre à jour validation_passed pour ce fournisseur
-                self.validation_passed = bc_genere
-
-                # Stocker bc_numbers et message_final pour l'envoi web
-                self.bc_numbers = bc_numbers
-                self.message_final = message_final
-
-                # Ajouter un résultat final pour ce fournisseur
-                self.add_result({
-                    'type': 'BILAN_FINAL',
-                    'fournisseur': code_fournisseur,
-                    'phase': 'Complete',
-                    'statut': statut_final,
-                    'articles_traites': self.articles_traites,
-                    'articles_echec': self.articles_echec,
-                    'das_traitees': self.das_traitees,
-                    'das_echec': self.das_echec,
-                    'bc_genere': bc_genere,
-                    'bc_numbers': bc_numbers,
-                    'message': message_final
-                })
-
-                self.save_report()
-
-                # ✨ ENVOYER LES RÉSULTATS VERS LE WEB APRÈS CHAQUE FOURNISSEUR
-                self.logger.info("✨ Envoi des résultats vers l'endpoint web...")
-                web_result = self.send_results_to_web(email_achteur)
-
-                if web_result and web_result.get('success'):
-                    self.logger.info("✅ Résultats envoyés vers l'endpoint web avec succès")
-                elif web_result and not web_result.get('success'):
-                    self.logger.warning(f"⚠️ Échec envoi web: {web_result.get('message')}")
-
-                self.logger.info("" + "="*80)
-                self.logger.info(f"🎉 FOURNISSEUR {code_fournisseur} TRAITÉ AVEC SUCCÈS")
-                self.logger.info("="*80)
+            if self.mode == 'lot':
+                # 5. MODE LOT : PHASES REGROUPÉES POUR TOUS LES FOURNISSEURS
+                self._traiter_par_lot(fournisseurs, email_achteur)
+            else:
+                # 5. TRAITER CHAQUE FOURNISSEUR SÉPARÉMENT
+                for idx_fournisseur, (code_fournisseur, data_fournisseur) in enumerate(fournisseurs.items(), 1):
+                    self.logger.info("" + "="*80)
+                    self.logger.info(f"🏢 TRAITEMENT FOURNISSEUR {idx_fournisseur}/{len(fournisseurs)}: {code_fournisseur}")
+                    self.logger.info("="*80)
+
+                    # Réinitialiser les compteurs et résultats pour ce fournisseur
+                    self._reinitialiser_fournisseur()
+
+                    # PHASE 1 : TRAITER LES ARTICLES DE CE FOURNISSEUR
+                    self.logger.info("="*80)
+                    self.logger.info(f"🔧 PHASE 1 : TRAITEMENT DES ARTICLES - Fournisseur {code_fournisseur}")
+                    self.logger.info("="*80)
+                    with self.etape('articles'):
+                        articles_ok = self._traiter_tous_articles(data_fournisseur)
+
+                    if not articles_ok:
+                        self.logger.error("" + "="*80)
+                        self.logger.error(f"❌ ÉCHEC PHASE 1 pour fournisseur {code_fournisseur}")
+                        self.logger.error("❌ ARRÊT DU PROCESSUS - BC NON GÉNÉRÉ pour ce fournisseur")
+                        self.logger.error("="*80)
+
+                        self._bilan_fournisseur(
+                            code_fournisseur, 'Articles', self._compteurs(), [], email_achteur,
+                            f'Échec lors du traitement des articles pour fournisseur {code_fournisseur} ({self.articles_echec} échec(s)). BC non généré.'
+                        )
+
+                        continue  # Passer au fournisseur suivant
+
+                    # PHASE 2 : TRAITER LES DEMANDES D'ACHAT DE CE FOURNISSEUR
+                    self.logger.info("" + "="*80)
+                    self.logger.info(f"📋 PHASE 2 : TRAITEMENT DES DEMANDES D'ACHAT - Fournisseur {code_fournisseur}")
+                    self.logger.info("="*80)
+                    with self.etape('demandes_achat'):
+                        das_ok = self._traiter_toutes_das(data_fournisseur)
+
+                    if not das_ok:
+                        self.logger.error("" + "="*80)
+                        self.logger.error(f"❌ ÉCHEC PHASE 2 pour fournisseur {code_fournisseur}")
+                        self.logger.error("❌ ARRÊT DU PROCESSUS - BC NON GÉNÉRÉ pour ce fournisseur")
+                        self.logger.error("="*80)
+
+                        self._bilan_fournisseur(
+                            code_fournisseur, 'Demandes_Achat', self._compteurs(), [], email_achteur,
+                            f'Échec lors du traitement des DAs pour fournisseur {code_fournisseur} ({self.das_echec} échec(s)). BC non généré.'
+                        )
+
+                        continue  # Passer au fournisseur suivant
+
+                    # PHASE 3 : GÉNÉRER LE BON DE COMMANDE POUR CE FOURNISSEUR
+                    self.logger.info("" + "="*80)
+                    self.logger.info(f"✅ VALIDATION COMPLÈTE RÉUSSIE - Fournisseur {code_fournisseur}")
+                    self.logger.info("="*80)
+                    self.logger.info(f"✅ Articles traités avec succès: {self.articles_traites}/{self.articles_traites + self.articles_echec}")
+                    self.logger.info(f"✅ DAs traitées avec succès: {self.das_traitees}/{self.das_traitees + self.das_echec}")
+
+                    with self.etape('generation_bc'):
+                        bc_numbers = self._generer_bon_de_commande(data_fournisseur)
+                    if bc_numbers:
+                        message_final = f'Tous les traitements réussis pour fournisseur {code_fournisseur}. BC généré avec succès: {bc_numbers}'
+                    else:
+                        message_final = f'Articles et DAs traités avec succès pour fournisseur {code_fournisseur} mais échec de génération BC.'
+                    self._bilan_fournisseur(code_fournisseur, 'Complete', self._compteurs(),
+                                            bc_numbers, email_achteur, message_final)
+
+                    self.logger.info("" + "="*80)
+                    self.logger.info(f"🎉 FOURNISSEUR {code_fournisseur} TRAITÉ AVEC SUCCÈS")
+                    self.logger.info("="*80)
 
             # FIN DU TRAITEMENT DE TOUS LES FOURNISSEURS
             self.logger.info("" + "="*80)
@@ -262,48 +205,158 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
         
         finally:
             self.logger.info("Deconnexion du robot...")
+            self.modules.fermer_tout()
             self.disconnect_sage()
     
+    def _reinitialiser_fournisseur(self):
+        """Réinitialiser les compteurs, résultats et erreurs avant un nouveau fournisseur"""
+        self.articles_traites = 0
+        self.articles_echec = 0
+        self.das_traitees = 0
+        self.das_echec = 0
+        self.validation_passed = False
+        self.bc_numbers = []
+        self.message_final = ""
+
+        # IMPORTANT: Vider les résultats précédents pour ce nouveau fournisseur
+        self.results = []
+
+        # IMPORTANT: Réinitialiser les erreurs du fournisseur précédent
+        self.error_screenshot = None
+        self.popup_messages = []
+
+    def _compteurs(self) -> Dict[str, int]:
+        """Compteurs du fournisseur en cours, au format attendu par _bilan_fournisseur"""
+        return {
+            'articles_traites': self.articles_traites, 'articles_echec': self.articles_echec,
+            'das_traitees': self.das_traitees, 'das_echec': self.das_echec,
+        }
+
+    def _traiter_par_lot(self, fournisseurs: Dict[str, Any], email_achteur: str):
+        """
+        Mode lot : articles de tous les fournisseurs, puis toutes les DAs,
+        puis UNE génération de BC dont les numéros sont rattachés aux fournisseurs
+
+        La validation reste stricte par fournisseur : un fournisseur en échec
+        est écarté des phases suivantes (et n'a pas de BC), les autres continuent.
+
+        Args:
+            fournisseurs: Structure {code_fournisseur: data} de _regrouper_donnees
+            email_achteur: Email pour l'envoi des résultats web
+        """
+        compteurs = {}
+        valides = []
+
+        # PHASE 1 : ARTICLES DE TOUS LES FOURNISSEURS
+        self.logger.info("="*80)
+        self.logger.info(f"🔧 PHASE 1 (LOT) : ARTICLES DE {len(fournisseurs)} FOURNISSEUR(S)")
+        self.logger.info("="*80)
+        for code_fournisseur, data_fournisseur in fournisseurs.items():
+            self.logger.info(f"🏢 Articles du fournisseur {code_fournisseur}")
+            self._reinitialiser_fournisseur()
+            with self.etape('articles'):
+                articles_ok = self._traiter_tous_articles(data_fournisseur)
+            compteurs[code_fournisseur] = self._compteurs()
+
+            if articles_ok:
+                valides.append(code_fournisseur)
+            else:
+                self._bilan_fournisseur(
+                    code_fournisseur, 'Articles', compteurs[code_fournisseur], [], email_achteur,
+                    f'Échec lors du traitement des articles pour fournisseur {code_fournisseur} ({self.articles_echec} échec(s)). BC non généré.'
+                )
+
+        # PHASE 2 : DAs DES FOURNISSEURS VALIDES
+        self.logger.info("="*80)
+        self.logger.info(f"📋 PHASE 2 (LOT) : DEMANDES D'ACHAT DE {len(valides)} FOURNISSEUR(S)")
+        self.logger.info("="*80)
+        for code_fournisseur in list(valides):
+            self.logger.info(f"🏢 DAs du fournisseur {code_fournisseur}")
+            self._reinitialiser_fournisseur()
+            with self.etape('demandes_achat'):
+                das_ok = self._traiter_toutes_das(fournisseurs[code_fournisseur])
+            compteurs[code_fournisseur].update(das_traitees=self.das_traitees, das_echec=self.das_echec)
+
+            if not das_ok:
+                valides.remove(code_fournisseur)
+                self._bilan_fournisseur(
+                    code_fournisseur, 'Demandes_Achat', compteurs[code_fournisseur], [], email_achteur,
+                    f'Échec lors du traitement des DAs pour fournisseur {code_fournisseur} ({self.das_echec} échec(s)). BC non généré.'
+                )
+
+        if not valides:
+            self.logger.error("❌ Aucun fournisseur validé - pas de génération de BC")
+            return
+
+        # PHASE 3 : UNE SEULE GÉNÉRATION DE BC
+        self.logger.info("="*80)
+        self.logger.info(f"✅ VALIDATION RÉUSSIE POUR {len(valides)} FOURNISSEUR(S) - GÉNÉRATION BC UNIQUE")
+        self.logger.info("="*80)
+        self._reinitialiser_fournisseur()
+        with self.etape('generation_bc'):
+            bc_par_fournisseur = self._generer_bons_de_commande_lot(valides)
+        # Capture et popups de la génération, rattachées au bilan de chaque fournisseur
+        capture_generation, popups_generation = self.error_screenshot, list(self.popup_messages)
+
+        for code_fournisseur in valides:
+            self._reinitialiser_fournisseur()
+            self.error_screenshot, self.popup_messages = capture_generation, list(popups_generation)
+            bc_numbers = bc_par_fournisseur.get(code_fournisseur, [])
+            if bc_numbers:
+                message = f'Tous les traitements réussis pour fournisseur {code_fournisseur}. BC généré avec succès: {bc_numbers}'
+            else:
+                message = f'Articles et DAs traités avec succès pour fournisseur {code_fournisseur} mais échec de génération BC.'
+            self._bilan_fournisseur(code_fournisseur, 'Complete', compteurs[code_fournisseur],
+                                    bc_numbers, email_achteur, message)
+
+    def _bilan_fournisseur(self, code_fournisseur: str, phase: str, compteurs: Dict[str, int],
+                           bc_numbers: List[str], email_achteur: str, message: str):
+        """
+        Enregistrer le bilan d'un fournisseur et l'envoyer vers l'endpoint web
+
+        Args:
+            code_fournisseur: Code du fournisseur
+            phase: Articles, Demandes_Achat ou Complete
+            compteurs: articles_traites, articles_echec, das_traitees, das_echec
+            bc_numbers: Numéros de BC rattachés au fournisseur
+            email_achteur: Email pour l'envoi des résultats web
+            message: Message final
+        """
+        bc_genere = len(bc_numbers) > 0
+        for nom, valeur in compteurs.items():
+            setattr(self, nom, valeur)
+        self.validation_passed = bc_genere
+        self.bc_numbers = bc_numbers
+        self.message_final = message
+
+        resultat = {
+            'type': 'BILAN_FINAL',
+            'fournisseur': code_fournisseur,
+            'phase': phase,
+            'statut': 'SUCCES' if bc_genere else 'ECHEC',
+            **compteurs,
+            'bc_genere': bc_genere,
+            'message': message
+        }
+        if phase == 'Complete':
+            resultat['bc_numbers'] = bc_numbers
+        self.add_result(resultat)
+        self.save_report()
+
+        self.logger.info("✨ Envoi des résultats vers l'endpoint web...")
+        web_result = self.send_results_to_web(email_achteur)
+        if web_result and web_result.get('success'):
+            self.logger.info("✅ Résultats envoyés vers l'endpoint web avec succès")
+        elif web_result and not web_result.get('success'):
+            self.logger.warning(f"⚠️ Échec envoi web: {web_result.get('message')}")
+
     def _lire_et_valider_excel(self, excel_file: str) -> pd.DataFrame:
         """Lire et valider le fichier Excel"""
         self.logger.info("="*80)
         self.logger.info("📖 LECTURE DU FICHIER EXCEL")
         self.logger.info("="*80)
         
-        df = self.excel_handler.read_excel(
-            excel_file,
-            required_columns=[
-                'Numero_DA', 
-                'Acheteur', 
-                'Code_Fournisseur',
-                'Email_Fournisseur',
-                'TEL_Fournisseu', 
-                'Code_Article', 
-                'Montant',
-                'Marque',
-                'Affaire'
-            ]
-        )
-        
-        self.logger.info(f"✅ {len(df)} lignes lues")
-        
-        # Vérifier les données vides
-        lignes_invalides = []
-        for idx, row in df.iterrows():
-            colonnes_vides = []
-            for col in ['Numero_DA', 'Code_Fournisseur', 'Code_Article', 'Montant', 'Marque']:
-                if pd.isna(row[col]) or str(row[col]).strip() == '':
-                    colonnes_vides.append(col)
-            
-            if colonnes_vides:
-                lignes_invalides.append(idx)
-                self.logger.warning(f"⚠️ Ligne {idx+1} ignorée - Colonnes vides: {', '.join(colonnes_vides)}")
-        
-        if lignes_invalides:
-            df = df.drop(df.index[lignes_invalides])
-            self.logger.warning(f"⚠️ {len(lignes_invalides)} ligne(s) invalide(s) ignorée(s)")
-        
-        self.logger.info(f"✅ {len(df)} lignes valides à traiter")
+        df = lire_excel_module(excel_file, 'bonne_commande', self.excel_handler)
         return df
     
     def _regrouper_donnees(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -313,52 +366,7 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
         self.logger.info("="*80)
 
         # Structure: {code_fournisseur: {email, tel, das, tous_articles}}
-        fournisseurs = {}
-
-        for _, row in df.iterrows():
-            code_fournisseur = str(row['Code_Fournisseur'])
-            email = str(row['Email_Fournisseur'])
-            tel = str(row['TEL_Fournisseu'])
-            numero_da = str(row['Numero_DA'])
-            acheteur = str(row['Acheteur'])
-            code_article = str(row['Code_Article'])
-            montant = str(row['Montant'])
-            marque = str(row['Marque'])
-            affaire = str(row['Affaire'])
-
-            # Initialiser le fournisseur s'il n'existe pas
-            if code_fournisseur not in fournisseurs:
-                fournisseurs[code_fournisseur] = {
-                    'fournisseur': code_fournisseur,
-                    'email': email,
-                    'tel': tel,
-                    'das': {},
-                    'tous_articles': {}
-                }
-
-            # Ajouter la DA si elle n'existe pas pour ce fournisseur
-            if numero_da not in fournisseurs[code_fournisseur]['das']:
-                fournisseurs[code_fournisseur]['das'][numero_da] = {
-                    'acheteur': acheteur,
-                    'articles': []
-                }
-
-            # Ajouter l'article à la DA
-            fournisseurs[code_fournisseur]['das'][numero_da]['articles'].append({
-                'code': code_article,
-                'montant': montant,
-                'marque': marque,
-                'affaire': affaire
-            })
-
-            # Ajouter l'article unique pour ce fournisseur
-            if code_article not in fournisseurs[code_fournisseur]['tous_articles']:
-                fournisseurs[code_fournisseur]['tous_articles'][code_article] = {
-                    'montant': montant,
-                    'fournisseur': code_fournisseur,
-                    'marque': marque,
-                    'affaire': affaire
-                }
+        fournisseurs = regrouper_fournisseur_da(df)
 
         return fournisseurs
     
@@ -393,8 +401,8 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
     
     def _traiter_tous_articles(self, structure: Dict[str, Any]) -> bool:
         """Traiter tous les articles UNIQUES avec validation stricte"""
-        self.navigate_to_module(self.url_article)
-        time.sleep(2)
+        self.modules.ouvrir('GESITM', self.url_article,
+                            pret=(By.XPATH, "//header[.//a[contains(text(), 'Articles')]]"))
         
         total_articles = len(structure['tous_articles'])
 
@@ -404,17 +412,43 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
                 self.logger.info(f"📦 Article {idx}/{total_articles}: {code_article}")
                 self.logger.info(f"{'─'*80}")
                 
-                resultat = self.traiter_article(
-                    code_article=code_article,
-                    code_fournisseur=structure['fournisseur'],
-                    montant=info_article['montant'],
-                    marque=info_article.get('marque',''),
-                    affaire=info_article.get('affaire','')
-                )
+                valeurs = {
+                    'fournisseur': structure['fournisseur'],
+                    'montant': info_article['montant'],
+                    'marque': info_article.get('marque',''),
+                    'affaire': info_article.get('affaire',''),
+                }
+                
+                if self.cache_articles.est_a_jour(code_article, **valeurs):
+                    age_h = self.cache_articles.age(code_article) / 3600
+                    resultat = {
+                        'type': 'Article',
+                        'code_article': code_article,
+                        'code_fournisseur': valeurs['fournisseur'],
+                        'montant': valeurs['montant'],
+                        'marque': valeurs['marque'],
+                        'affaire': valeurs['affaire'],
+                        'statut': 'Inchangé',
+                        'message': f'Article confirmé il y a {age_h:.1f} h (cache), non retouché'
+                    }
+                    self.logger.info(f"⏭️ Article {code_article} déjà confirmé il y a {age_h:.1f} h (cache)")
+                else:
+                    resultat = self.traiter_article(
+                        code_article=code_article,
+                        code_fournisseur=valeurs['fournisseur'],
+                        montant=valeurs['montant'],
+                        marque=valeurs['marque'],
+                        affaire=valeurs['affaire']
+                    )
+                    
+                    if resultat['statut'] in STATUTS_SUCCES:
+                        self.cache_articles.confirmer(code_article, **valeurs)
+                    else:
+                        self.cache_articles.invalider(code_article)
                 
                 self.add_result(resultat)
                 
-                if resultat['statut'] == 'Succes':
+                if resultat['statut'] in STATUTS_SUCCES:
                     self.articles_traites += 1
                     self.logger.info(f"✅ Article {code_article} traité avec succès ({self.articles_traites}/{total_articles})")
                 else:
@@ -422,26 +456,19 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
                     self.logger.error(f"❌ ÉCHEC Article {code_article}: {resultat['message']}")
                     self.logger.error(f"❌ ARRÊT IMMÉDIAT - Article en échec détecté")
                     
+                    self.modules.invalider('GESITM')
                     self.save_report(incremental=True)
                     return False
                 
-                time.sleep(2)
+                if resultat['statut'] != 'Inchangé':
+                    time.sleep(2)
         except Exception as e:
             self.logger.error(f"❌ ERREUR lors du traitement des articles: {e}")
+            self.modules.invalider('GESITM')
             self.save_report(incremental=True)
             return False
         finally:
-            
             self.logger.info(f"✅ Articles traités: {self.articles_traites}, Échecs: {self.articles_echec}")
-            driver = self.driver_manager.driver
-
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-            time.sleep(0.5)
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-
-            s_page_close = driver.find_element(By.CSS_SELECTOR, "a.s_page_close")
-            s_page_close.click()
-            time.sleep(2)
 
         self.logger.info(f"✅ PHASE 1 RÉUSSIE: {self.articles_traites}/{total_articles} articles traités")
         self.save_report(incremental=True)
@@ -449,8 +476,8 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
     
     def _traiter_toutes_das(self, structure: Dict[str, Any]) -> bool:
         """Traiter toutes les DAs UNIQUES avec validation stricte"""
-        self.navigate_to_module(self.url_demande_achat)
-        time.sleep(2)
+        self.modules.ouvrir('GESPSH', self.url_demande_achat,
+                            pret=(By.XPATH, "//header[.//a[contains(text(), 'Demandes')]]"))
         
         total_das = len(structure['das'])
         try:
@@ -476,25 +503,18 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
                     self.logger.error(f"❌ ÉCHEC DA {numero_da}: {resultat['message']}")
                     self.logger.error(f"❌ ARRÊT IMMÉDIAT - DA en échec détectée")
                     
+                    self.modules.invalider('GESPSH')
                     self.save_report(incremental=True)
                     return False
                 
                 time.sleep(2)
         except Exception as e:
             self.logger.error(f"❌ ERREUR lors du traitement des DAs: {e}")
+            self.modules.invalider('GESPSH')
             self.save_report(incremental=True)
             return False
         finally:
             self.logger.info(f"✅ DAs traitées: {self.das_traitees}, Échecs: {self.das_echec}")
-            driver = self.driver_manager.driver
-
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-            time.sleep(0.5)
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-
-            s_page_close = driver.find_element(By.CSS_SELECTOR, "a.s_page_close")
-            s_page_close.click()
-            time.sleep(2)
         
         self.logger.info(f"✅ PHASE 2 RÉUSSIE: {self.das_traitees}/{total_das} DAs traitées")
         self.save_report(incremental=True)
@@ -510,8 +530,8 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
 
         try:
             
-            # Naviguer vers le module bonne de commande
-            self.navigate_to_module(self.url_bonne_commande)
+            # Naviguer vers le module bonne de commande (la génération se fait au chargement)
+            self.modules.ouvrir('XBCAUTO', self.url_bonne_commande, recharger=True)
             # generation automatique de la BC
             # time.sleep(500)
             self.wait_for_spinner_to_disappear(driver, timeout=9000)
@@ -546,19 +566,53 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
 
             driver.save_screenshot("error_generation_bonne_commande.png")
             return []
-        finally:
-            self.logger.info("="*80)
-            self.logger.info("🔒 Fermeture du module Bonne de Commande")
-            driver = self.driver_manager.driver
+        
+    def _generer_bons_de_commande_lot(self, codes_fournisseurs: List[str]) -> Dict[str, List[str]]:
+        """
+        Générer les BC de plusieurs fournisseurs en une fois et les rattacher
 
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-            time.sleep(0.5)
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+        Args:
+            codes_fournisseurs: Fournisseurs dont les DAs ont été validées
+
+        Returns:
+            {code_fournisseur: [numéros de BC]}
+        """
+        self.logger.info("="*80)
+        self.logger.info(f"🧾 GÉNÉRATION GROUPÉE DES BONS DE COMMANDE ({len(codes_fournisseurs)} fournisseur(s))")
+        self.logger.info("="*80)
+
+        driver = self.driver_manager.driver
+
+        try:
+            # Naviguer vers le module bonne de commande (la génération se fait au chargement)
+            self.modules.ouvrir('XBCAUTO', self.url_bonne_commande, recharger=True)
+            self.wait_for_spinner_to_disappear(driver, timeout=9000)
+
+            # Valeur de chaque champ BC + texte complet de sa ligne (fournisseur)
+            lignes = driver.execute_script("""
+                return Array.from(document.querySelectorAll('.s-inplace-input.s-readonly')).map(function (input) {
+                    var ligne = input.closest('tr') || input.parentElement;
+                    var valeurs = Array.from(ligne.querySelectorAll('input')).map(function (i) { return i.value; });
+                    return [input.value || '', valeurs.join(' ') + ' ' + ligne.textContent];
+                });
+            """) or []
+
+            bc_par_fournisseur, non_attribues = attribuer_bc(lignes, codes_fournisseurs)
+            for code_fournisseur, bc_numbers in bc_par_fournisseur.items():
+                self.logger.info(f"BC {code_fournisseur}: {bc_numbers}")
+            if non_attribues:
+                self.logger.warning(f"⚠️ BC sans fournisseur identifiable: {non_attribues}")
+
+            return bc_par_fournisseur
+
+        except Exception as e:
+            self.logger.error(f"❌ Erreur génération groupée des bons de commande: {e}")
+            self.handle_error_with_screenshot(
+                error_message=str(e),
+                context="Génération Bonne de Commande (lot)"
+            )
+            return {}
 
-            s_page_close = driver.find_element(By.CSS_SELECTOR, "a.s_page_close")
-            s_page_close.click()
-            time.sleep(2)
-        
     def traiter_article(self, code_article: str, code_fournisseur: str, montant: str, marque: str, affaire: str) -> Dict[str, Any]:
         """
         Traiter un article (modifier fournisseur et tarif)
@@ -610,55 +664,43 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
             time.sleep(1)
             
 
+            # Lire les valeurs actuelles en un seul appel et ne modifier que les écarts
+            actuelles = self.lire_valeurs_par_labels(["BC Auto.", "Fournisseur", "Affaire", "Prix", "Marque"])
+            a_modifier = champs_a_modifier(actuelles, code_fournisseur, montant, marque, affaire)
+
+            if not a_modifier:
+                resultat['statut'] = 'Inchangé'
+                resultat['message'] = 'Article déjà à jour, aucun enregistrement'
+                self.logger.info(f"⏭️ Article {code_article} inchangé (fournisseur, affaire, prix et marque identiques)")
+                return resultat
+            self.logger.info(f"✏️ Champs à modifier: {', '.join(a_modifier)}")
+
             # 0. verifier if BC_auto is checked
-            BC_auto_input = self.get_input_by_label("BC Auto.")
-            BC_auto_label = driver.find_element(By.CSS_SELECTOR, f"label[for='{BC_auto_input.get_attribute('id')}']")
-            if BC_auto_input.is_selected():
-                self.logger.info("BC_auto déjà cochée")
-            else:
+            if 'BC Auto.' in a_modifier:
+                BC_auto_input = self.get_input_by_label("BC Auto.")
+                BC_auto_label = driver.find_element(By.CSS_SELECTOR, f"label[for='{BC_auto_input.get_attribute('id')}']")
                 BC_auto_label.click()
                 self.logger.info("✅ BC_auto cochée")
+            else:
+                self.logger.info("BC_auto déjà cochée")
             
 
-            # 3. Modifier le fournisseur
-            self.logger.info(f"🔄 Modification fournisseur: {code_fournisseur}")
-            changer_fournisseur = self.get_input_by_label("Fournisseur")
-            time.sleep(0.5)
-            changer_fournisseur.click()
-            time.sleep(0.5)
-            changer_fournisseur.clear()
-            changer_fournisseur.send_keys(code_fournisseur)
-            changer_fournisseur.send_keys(Keys.TAB)
-            time.sleep(1)
-
-            # 4. Modifier l'affaire
-            self.logger.info(f"🔄 Modification affaire: {affaire}")
-            if not(affaire == 'nan' or affaire.strip() == ''):
-                changer_affaire = self.get_input_by_label("Affaire")
-                time.sleep(0.5)
-                changer_affaire.click()
-                time.sleep(0.5)
-                changer_affaire.clear()
-                changer_affaire.send_keys(affaire)
-                changer_affaire.send_keys(Keys.TAB)
-                time.sleep(1)
-            
-
-            # 5. Modifier le tarif
-            self.logger.info(f"💰 Modification Prix: {montant}")
-            change_tarif = self.get_input_by_label("Prix")
-            change_tarif.click()
-            time.sleep(0.5)
-            change_tarif.clear()
-            change_tarif.send_keys(montant)
-            change_tarif.send_keys(Keys.TAB)
-            time.sleep(1)
+            # 3-5. Fournisseur, affaire et tarif saisis d'un bloc (contrôles serveur au TAB)
+            champs = [
+                FormField(self.labels.localiser(label), valeur, nom=label, synchro=True, numerique=(label == 'Prix'))
+                for label, valeur in (('Fournisseur', code_fournisseur), ('Affaire', affaire), ('Prix', montant))
+                if label in a_modifier
+            ]
+            if champs:
+                self.logger.info(f"🔄 Saisie: {', '.join(f'{c.nom}={c.valeur}' for c in champs)}")
+                # Relecture après le contrôle d'alerte: un tarif refusé est signalé par la popup
+                self.form_filler.remplir(champs, verifier=False)
 
-            elements_existe = len(driver.find_elements(By.CSS_SELECTOR, "article.s_alertbox_content")) > 0
+            # Popups encore affichées seulement: celles des articles précédents restent dans le DOM
+            popups = self.driver_manager.read_alerts()
 
-            if elements_existe:
-                pre_elements = driver.find_elements(By.CSS_SELECTOR, "pre.s_alertbox_msg")
-                error_message = pre_elements[0].text
+            if popups:
+                error_message = popups[-1]['message']
                 resultat['message'] = f'Tarif non valide de l\'article {code_article} (valeur: {montant}) \n {error_message}'
                 self.logger.error(f"❌ {resultat['message']}")
 
@@ -672,14 +714,18 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
                 return resultat
 
             # 6. Modifier la marque
-            self.logger.info(f"💰 Modification marque: {marque}")
-            change_marque = self.get_input_by_label("Marque")
-            change_marque.click()
-            time.sleep(0.5)
-            change_marque.clear()
-            change_marque.send_keys(marque)
-            change_marque.send_keys(Keys.TAB)
-            time.sleep(1)
+            if 'Marque' in a_modifier:
+                self.logger.info(f"💰 Modification marque: {marque}")
+                champs.append(FormField(self.labels.localiser("Marque"), marque, nom="Marque"))
+                self.form_filler.remplir(champs[-1:], verifier=False)
+
+            ecarts = self.form_filler.verifier(champs)
+            if ecarts:
+                resultat['message'] = 'Valeurs non prises en compte: ' + ', '.join(
+                    f"{nom} (attendu {attendue}, lu {lue})" for nom, (attendue, lue) in ecarts.items()
+                )
+                self.logger.error(f"❌ {resultat['message']}")
+                return resultat
 
             # 7. Enregistrer
             if self.enregistrer_article():
@@ -840,3 +886,64 @@ class BonneCommandeRobot(BaseRobot, WebResultMixin):
             driver.save_screenshot("error_enregistrement_da.png")
             return False
 
+
+
+def champs_a_modifier(actuelles: Dict[str, Any], code_fournisseur: str, montant: str,
+                      marque: str, affaire: str) -> List[str]:
+    """
+    Déterminer les champs d'un article qui diffèrent des valeurs cibles
+
+    Args:
+        actuelles: Valeurs lues par label (lire_valeurs_par_labels)
+        code_fournisseur, montant, marque, affaire: Valeurs cibles
+
+    Returns:
+        Labels à modifier, dans l'ordre de saisie (liste vide = article inchangé)
+    """
+    a_modifier = []
+    if actuelles.get('BC Auto.') is not True:
+        a_modifier.append('BC Auto.')
+    if not valeurs_identiques(actuelles.get('Fournisseur'), code_fournisseur):
+        a_modifier.append('Fournisseur')
+    if not (affaire == 'nan' or affaire.strip() == '') and not valeurs_identiques(actuelles.get('Affaire'), affaire):
+        a_modifier.append('Affaire')
+    if not valeurs_identiques(actuelles.get('Prix'), montant, numerique=True):
+        a_modifier.append('Prix')
+    if not valeurs_identiques(actuelles.get('Marque'), marque):
+        a_modifier.append('Marque')
+    return a_modifier
+
+
+def attribuer_bc(lignes: List[Tuple[str, str]], codes_fournisseurs: List[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    Rattacher les BC générés à leur fournisseur d'après le texte de la ligne
+
+    Args:
+        lignes: [(valeur du champ BC, texte complet de la ligne)]
+        codes_fournisseurs: Fournisseurs concernés par la génération
+
+    Returns:
+        ({code_fournisseur: [numéros de BC]}, [numéros non attribués])
+    """
+    bc_par_fournisseur = {}
+    non_attribues = []
+
+    for valeur, texte_ligne in lignes:
+        match = re.search(r'BC(\d+)', valeur or '')
+        if not match:
+            continue
+        bc_number = match.group(1)  # Juste les chiffres
+
+        trouves = [code for code in codes_fournisseurs
+                   if re.search(rf'(?<![\w]){re.escape(code)}(?![\w])', texte_ligne or '')]
+        if len(trouves) != 1 and len(codes_fournisseurs) == 1:
+            trouves = list(codes_fournisseurs)
+
+        if len(trouves) == 1:
+            numeros = bc_par_fournisseur.setdefault(trouves[0], [])
+            if bc_number not in numeros:
+                numeros.append(bc_number)
+        elif bc_number not in non_attribues:
+            non_attribues.append(bc_number)
+
+    return bc_par_fournisseur, non_attribues
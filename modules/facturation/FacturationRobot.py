@@ -3,7 +3,7 @@
 Module Lettrage - Robot principal
 Intégration complète du code de lettrage dans le framework
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -11,24 +11,40 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 
+from config.settings import MODULES_CONFIG
 from core.base_robot import BaseRobot
+from core.form_filler import FormField, SCRIPT
 from utils.excel_handler import ExcelHandler
+from utils.ingestion import lire_excel_module
+
+# Lignes de l'arbre 'Sélection réceptions'
+RECEPTION_ROWS = ".s-grid-table-body tr.s-grid-row.s-grid-navig-row"
 
 
 class FacturationRobot(BaseRobot):
     """Robot pour le facturation automatique des fournisseurs"""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, mode: str = None):
         """
         Initialiser le robot facturation
         
         Args:
             headless: Mode sans interface
+            mode: 'ligne' (écran rechargé pour chaque facture) ou 'session'
+                  (écran ouvert une fois, factures enchaînées par fournisseur)
         """
         super().__init__('facturation')
         self.excel_handler = ExcelHandler()
+
+        self.mode = mode or MODULES_CONFIG['facturation']['mode']
+        if self.mode not in ('ligne', 'session'):
+            raise ValueError(f"Mode inconnu: {self.mode} (attendu: 'ligne' ou 'session')")
+        self.validation_manuelle = MODULES_CONFIG['facturation']['validation_manuelle']
+
+        # Fournisseurs dont la popup d'information a déjà été traitée sur la page
+        self.popups_fournisseurs = set()
         
-        self.logger.info(f"🤖 Robot Lettrage initialisé")
+        self.logger.info(f"🤖 Robot Facturation initialisé (mode {self.mode})")
     
     def execute(self, excel_file: str, url: str):
         """
@@ -39,39 +55,134 @@ class FacturationRobot(BaseRobot):
             url: URL du module Sage X3
         """
         # Lire Excel
-        df = self.excel_handler.read_excel(
-            excel_file,
-            required_columns=['Code', 'DFF', 'FactureFrs','Date','BR']
-        )
+        df = lire_excel_module(excel_file, 'facturation', self.excel_handler)
         
         self.logger.info(f"📊 {len(df)} lignes à traiter")
         
         # Connexion Sage
         self.connect_sage()
         
+        if self.mode == 'session':
+            self._traiter_session(df, url)
+            return
+
         # Traiter chaque ligne
-        for idx, row in df.iterrows():
+        for idx, row in enumerate(df.to_dict('records')):
             self.navigate_to_module(url)
+            self.popups_fournisseurs.clear()
             self.logger.info(f"\n{'='*80}")
             self.logger.info(f"📌 LIGNE {idx+1}/{len(df)}")
             self.logger.info(f"{'='*80}")
-            code = str(row['Code'])
-            dff = str(row['DFF'])
-            factureFrs = 'FN°' + str(row['FactureFrs'])
-            date = str(row['Date'])
-            br= str(row['BR'])
-            nom = str(row.get('Nom', ''))
+            code = row['Code']
+            dff = row['DFF']
+            factureFrs = 'FN°' + row['FactureFrs']
+            date = row['Date']
+            br= row['BR']
+            nom = row['Nom']
             
             self.logger.info(f"\n{'='*80}")
             self.logger.info(f"📌 LIGNE {idx+1}/{len(df)}")
             self.logger.info(f"{'='*80}")
             
-            resultat = self.traiter_fournisseur(url, code, factureFrs, dff, date, br, nom)
+            with self.etape('facture'):
+                resultat = self.traiter_fournisseur(url, code, factureFrs, dff, date, br, nom)
             
             self.add_result(resultat)
             self.save_report(incremental=True)
             
             time.sleep(2)
+
+    def _traiter_session(self, df: pd.DataFrame, url: str):
+        """
+        Enchaîner les factures sur un écran ouvert une seule fois
+
+        Les lignes sont regroupées par fournisseur (ordre de première apparition)
+        et l'écran n'est rechargé qu'après une erreur ou si la page n'est plus
+        dans un état permettant une nouvelle création.
+
+        Args:
+            df: Lignes validées du fichier
+            url: URL du module Sage X3
+        """
+        lignes = ordonner_par_fournisseur(df.to_dict('records'))
+        page_prete = False
+        fournisseur_courant = None
+
+        for idx, row in enumerate(lignes):
+            code = row['Code']
+            if code != fournisseur_courant:
+                fournisseur_courant = code
+                self.logger.info(f"\n{'='*80}")
+                self.logger.info(f"🏢 FOURNISSEUR {code} ({row['Nom']})")
+                self.logger.info(f"{'='*80}")
+            self.logger.info(f"📌 LIGNE {idx+1}/{len(lignes)}")
+
+            if not page_prete:
+                self.logger.info("🔄 Ouverture de l'écran de saisie des factures")
+                self.navigate_to_module(url)
+                self.popups_fournisseurs.clear()
+
+            with self.etape('facture'):
+                resultat = self.traiter_fournisseur(url, code, 'FN°' + row['FactureFrs'], row['DFF'],
+                                                    row['Date'], row['BR'], row['Nom'])
+
+            self.add_result(resultat)
+            self.save_report(incremental=True)
+
+            page_prete = resultat['statut'] == 'Succes' and self._page_prete()
+            if not page_prete:
+                self.logger.warning("⚠️ Page à recharger avant la facture suivante")
+
+    def _page_prete(self) -> bool:
+        """Popups refermées et bouton de création disponible"""
+        driver = self.driver_manager.driver
+        try:
+            self.gere_popup_info(attendre=False)
+            if self.driver_manager.read_alerts():
+                return False
+            boutons = driver.find_elements(By.CLASS_NAME, "s_page_action_i.s_page_action_i_add")
+            return bool(boutons) and 's-disabled' not in (boutons[0].get_attribute('class') or '')
+        except Exception as e:
+            self.logger.warning(f"⚠️ État de la page indéterminé: {e}")
+            return False
+
+    def gere_popup_info(self, code_fournisseur: str = None, attendre: bool = True) -> Optional[str]:
+        """
+        Fermer la popup d'information affichée après la saisie du fournisseur
+
+        La popup est attendue longuement la première fois pour un fournisseur ;
+        ensuite l'attente est courte (calme de 0,15 s) car la popup s'ouvre en
+        asynchrone et ne doit pas rester devant la sélection des réceptions.
+
+        Args:
+            code_fournisseur: Fournisseur saisi (None = pas de mémorisation)
+            attendre: Attendre l'apparition de la popup (sinon lecture immédiate)
+
+        Returns:
+            Message de la popup fermée, None s'il n'y en avait pas
+        """
+        deja_vu = code_fournisseur is not None and code_fournisseur in self.popups_fournisseurs
+        try:
+            if not attendre:
+                popups = self.driver_manager.read_alerts()
+            elif deja_vu:
+                popups = self.driver_manager.wait_alert(timeout=1.5, quiet=0.15)
+            else:
+                popups = self.driver_manager.wait_alert(timeout=3)
+            if code_fournisseur is not None:
+                self.popups_fournisseurs.add(code_fournisseur)
+
+            message = None
+            for _ in popups:
+                popup = self.driver_manager.click_alert_button(['OK', 'Oui'])
+                if not popup:
+                    break
+                message = popup['message']
+                self.logger.info(f"ℹ️ Popup '{popup['titre']}' fermée ({popup['bouton']}): {message}")
+            return message
+        except Exception as e:
+            self.logger.warning(f"⚠️ Gestion popup d'information impossible: {e}")
+            return None
     
     def selection_recieption(self, codeReception):
         """
@@ -102,114 +213,53 @@ class FacturationRobot(BaseRobot):
                 EC.presence_of_element_located((By.CLASS_NAME, "s-grid-table-body"))
             )
             
-            # 3. Trouver TOUTES les lignes du tableau (visibles et cachées)
-            all_rows = driver.find_elements(By.CSS_SELECTOR, ".s-grid-table-body tr.s-grid-row.s-grid-navig-row")
-            self.logger.info(f"📊 {len(all_rows)} lignes trouvées dans le tableau")
-            
-            # 4. Chercher la ligne contenant le code de réception
-            target_row = None
-            for row in all_rows:
-                try:
-                    # Chercher le texte dans la ligne
-                    desc_div = row.find_element(By.CSS_SELECTOR, ".s-tree-node-desc-value")
-                    text = desc_div.text.strip()
-                    
-                    # Vérifier si c'est la bonne réception (commence par le code BR)
-                    if text.startswith(codeReception):
-                        target_row = row
-                        self.logger.info(f"✅ Réception trouvée: {text}")
-                        break
-                except:
-                    continue
-            
-            if not target_row:
+            # 3. Photographier l'arbre (lignes visibles et cachées) en un seul appel
+            lignes = self.driver_manager.read_grid(RECEPTION_ROWS)
+            self.logger.info(f"📊 {len(lignes)} lignes trouvées dans le tableau")
+
+            # 4. Ligne de la réception et ligne parente
+            ligne, parent = trouver_reception(lignes, codeReception)
+            if ligne is None:
                 self.logger.error(f"❌ Réception {codeReception} non trouvée dans la liste")
                 return False
-            
-            # 5. Vérifier si la ligne est visible (pas display: none)
-            style = target_row.get_attribute("style") or ""
-            is_hidden = "display: none" in style or "display:none" in style
-            
-            if is_hidden:
+            self.logger.info(f"✅ Réception trouvée: {ligne['texte']}")
+
+            # 5. Déplier le parent si la ligne est cachée (1 appel)
+            if not ligne['visible'] and parent is not None:
                 self.logger.warning(f"⚠️ La réception {codeReception} est cachée, tentative d'expansion...")
-                # Trouver le bouton d'expansion (parent picker)
-                try:
-                    # Chercher la ligne parent (celle qui contient le picker)
-                    parent_rows = driver.find_elements(By.CSS_SELECTOR, ".s-grid-table-body tr.s-grid-row.s-grid-navig-row")
-                    for i, pr in enumerate(parent_rows):
-                        # Si la ligne suivante est notre target, ce parent contient le picker
-                        if i + 1 < len(parent_rows) and parent_rows[i + 1] == target_row:
-                            picker = pr.find_element(By.CSS_SELECTOR, ".s-tree-node-picker")
-                            if picker.is_displayed():
-                                picker.click()
-                                self.logger.info("✅ Ligne expandée")
-                                time.sleep(0.5)
-                                break
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Impossible d'expander: {e}")
-            
-            # 6. Trouver la checkbox dans cette ligne
-            try:
-                checkbox = target_row.find_element(By.CSS_SELECTOR, "input[type='checkbox']")
-                checkbox_id = checkbox.get_attribute("id")
-                
-                # 7. Vérifier si déjà cochée
-                if checkbox.is_selected():
-                    self.logger.info(f"ℹ️ Réception {codeReception} déjà sélectionnée")
+                if self.driver_manager.click_in_row(RECEPTION_ROWS, parent['index'], ".s-tree-node-picker"):
+                    self.logger.info("✅ Ligne expandée")
                 else:
-                    # 8. Cocher la checkbox
-                    # Méthode 1: Cliquer sur le label
-                    try:
-                        label = target_row.find_element(By.CSS_SELECTOR, f"label[for='{checkbox_id}']")
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", label)
-                        time.sleep(0.3)
-                        label.click()
-                        self.logger.info(f"✅ Checkbox cochée via label pour {codeReception}")
-                    except:
-                        # Méthode 2: Cliquer directement sur la checkbox
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
-                        time.sleep(0.3)
-                        driver.execute_script("arguments[0].click();", checkbox)
-                        self.logger.info(f"✅ Checkbox cochée via JavaScript pour {codeReception}")
-                    
-                    # # 9. Vérifier que c'est bien coché
-                    # time.sleep(0.5)
-                    # if not checkbox.is_selected():
-                    #     self.logger.warning(f"⚠️ La checkbox n'est pas cochée après le clic")
-                    #     return False
-                
-                # 10. Gérer la popup "Voulez-vous remplacer les données..."
-                time.sleep(1)
-                try:
-                    # Chercher la popup
-                    popup = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".s_alertbox_content"))
-                    )
-                    
-                    # Vérifier que c'est bien la bonne popup
-                    popup_text = popup.find_element(By.CSS_SELECTOR, ".s_alertbox_msg").text
-                    
-                    if "remplacer les données" in popup_text or "document d'origine" in popup_text:
-                        self.logger.info("📋 Popup de confirmation détectée")
-                        
-                        # Cliquer sur "Oui"
-                        oui_btn = popup.find_element(By.XPATH, "//a[@aria-label='Oui']")
-                        oui_btn.click()
-                        self.logger.info("✅ Cliqué sur 'Oui' dans la popup")
-                        time.sleep(1)
-                    else:
-                        self.logger.warning(f"⚠️ Popup inattendue: {popup_text}")
-                        
-                except Exception as e:
-                    # Pas de popup ou déjà fermée
-                    self.logger.info("ℹ️ Pas de popup de confirmation (ou déjà gérée)")
-                
-                self.logger.info(f"✅ Réception {codeReception} sélectionnée avec succès")
-                return True
-                    
-            except Exception as e:
-                self.logger.error(f"❌ Erreur lors du cochage de la checkbox: {e}")
+                    self.logger.warning("⚠️ Impossible d'expander: pas de bouton sur la ligne parente")
+
+            # 6. Cocher la checkbox (1 appel)
+            if not ligne['checkbox_id']:
+                self.logger.error(f"❌ Erreur lors du cochage de la checkbox: aucune case sur la ligne {codeReception}")
                 return False
+            bilan = self.driver_manager.tick_checkboxes([ligne['checkbox_id']])
+            if bilan['deja']:
+                self.logger.info(f"ℹ️ Réception {codeReception} déjà sélectionnée")
+            elif bilan['coches']:
+                self.logger.info(f"✅ Checkbox cochée pour {codeReception}")
+            else:
+                self.logger.error(f"❌ Erreur lors du cochage de la checkbox de {codeReception}")
+                return False
+
+            # 7. Popup "Voulez-vous remplacer les données..." détectée dès son apparition
+            popups = self.driver_manager.wait_alert(timeout=5) if bilan['coches'] else []
+            for popup in popups:
+                if "remplacer les données" in popup['message'] or "document d'origine" in popup['message']:
+                    self.logger.info("📋 Popup de confirmation détectée")
+                    self.driver_manager.click_alert_button(['Oui'])
+                    self.logger.info("✅ Cliqué sur 'Oui' dans la popup")
+                    self.driver_manager.wait_spinner(timeout=10)
+                else:
+                    self.logger.warning(f"⚠️ Popup inattendue: {popup['message']}")
+            if not popups:
+                self.logger.info("ℹ️ Pas de popup de confirmation (ou déjà gérée)")
+
+            self.logger.info(f"✅ Réception {codeReception} sélectionnée avec succès")
+            return True
                 
         except Exception as e:
             self.logger.error(f"❌ Erreur lors de la sélection de la réception {codeReception}: {e}")
@@ -225,106 +275,41 @@ class FacturationRobot(BaseRobot):
 
             cree = driver.find_element(By.CLASS_NAME, "s_page_action_i.s_page_action_i_add")
             cree.click()
-            time.sleep(2)
-
-            cf = driver.find_element(By.ID, "2-73-input")
-            cf.click()
-            time.sleep(0.5)
-            cf.clear()
-            cf.send_keys(typeF)
-            cf.send_keys(Keys.TAB)
-            time.sleep(1)
-            
-            cf2 = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "2-81-input")))
-            cf2.click()
-            time.sleep(0.5)
-            cf2.clear()
-            cf2.send_keys(codeFournisseur)
-            cf2.send_keys(Keys.TAB)
-            time.sleep(1)
-
-
-            AncienCode_input = driver.find_element(By.ID, "2-85-input")
-            AncienCode_input.click()
-            time.sleep(0.5)
-            AncienCode_input.clear()
-            AncienCode_input.send_keys(factureFournisseur)
-            AncienCode_input.send_keys(Keys.TAB)
-            time.sleep(1)
 
+            # En-tête: type, fournisseur, facture et date facture (contrôles serveur au TAB)
+            entete = [
+                FormField((By.ID, "2-73-input"), typeF, nom="Type", synchro=True),
+                FormField((By.ID, "2-81-input"), codeFournisseur, nom="Fournisseur", synchro=True),
+                FormField((By.ID, "2-85-input"), factureFournisseur, nom="Facture fournisseur"),
+                FormField((By.ID, "2-87-input"), DFF, nom="Date facture", synchro=True),
+            ]
+            self.form_filler.remplir(entete, verifier=False)
 
-            DFF_input = driver.find_element(By.ID, "2-87-input")
-            DFF_input.click()
-            time.sleep(0.5)
-            DFF_input.clear()
-            DFF_input.send_keys(DFF)
-            DFF_input.send_keys(Keys.TAB)
-            time.sleep(1)
-            
-            self.gere_popup_info()
+            self.gere_popup_info(codeFournisseur)
 
             # Selection la Reception
             if not self.selection_recieption(codeReception):
                 return False
-            # Sleep pour laisser le temps de la sélection
-            time.sleep(2)
-
-
-            # Saisir le Montant HT
-            HT_input = driver.find_element(By.ID, "2-183-input")
-            ht_value= HT_input.get_attribute('value')  # Juste pour s'assurer que l'élément est chargé
-            time.sleep(1)
-
-            HT_saisi_input = driver.find_element(By.ID, "2-182-input")
-            HT_saisi_input.click()
-            time.sleep(0.5)
-            HT_saisi_input.clear()
-            HT_saisi_input.send_keys(ht_value)
-            HT_saisi_input.send_keys(Keys.TAB)
-            time.sleep(1)
-
+            self.wait_for_spinner_to_disappear(driver, timeout=10)
 
-            # Saisir la Taxe
-            Taxe = driver.find_element(By.ID, "2-190-input")
-            taxe_value= Taxe.get_attribute('value')  # Juste pour s'assurer que l'élément est chargé
+            # Montants calculés à recopier dans les zones saisies (une seule lecture)
+            ht_value, taxe_value = self.form_filler.lire([(By.ID, "2-183-input"), (By.ID, "2-190-input")])
             # Supprimer uniquement le '-' au début si présent
             if taxe_value and taxe_value.startswith('-'):
                 taxe_value = taxe_value.lstrip('-')
 
-            time.sleep(1)
-
-            Taxe_saisi_input = driver.find_element(By.ID, "2-189-input")
-            Taxe_saisi_input.click()
-            time.sleep(0.5)
-            Taxe_saisi_input.clear()
-            Taxe_saisi_input.send_keys(taxe_value)
-            Taxe_saisi_input.send_keys(Keys.TAB)
-            time.sleep(1)
-
-            # Saisir la Date
-            date_input = driver.find_element(By.ID, "2-98-input")
-            date_input.click()
-            time.sleep(0.5)
-            date_input.clear()
-            date_input.send_keys(Date)
-            date_input.send_keys(Keys.TAB)
-            time.sleep(1)
-
-            factureFrs_input = driver.find_element(By.ID, "2-99-input")
-            factureFrs_input.click()
-            time.sleep(0.5)
-            factureFrs_input.clear()
-            factureFrs_input.send_keys(factureFournisseur)
-            factureFrs_input.send_keys(Keys.TAB)
-            time.sleep(1)
+            pied = [
+                FormField((By.ID, "2-182-input"), ht_value, nom="Montant HT", synchro=True, numerique=True),
+                FormField((By.ID, "2-189-input"), taxe_value, nom="Taxe", synchro=True, numerique=True),
+                FormField((By.ID, "2-98-input"), Date, nom="Date", synchro=True),
+                # Références libres: posées ensemble en un seul appel
+                FormField((By.ID, "2-99-input"), factureFournisseur, strategie=SCRIPT, nom="Facture fournisseur (2)"),
+                FormField((By.ID, "2-111-input"), factureFournisseur, strategie=SCRIPT, nom="Référence interne"),
+            ]
+            self.form_filler.remplir(pied, verifier=False)
 
-            referenceIntern_input = driver.find_element(By.ID, "2-111-input")
-            referenceIntern_input.click()
-            time.sleep(0.5)
-            referenceIntern_input.clear()
-            referenceIntern_input.send_keys(factureFournisseur)
-            referenceIntern_input.send_keys(Keys.TAB)
-            time.sleep(1)
+            # Relecture unique de tout le formulaire (écarts journalisés: Sage reformate les dates)
+            self.form_filler.verifier(entete + pied)
 
             self.logger.info(f"✅ Informations saisies pour le fournisseur {codeFournisseur} ({nom})")
             return True
@@ -332,7 +317,8 @@ class FacturationRobot(BaseRobot):
             self.logger.error(f"❌ Erreur recherche fournisseur: {e}")
             return False
 
-    def clique_enregistrer(self):
+    def clique_enregistrer(self) -> bool:
+        """Enregistrer la facture (True si Sage confirme sans avertissement)"""
         driver = self.driver_manager.driver
 
         try:
@@ -351,10 +337,13 @@ class FacturationRobot(BaseRobot):
                 raise Exception(confirmation_msg_text)  
             
             self.logger.info(f"✅ Enregistrement reussi: {confirmation_msg.text}")
-            time.sleep(3)
+            if self.mode == 'ligne':
+                time.sleep(3)
+            return True
         except Exception as e:
             self.logger.error(f"❌ Erreur enregistrement: {e}")
             driver.save_screenshot("ScreenShot/error_enregistrement.png")
+            return False
 
     def traiter_fournisseur(self, url, codeFournisseur, factureFournisseur, DFF, Date, codeReception, nom=""):
         """Traite un fournisseur avec lettrage Facture <-> N-Avis"""
@@ -381,6 +370,7 @@ class FacturationRobot(BaseRobot):
                 self.logger.warning("⚠️ Erreur recherche, tentative d'actualisation...")
                 
                 if self.sage_connector.refresh_with_popup_handling():
+                    self.popups_fournisseurs.clear()
                     if not self.saisi_information(typeF="FAF", codeFournisseur=codeFournisseur, factureFournisseur=factureFournisseur, DFF=DFF, Date=Date, codeReception=codeReception, nom=nom):
                         resultat['message'] = 'Erreur recherche après actualisation'
                         return resultat
@@ -388,13 +378,57 @@ class FacturationRobot(BaseRobot):
                     resultat['message'] = 'Erreur recherche, actualisation échouée'
                     return resultat
             
-            input("⏸️ Vérifiez les informations saisies, puis appuyez sur Entrée pour continuer...")
-            time.sleep(10)
-            self.clique_enregistrer()
+            if self.validation_manuelle:
+                input("⏸️ Vérifiez les informations saisies, puis appuyez sur Entrée pour continuer...")
+
+            if self.clique_enregistrer():
+                resultat['statut'] = 'Succes'
+                resultat['facturation_effectue'] = True
+                resultat['message'] = 'Facture enregistrée'
+            else:
+                resultat['message'] = 'Erreur enregistrement'
             
         except Exception as e:
             resultat['message'] = f'Erreur: {str(e)}'
             self.logger.error(f"❌ Erreur traitement fournisseur: {e}")
         
         return resultat
-    
\ No newline at end of file
+    
+
+
+def ordonner_par_fournisseur(lignes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Regrouper les lignes par fournisseur, dans l'ordre de première apparition
+
+    Args:
+        lignes: Lignes du fichier (clé 'Code' = fournisseur)
+
+    Returns:
+        Lignes réordonnées (ordre du fichier conservé au sein d'un fournisseur)
+    """
+    rang = {}
+    for ligne in lignes:
+        rang.setdefault(ligne['Code'], len(rang))
+    return sorted(lignes, key=lambda ligne: rang[ligne['Code']])
+
+
+def trouver_reception(lignes: List[Dict[str, Any]], code_reception: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Trouver une réception et sa ligne parente dans une photo de l'arbre
+
+    Args:
+        lignes: Lignes lues par DriverManager.read_grid
+        code_reception: Code BR (le libellé de la ligne commence par ce code)
+
+    Returns:
+        (ligne de la réception, ligne parente) ; (None, None) si absente
+    """
+    ancetres: List[Dict[str, Any]] = []
+    for ligne in lignes:
+        niveau = ligne['niveau'] if ligne['niveau'] is not None else 0
+        while ancetres and (ancetres[-1]['niveau'] or 0) >= niveau:
+            ancetres.pop()
+        if ligne['texte'].startswith(code_reception):
+            return ligne, (ancetres[-1] if ancetres else None)
+        ancetres.append(ligne)
+    return None, None
@@ -11,8 +11,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 
+from config.settings import MODULES_CONFIG
 from core.base_robot import BaseRobot
 from utils.excel_handler import ExcelHandler
+from utils.ingestion import lire_excel_module_par_lots
+
+# Bouton de confirmation hors popup Syracuse standard (recherche historique)
+CONFIRMATION_LETTRAGE = (By.XPATH, "//button[contains(text(), 'OK')] | //button[contains(text(), 'Confirmer')] "
+                                   "| //button[contains(text(), 'Valider')]")
 
 
 class LettrageRobot(BaseRobot):
@@ -39,36 +45,42 @@ class LettrageRobot(BaseRobot):
             excel_file: Chemin du fichier Excel
             url: URL du module Sage X3
         """
-        # Lire Excel
-        df = self.excel_handler.read_excel(
-            excel_file,
-            required_columns=['Compte', 'Code', 'Facture', 'N-Avis']
+        # Lire Excel par lots : le traitement démarre dès le premier lot valide
+        lots = lire_excel_module_par_lots(
+            excel_file, 'lettrage', MODULES_CONFIG['lettrage']['taille_lot'], self.excel_handler
         )
+        numero = 0
         
-        self.logger.info(f"📊 {len(df)} lignes à traiter")
-        
-        # Connexion Sage
-        self.connect_sage()
-        self.navigate_to_module(url)
-        
-        # Traiter chaque ligne
-        for idx, row in df.iterrows():
-            self.logger.info(f"\n{'='*80}")
-            self.logger.info(f"📌 LIGNE {idx+1}/{len(df)}")
-            self.logger.info(f"{'='*80}")
+        for lot in lots:
+            if not numero:
+                # Connexion Sage au premier lot exploitable
+                self.connect_sage()
+                self.navigate_to_module(url)
             
-            result = self.traiter_fournisseur(
-                compte=str(row['Compte']),
-                code=str(row['Code']),
-                facture=str(row['Facture']),
-                n_avis=str(row['N-Avis']),
-                nom=str(row.get('Nom', ''))
-            )
-            
-            self.add_result(result)
-            self.save_report(incremental=True)
+            self.logger.info(f"📊 Lot de {len(lot)} ligne(s) à traiter")
             
-            time.sleep(2)
+            # Traiter chaque ligne
+            for row in lot.to_dict('records'):
+                numero += 1
+                self.logger.info(f"\n{'='*80}")
+                self.logger.info(f"📌 LIGNE {numero}")
+                self.logger.info(f"{'='*80}")
+                
+                with self.etape('ligne'):
+                    result = self.traiter_fournisseur(
+                        compte=row['Compte'],
+                        code=row['Code'],
+                        facture=row['Facture'],
+                        n_avis=row['N-Avis'],
+                        nom=row['Nom']
+                    )
+                
+                self.add_result(result)
+                self.save_report(incremental=True)
+                
+                time.sleep(2)
+        
+        self.logger.info(f"📊 {numero} ligne(s) traitée(s)")
     
     def traiter_fournisseur(self, compte: str, code: str, facture: str, 
                            n_avis: str, nom: str = "") -> Dict[str, Any]:
@@ -201,48 +213,44 @@ class LettrageRobot(BaseRobot):
     def extraire_ecritures(self):
         """Extrait TOUTES les écritures (lettrées ou non)"""
         ecritures = []
-        driver = self.driver_manager.driver
-        
-        rows_fixed = driver.find_elements(By.CSS_SELECTOR, ".s-grid-fixed-table-body tr.s-grid-row")
-        rows_scroll = driver.find_elements(By.CSS_SELECTOR, ".s-grid-table-body tr.s-grid-row")
-        
+
+        # Partie fixe (case, date, type, numéro, lettre) et partie défilante lues en deux appels
+        rows_fixed = self.driver_manager.read_grid(".s-grid-fixed-table-body tr.s-grid-row")
+        rows_scroll = self.driver_manager.read_grid(".s-grid-table-body tr.s-grid-row")
+
         self.logger.info(f"📊 Lignes totales: {len(rows_fixed)}")
-        
-        for i in range(len(rows_fixed)):
+
+        def parse_montant(s):
+            if not s or not s.strip():
+                return 0.0
             try:
-                cb = rows_fixed[i].find_element(By.CSS_SELECTOR, "input[type='checkbox']")
-                if_inputs = rows_fixed[i].find_elements(By.CSS_SELECTOR, ".s-inplace-input")
-                is_inputs = rows_scroll[i].find_elements(By.CSS_SELECTOR, ".s-inplace-input")
-                
-                lettre = if_inputs[3].get_attribute('value') if len(if_inputs) > 3 else ''
-                
-                def parse_montant(s):
-                    if not s or not s.strip():
-                        return 0.0
-                    try:
-                        return float(s.replace(' ', '').replace(',', '.'))
-                    except:
-                        return 0.0
-                
-                e = {
-                    'index': i + 1,
-                    'checkbox_id': cb.get_attribute('id'),
-                    'date': if_inputs[0].get_attribute('value') if len(if_inputs) > 0 else '',
-                    'type': if_inputs[1].get_attribute('value') if len(if_inputs) > 1 else '',
-                    'numero': if_inputs[2].get_attribute('value') if len(if_inputs) > 2 else '',
-                    'lettre': lettre,
-                    'debit_str': is_inputs[0].get_attribute('value') if len(is_inputs) > 0 else '',
-                    'credit_str': is_inputs[1].get_attribute('value') if len(is_inputs) > 1 else '',
-                    'etat': is_inputs[2].get_attribute('value') if len(is_inputs) > 2 else '',
-                    'libelle': is_inputs[3].get_attribute('value') if len(is_inputs) > 3 else '',
-                }
-                e['debit'] = parse_montant(e['debit_str'])
-                e['credit'] = parse_montant(e['credit_str'])
-                ecritures.append(e)
-                
-            except Exception as ex:
-                self.logger.warning(f"⚠️ Erreur ligne {i+1}: {ex}")
-        
+                return float(s.replace(' ', '').replace(',', '.'))
+            except:
+                return 0.0
+
+        for i, fixe in enumerate(rows_fixed):
+            if not fixe['checkbox_id'] or i >= len(rows_scroll):
+                self.logger.warning(f"⚠️ Erreur ligne {i+1}: ligne incomplète")
+                continue
+
+            if_inputs = fixe['valeurs']
+            is_inputs = rows_scroll[i]['valeurs']
+            e = {
+                'index': i + 1,
+                'checkbox_id': fixe['checkbox_id'],
+                'date': if_inputs[0] if len(if_inputs) > 0 else '',
+                'type': if_inputs[1] if len(if_inputs) > 1 else '',
+                'numero': if_inputs[2] if len(if_inputs) > 2 else '',
+                'lettre': if_inputs[3] if len(if_inputs) > 3 else '',
+                'debit_str': is_inputs[0] if len(is_inputs) > 0 else '',
+                'credit_str': is_inputs[1] if len(is_inputs) > 1 else '',
+                'etat': is_inputs[2] if len(is_inputs) > 2 else '',
+                'libelle': is_inputs[3] if len(is_inputs) > 3 else '',
+            }
+            e['debit'] = parse_montant(e['debit_str'])
+            e['credit'] = parse_montant(e['credit_str'])
+            ecritures.append(e)
+
         self.logger.info(f"✅ {len(ecritures)} écritures extraites")
         return ecritures
     
@@ -296,34 +304,17 @@ class LettrageRobot(BaseRobot):
         return correspondances
     
     def selectionner_ecritures(self, checkbox_ids):
-        """Sélectionner les écritures à lettrer"""
-        driver = self.driver_manager.driver
-        ok = 0
-        
-        for cb_id in checkbox_ids:
-            try:
-                cb = driver.find_element(By.ID, cb_id)
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", cb)
-                time.sleep(0.5)
-                
-                if cb.is_selected():
-                    self.logger.info(f"⏭️ Déjà sélectionné: {cb_id}")
-                    ok += 1
-                    continue
-                
-                try:
-                    cb.click()
-                    self.logger.info(f"✅ Coché (normal): {cb_id}")
-                    ok += 1
-                except:
-                    driver.execute_script("arguments[0].click();", cb)
-                    self.logger.info(f"✅ Coché (JS): {cb_id}")
-                    ok += 1
-                
-                time.sleep(0.3)
-            except Exception as e:
-                self.logger.warning(f"⚠️ Impossible {cb_id}: {e}")
-        
+        """Sélectionner les écritures à lettrer (toutes les cases en un seul appel)"""
+        bilan = self.driver_manager.tick_checkboxes(checkbox_ids)
+
+        for cb_id in bilan['deja']:
+            self.logger.info(f"⏭️ Déjà sélectionné: {cb_id}")
+        for cb_id in bilan['coches']:
+            self.logger.info(f"✅ Coché: {cb_id}")
+        for cb_id in bilan['absents']:
+            self.logger.warning(f"⚠️ Impossible {cb_id}: case introuvable ou non cochée")
+
+        ok = len(bilan['coches']) + len(bilan['deja'])
         self.logger.info(f"📊 TOTAL: {ok}/{len(checkbox_ids)} sélectionné(s)")
         return ok
     
@@ -338,14 +329,13 @@ class LettrageRobot(BaseRobot):
                 "//a[contains(text(), 'Lettrage')]"
             ]
             
-            btn = None
-            for sel in selectors:
-                try:
-                    btn = driver.find_element(By.XPATH, sel)
-                    self.logger.info(f"✅ Bouton Lettrage trouvé avec: {sel}")
-                    break
-                except:
-                    continue
+            # Sélecteur gagnant de la dernière exécution essayé en premier (find_elements: pas d'exception)
+            sel, btn = self.strategies.essayer(f"{self.ecran}/bouton_lettrage", [
+                (sel, lambda sel=sel: next(iter(driver.find_elements(By.XPATH, sel)), None))
+                for sel in selectors
+            ])
+            if btn:
+                self.logger.info(f"✅ Bouton Lettrage trouvé avec: {sel}")
             
             if btn:
                 driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
@@ -358,19 +348,23 @@ class LettrageRobot(BaseRobot):
                     driver.execute_script("arguments[0].click();", btn)
                     self.logger.info("✅ Clic sur Lettrage (JavaScript)")
                 
-                time.sleep(2)
-                
-                # Gérer popup de confirmation
-                try:
-                    confirm_btn = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'OK')] | //button[contains(text(), 'Confirmer')] | //button[contains(text(), 'Valider')]"))
-                    )
-                    confirm_btn.click()
-                    self.logger.info("✅ Confirmation cliquée")
-                except:
-                    self.logger.info("ℹ️ Pas de popup de confirmation")
+                # Gérer popup de confirmation (détectée dès son apparition)
+                popup = None
+                if self.driver_manager.wait_alert(timeout=5):
+                    popup = self.driver_manager.click_alert_button(['OK', 'Confirmer', 'Valider'])
+                if popup:
+                    self.logger.info(f"✅ Confirmation cliquée ({popup['bouton']})")
+                else:
+                    # Autre boîte de dialogue: bouton dont le texte contient OK / Confirmer / Valider
+                    # (déjà affichée après wait_alert: une seule recherche, sans attente)
+                    boutons = [b for b in driver.find_elements(*CONFIRMATION_LETTRAGE) if b.is_displayed()]
+                    if boutons:
+                        boutons[0].click()
+                        self.logger.info("✅ Confirmation cliquée")
+                    else:
+                        self.logger.info("ℹ️ Pas de popup de confirmation")
                 
-                time.sleep(1)
+                self.driver_manager.wait_spinner(timeout=10)
                 self.logger.info("✅ Lettrage validé")
                 return True
             else:
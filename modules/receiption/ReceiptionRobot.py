@@ -3,7 +3,7 @@
 Module Receiption - Robot pour les réceptions d'achat Sage X3
 Regroupe par Fournisseur → BC → Articles
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -14,8 +14,19 @@ from collections import defaultdict
 import time
 
 from core.base_robot import BaseRobot
+from core.driver_manager import TREE_ROWS
+from core.form_filler import FormField, valeurs_identiques
 from core.web_result_mixin import WebResultMixin
 from utils.excel_handler import ExcelHandler
+from utils.ingestion import lire_excel_module, regrouper_fournisseur_bc
+
+# Lignes de la grille 'Lignes' de la réception
+LIGNES_ROWS = ("(//section[contains(@class, 's-h1')]//div[contains(text(), 'Lignes')]/ancestor::section"
+               "//table[contains(@class, 's-grid-table-body')])[1]"
+               "//tr[contains(concat(' ', normalize-space(@class), ' '), ' s-grid-row ')]")
+# Cellules saisies par article: (clé de l'article, index du .s-inplace-input dans la ligne)
+COLONNES_LIGNES = (('quantite', 5), ('n_b_transport', 9), ('matricule', 10), ('poids', 11), ('marque', 12))
+COLONNES_NUMERIQUES = ('quantite', 'poids')
 
 
 class ReceiptionRobot(BaseRobot, WebResultMixin):
@@ -129,40 +140,7 @@ class ReceiptionRobot(BaseRobot, WebResultMixin):
         self.logger.info("📖 LECTURE EXCEL")
         self.logger.info("="*80)
         
-        colonnes_requises = [
-            'CodeFrs',
-            'BLFrs', 
-            'DateBC',
-            'N_BC',
-            'CodeArticle',
-            'Quantite',
-            'N_B_transport',
-            'Matricule',
-            'Poids',
-            'Marque'
-        ]
-        
-        df = self.excel_handler.read_excel(excel_file, required_columns=colonnes_requises)
-        
-        self.logger.info(f"✅ {len(df)} ligne(s) lues")
-        
-        # Validation des colonnes importantes
-        lignes_invalides = []
-        for idx, row in df.iterrows():
-            colonnes_vides = []
-            for col in ['CodeFrs','BLFrs', 'DateBC', 'N_BC', 'CodeArticle', 'Quantite', 'Poids', 'Marque']:
-                if pd.isna(row[col]) or str(row[col]).strip() == '':
-                    colonnes_vides.append(col)
-            
-            if colonnes_vides:
-                lignes_invalides.append(idx)
-                self.logger.warning(f"⚠️ Ligne {idx+1} ignorée - Colonnes vides: {', '.join(colonnes_vides)}")
-        
-        if lignes_invalides:
-            df = df.drop(df.index[lignes_invalides])
-            self.logger.warning(f"⚠️ {len(lignes_invalides)} ligne(s) invalide(s) ignorée(s)")
-        
-        self.logger.info(f"✅ {len(df)} ligne(s) valides à traiter")
+        df = lire_excel_module(excel_file, 'receiption', self.excel_handler)
         return df
     
     def _regrouper_donnees(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -241,62 +219,10 @@ class ReceiptionRobot(BaseRobot, WebResultMixin):
         self.logger.info("🔄 REGROUPEMENT DES DONNÉES")
         self.logger.info("="*80)
         
-        structure = {}
-        
-        for _, row in df.iterrows():
-            code_frs = str(row['CodeFrs'])
-            bl_frs = str(row['BLFrs'])
-            date_bc = self._format_date(row['DateBC'])
-            n_bc = str(row['N_BC'])
-            
-            # Initialiser fournisseur si nouveau
-            if code_frs not in structure:
-                structure[code_frs] = {
-                    'bl_frs': bl_frs,
-                    'date_bc': date_bc,
-                    'bons_commande': {}
-                }
-            
-            # Initialiser BC si nouveau
-            if n_bc not in structure[code_frs]['bons_commande']:
-                structure[code_frs]['bons_commande'][n_bc] = {
-                    'articles': []
-                }
-            
-            # Ajouter l'article
-            article = {
-                'code': str(row['CodeArticle']).strip(),
-                'quantite': str(row['Quantite']),
-                'n_b_transport': str(row['N_B_transport']) if not pd.isna(row['N_B_transport']) else '',
-                'matricule': str(row['Matricule']) if not pd.isna(row['Matricule']) else '',
-                'poids': str(row['Poids']) if not pd.isna(row['Poids']) else '',
-                'marque': str(row['Marque']) if not pd.isna(row['Marque']) else ''
-            }
-            
-            structure[code_frs]['bons_commande'][n_bc]['articles'].append(article)
-        
+        structure = regrouper_fournisseur_bc(df)
+
         return structure
     
-    def _format_date(self, date_value) -> str:
-        """Formater la date au format JJ/MM/AAAA"""
-        if isinstance(date_value, pd.Timestamp):
-            return date_value.strftime('%d/%m/%Y')
-        elif isinstance(date_value, datetime):
-            return date_value.strftime('%d/%m/%Y')
-        else:
-            date_str = str(date_value)
-            # Si format "01/01/2026"
-            if '/' in date_str:
-                return date_str
-            # Si format "2026-01-01"
-            if '-' in date_str and len(date_str) == 10:
-                try:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                    return date_obj.strftime('%d/%m/%Y')
-                except:
-                    pass
-            return date_str
-    
     def _afficher_resume(self, structure: Dict):
         """Afficher un résumé de la structure"""
         self.logger.info("="*80)
@@ -337,13 +263,14 @@ class ReceiptionRobot(BaseRobot, WebResultMixin):
                 self.logger.info(f"📋 Bon de Commande: {n_bc}")
                 self.logger.info(f"{'─'*80}")
                 
-                resultat_bc = self._traiter_bon_commande(
-                    code_frs=code_frs,
-                    n_bc=n_bc,
-                    bl_frs=frs_data['bl_frs'],
-                    date_bc=frs_data['date_bc'],
-                    articles=bc_data['articles']
-                )
+                with self.etape('bon_commande'):
+                    resultat_bc = self._traiter_bon_commande(
+                        code_frs=code_frs,
+                        n_bc=n_bc,
+                        bl_frs=frs_data['bl_frs'],
+                        date_bc=frs_data['date_bc'],
+                        articles=bc_data['articles']
+                    )
                 
                 self.add_result(resultat_bc)
                 
@@ -437,18 +364,14 @@ class ReceiptionRobot(BaseRobot, WebResultMixin):
                 resultat['message'] = f'Aucun article sélectionné pour BC {n_bc}'
                 return resultat
             
-            # 3. TRAITER CHAQUE ARTICLE
-            for idx, article in enumerate(articles, 1):
-                self.logger.info(f"   📦 Article {idx}/{len(articles)}: {article['code']}")
-                
-                if self._remplir_article_dans_ligne(article, idx):
+            # 3. REMPLIR TOUS LES ARTICLES (une lecture de la grille par BC)
+            for idx, (article, ok) in enumerate(zip(articles, self._remplir_lignes_bc(articles)), 1):
+                if ok:
                     resultat['articles_traites'] += 1
                     self.total_articles += 1
-                    self.logger.info(f"   ✅ Article {article['code']} OK")
+                    self.logger.info(f"   ✅ Article {idx}/{len(articles)} {article['code']} OK")
                 else:
-                    self.logger.warning(f"   ⚠️ Article {article['code']} échec")
-                
-                time.sleep(0.5)
+                    self.logger.warning(f"   ⚠️ Article {idx}/{len(articles)} {article['code']} échec")
             
             # 4. ENREGISTRER
             if self._enregistrer_reception():
@@ -584,142 +507,56 @@ class ReceiptionRobot(BaseRobot, WebResultMixin):
             WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".s-grid-table-body"))
             )
-            time.sleep(1)
-            
-            # 3. Récupérer toutes les lignes
-            rows = driver.find_elements(By.CSS_SELECTOR, ".s-grid-table-body tr.s-grid-row")
-            self.logger.info(f"📊 {len(rows)} ligne(s) trouvée(s) dans le tableau")
-            
-            # Variables de suivi
-            bc_trouve = False
-            bc_row = None
-            articles_trouves = 0
-            articles_attendus = {art['code'].strip(): False for art in articles}
-            
-            # 4. Parcourir toutes les lignes
-            for idx, row in enumerate(rows):
-                try:
-                    # Vérifier si ligne visible
-                    style = row.get_attribute('style') or ''
-                    if 'display: none' in style or 'display:none' in style:
-                        continue
-                    
-                    # Récupérer le padding-left pour déterminer le niveau
-                    td = row.find_element(By.CSS_SELECTOR, "td.s-tree-cell")
-                    padding_left = td.get_attribute('style')
-                    
-                    # Extraire la valeur de padding-left
-                    if 'padding-left: 0px' in padding_left:
-                        niveau = 0  # BC parent
-                    elif 'padding-left: 22px' in padding_left:
-                        niveau = 1  # Article enfant
-                    else:
-                        niveau = 2  # Autre
-                    
-                    # Récupérer le texte de la ligne
-                    desc_div = row.find_element(By.CSS_SELECTOR, ".s-tree-node-desc-value")
-                    ligne_text = desc_div.text.strip()
-                    
-                    # NIVEAU 0 = Ligne BC (parent)
-                    if niveau == 0:
-                        # Si on était dans un BC et qu'on en trouve un autre, on arrête
-                        if bc_trouve and bc_row is not None:
-                            self.logger.info(f"🛑 Fin du BC {n_bc}, autre BC détecté")
-                            break
-                        
-                        # Vérifier si c'est notre BC
-                        if n_bc in ligne_text:
-                            bc_trouve = True
-                            bc_row = row
-                            self.logger.info(f"✅ BC trouvé: {ligne_text}")
-                            
-                            # Vérifier si le BC a un bouton expand (plier/déplier)
-                            try:
-                                expand_btn = row.find_element(By.CSS_SELECTOR, "a.s-tree-node-picker")
-                                btn_class = expand_btn.get_attribute('class')
-                                
-                                # Si bouton "up" = BC plié, il faut le déplier
-                                if 's-btn-dir_up' in btn_class:
-                                    self.logger.info("📂 Dépliage du BC...")
-                                    expand_btn.click()
-                                    time.sleep(0.8)
-                                    
-                                    # Recharger les lignes après le dépliage
-                                    rows = driver.find_elements(By.CSS_SELECTOR, ".s-grid-table-body tr.s-grid-row")
-                                    self.logger.info(f"📊 {len(rows)} ligne(s) après dépliage")
-                                else:
-                                    self.logger.info("✅ BC déjà déplié")
-                            except:
-                                self.logger.info("✅ BC sans bouton expand (déjà ouvert)")
-                    
-                    # NIVEAU 1 = Ligne Article (enfant)
-                    elif niveau == 1:
-                        # On traite seulement si on est dans le bon BC
-                        if not bc_trouve:
-                            continue
-                        
-                        # Chercher si cet article correspond à notre liste
-                        for code_article in articles_attendus.keys():
-                            # Vérifier si la ligne commence par le code article
-                            if ligne_text.startswith(code_article):
-                                self.logger.info(f"   ✅ Article trouvé: {ligne_text}")
-                                
-                                # Récupérer la checkbox
-                                checkbox = row.find_element(By.CSS_SELECTOR, "input[type='checkbox']")
-                                checkbox_id = checkbox.get_attribute("id")
-                                
-                                # Cocher si pas déjà coché
-                                if not checkbox.is_selected():
-                                    label = row.find_element(By.CSS_SELECTOR, f"label[for='{checkbox_id}']")
-                                    
-                                    # Scroll vers l'élément
-                                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", label)
-                                    time.sleep(0.3)
-                                    
-                                    # Cliquer sur le label
-                                    try:
-                                        label.click()
-                                    except:
-                                        # Si le clic normal échoue, utiliser JavaScript
-                                        driver.execute_script("arguments[0].click();", label)
-                                    
-                                    time.sleep(0.5)
-                                    
-                                    self.logger.info(f"   ☑️ Article {code_article} coché")
-                                    articles_trouves += 1
-                                    articles_attendus[code_article] = True
-                                else:
-                                    self.logger.info(f"   ⚪ Article {code_article} déjà coché")
-                                    articles_trouves += 1
-                                    articles_attendus[code_article] = True
-                                
-                                # Passer à la ligne suivante
-                                break
-                
-                except Exception as e:
-                    self.logger.debug(f"⚠️ Erreur ligne {idx}: {e}")
-                    continue
-            
-            # 5. Vérifier si le BC a été trouvé
-            if not bc_trouve:
+
+            # 3. Photographier l'arbre en un seul appel et indexer BC -> articles
+            codes = [art['code'].strip() for art in articles]
+            lignes = self.driver_manager.read_grid(TREE_ROWS)
+            self.logger.info(f"📊 {len(lignes)} ligne(s) trouvée(s) dans le tableau")
+            bc_ligne, trouves = indexer_bc_articles(lignes, n_bc, codes)
+
+            if bc_ligne is None:
                 self.logger.error(f"❌ BC {n_bc} non trouvé dans le tableau")
                 return False
-            
+            self.logger.info(f"✅ BC trouvé: {bc_ligne['texte']}")
+
+            # 4. Déplier uniquement ce BC si nécessaire, puis reprendre une photo
+            if bc_ligne['replie']:
+                self.logger.info("📂 Dépliage du BC...")
+                self.driver_manager.click_in_row(TREE_ROWS, bc_ligne['index'], "a.s-tree-node-picker")
+                self.driver_manager.wait_spinner(timeout=10)
+                lignes = self.driver_manager.read_grid(TREE_ROWS)
+                self.logger.info(f"📊 {len(lignes)} ligne(s) après dépliage")
+                bc_ligne, trouves = indexer_bc_articles(lignes, n_bc, codes)
+            else:
+                self.logger.info("✅ BC déjà déplié")
+
+            # 5. Cocher toutes les lignes ciblées en un seul appel
+            ids = [ligne['checkbox_id'] for lignes_code in trouves.values() for ligne in lignes_code
+                   if ligne['checkbox_id']]
+            bilan = self.driver_manager.tick_checkboxes(ids)
+            for code, lignes_code in trouves.items():
+                for ligne in lignes_code:
+                    etat = "déjà coché" if ligne['checkbox_id'] in bilan['deja'] else "coché"
+                    self.logger.info(f"   ☑️ Article {code} {etat}: {ligne['texte']}")
+            if bilan['absents']:
+                self.logger.warning(f"⚠️ Cases non cochées: {', '.join(bilan['absents'])}")
+
+            coches = set(bilan['coches']) | set(bilan['deja'])
+            articles_trouves = sum(
+                1 for lignes_code in trouves.values()
+                if any(ligne['checkbox_id'] in coches for ligne in lignes_code)
+            )
+
             # 6. Afficher les articles manquants
-            articles_manquants = [code for code, trouve in articles_attendus.items() if not trouve]
+            articles_manquants = [code for code in codes if code not in trouves]
             if articles_manquants:
                 self.logger.warning(f"⚠️ Articles non trouvés dans {n_bc}: {', '.join(articles_manquants)}")
             
             # 7. Gérer la popup de confirmation "Voulez-vous remplacer..."
-            time.sleep(1)
-            try:
-                oui_btn = WebDriverWait(driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, "//a[@aria-label='Oui']"))
-                )
-                oui_btn.click()
+            if self.driver_manager.wait_alert(timeout=4) and self.driver_manager.click_alert_button(['Oui']):
                 self.logger.info("✅ Popup 'Oui' cliquée")
-                time.sleep(1)
-            except:
+                self.driver_manager.wait_spinner(timeout=10)
+            else:
                 self.logger.debug("ℹ️ Pas de popup de confirmation")
             
             self.logger.info(f"✅ {articles_trouves}/{len(articles)} article(s) sélectionné(s) pour BC {n_bc}")
@@ -733,103 +570,55 @@ class ReceiptionRobot(BaseRobot, WebResultMixin):
             driver.save_screenshot(f"error_selection_bc_{n_bc}.png")
             return False
     
-    def _remplir_article_dans_ligne(self, article: Dict, ligne_num: int) -> bool:
-        """Remplir les données d'un article dans le tableau des lignes"""
-        
+    def _remplir_lignes_bc(self, articles: List[Dict]) -> List[bool]:
+        """
+        Remplir les lignes de tous les articles d'un BC
+
+        La grille 'Lignes' est lue une seule fois, seules les cellules dont la
+        valeur diffère sont saisies, puis relues en un seul appel.
+
+        Args:
+            articles: Articles du BC (code, quantite, n_b_transport, matricule, poids, marque)
+
+        Returns:
+            Succès par article, dans l'ordre de la liste
+        """
         driver = self.driver_manager.driver
 
-        self.logger.info(f"🖊️ Remplissage article {article} dans la ligne {ligne_num}")
         try:
-            # Attendre le tableau
             WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".s-grid-table-body"))
             )
 
-            table = driver.find_element(By.XPATH, 
-                "//section[contains(@class, 's-h1')]//div[contains(text(), 'Lignes')]/ancestor::section//table[contains(@class, 's-grid-table-body')]"
-            )
-            # Trouver toutes les lignes
-            rows = table.find_elements(By.CSS_SELECTOR, ".s-grid-table-body tr.s-grid-row")
-            self.logger.info(f"📊 {len(rows)} ligne(s) dans le tableau pour remplissage")
-            # Chercher la ligne avec cet article
-            target_row = None
-            for row in rows:
-                try:
-                    cells = row.find_elements(By.CSS_SELECTOR, ".s-inplace-input")
-                    for cell in cells:
-                        cell_value = cell.get_attribute('value')
-                        if cell_value and article['code'] in cell_value:
-                            target_row = row
-                            break
-                    if target_row:
-                        break
-                except:
+            lignes = self.driver_manager.read_grid(LIGNES_ROWS)
+            self.logger.info(f"📊 {len(lignes)} ligne(s) dans le tableau pour remplissage")
+            index = indexer_lignes_articles(lignes, articles)
+
+            champs = []
+            for i, article in enumerate(articles):
+                ligne = index.get(i)
+                if ligne is None:
+                    self.logger.warning(f"Article {article['code']} non trouvé dans tableau")
                     continue
-            
-            if not target_row:
-                self.logger.warning(f"Article {article['code']} non trouvé dans tableau")
-                return False
-            
-            # Modifier les cellules
-            cells = target_row.find_elements(By.CSS_SELECTOR, ".s-inplace-input")
-            
-            # Quantité (adapter l'index selon ton tableau)
-            if article['quantite'] and len(cells) > 5:
-                self.logger.info("Remplissage quantité...")
-                qte_cell = cells[5]
-                # driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", qte_cell)
-                qte_cell.click()
-                time.sleep(0.3)
-                qte_cell.clear()
-                qte_cell.send_keys(article['quantite'])
-                qte_cell.send_keys(Keys.TAB)
-                time.sleep(0.3)
-            
-            # N° Bon de transport
-            if article['n_b_transport'] and len(cells) > 9:
-                transport_cell = cells[9]  
-                transport_cell.click()
-                time.sleep(0.3)
-                transport_cell.clear()
-                transport_cell.send_keys(article['n_b_transport'])
-                transport_cell.send_keys(Keys.TAB)
-                time.sleep(0.3)
-            
-            # Matricule
-            if article['matricule'] and len(cells) > 10:
-                matricule_cell = cells[10] 
-                matricule_cell.click()
-                time.sleep(0.3)
-                matricule_cell.clear()
-                matricule_cell.send_keys(article['matricule'])
-                matricule_cell.send_keys(Keys.TAB)
-                time.sleep(0.3)
-            
-            # Poids
-            if article['poids'] and len(cells) > 11:
-                poids_cell = cells[11] 
-                poids_cell.click()
-                time.sleep(0.3)
-                poids_cell.clear()
-                poids_cell.send_keys(article['poids'])
-                poids_cell.send_keys(Keys.TAB)
-                time.sleep(0.3)
-            
-            # Marque
-            if article['marque'] and len(cells) > 12:
-                marque_cell = cells[12] 
-                marque_cell.click()
-                time.sleep(0.3)
-                marque_cell.clear()
-                marque_cell.send_keys(article['marque'])
-                marque_cell.send_keys(Keys.TAB)
-                time.sleep(0.3)
-            
-            return True
-            
+                cellules = cellules_a_modifier(ligne, article)
+                self.logger.info(f"🖊️ Article {article['code']} (ligne {ligne['index'] + 1}): "
+                                 f"{', '.join(cle for cle, _ in cellules) or 'déjà à jour'}")
+                champs.extend(
+                    FormField((By.XPATH, xpath_cellule(LIGNES_ROWS, ligne['index'], colonne)), article[cle],
+                              nom=f"{i}:{cle}", numerique=cle in COLONNES_NUMERIQUES)
+                    for cle, colonne in cellules
+                )
+
+            ecarts = self.form_filler.remplir(champs)
+            en_echec = {int(nom.split(':')[0]) for nom in ecarts}
+            for i in sorted(en_echec):
+                self.logger.error(f"❌ Article {articles[i]['code']}: valeurs non prises en compte")
+
+            return [i in index and i not in en_echec for i in range(len(articles))]
+
         except Exception as e:
-            self.logger.error(f"Erreur remplissage article: {e}")
-            return False
+            self.logger.error(f"Erreur remplissage articles: {e}")
+            return [False] * len(articles)
     
     def _enregistrer_reception(self) -> bool:
         """Enregistrer la réception"""
@@ -865,19 +654,90 @@ class ReceiptionRobot(BaseRobot, WebResultMixin):
         
     def _gere_popup_fournisseur(self):
         """Gérer la popup après saisie du fournisseur"""
-        driver = self.driver_manager.driver
-        
         try:
-            time.sleep(1)
-            # Attendre que la boîte de dialogue soit visible
-            wait = WebDriverWait(driver, 2)
-            dialog = wait.until(EC.visibility_of_element_located((By.CLASS_NAME, "s_alertbox")))
-
-            # Cliquer sur OK
-            ok_button = dialog.find_element(By.LINK_TEXT, "OK")
-            ok_button.click()
-            self.logger.info("✅ Popup 'Oui' cliquée")
-            time.sleep(1)
+            # Rend la main dès l'apparition de la popup, ou dès que la page est calme
+            if self.driver_manager.wait_alert(timeout=3):
+                if self.driver_manager.click_alert_button(['OK']):
+                    self.logger.info("✅ Popup 'OK' cliquée")
         except:
             # Pas de popup
-            pass
\ No newline at end of file
+            pass
+
+def indexer_lignes_articles(lignes: List[Dict[str, Any]], articles: List[Dict]) -> Dict[int, Dict[str, Any]]:
+    """
+    Associer chaque article à sa ligne dans une photo de la grille 'Lignes'
+
+    Args:
+        lignes: Lignes lues par DriverManager.read_grid
+        articles: Articles du BC
+
+    Returns:
+        {position de l'article: ligne} (une ligne n'est attribuée qu'une fois)
+    """
+    index = {}
+    utilisees = set()
+    for i, article in enumerate(articles):
+        for ligne in lignes:
+            if ligne['index'] in utilisees:
+                continue
+            if any(isinstance(v, str) and article['code'] in v for v in ligne['valeurs']):
+                index[i] = ligne
+                utilisees.add(ligne['index'])
+                break
+    return index
+
+
+def cellules_a_modifier(ligne: Dict[str, Any], article: Dict) -> List[Tuple[str, int]]:
+    """
+    Cellules de la ligne dont la valeur diffère de celle de l'article
+
+    Args:
+        ligne: Ligne lue par DriverManager.read_grid
+        article: Article du fichier
+
+    Returns:
+        [(clé de l'article, index de la cellule)]
+    """
+    valeurs = ligne['valeurs']
+    return [
+        (cle, colonne) for cle, colonne in COLONNES_LIGNES
+        if article[cle] and len(valeurs) > colonne
+        and not valeurs_identiques(valeurs[colonne], article[cle], numerique=cle in COLONNES_NUMERIQUES)
+    ]
+
+
+def xpath_cellule(lignes_xpath: str, ligne: int, colonne: int) -> str:
+    """XPath de la n-ième cellule saisissable d'une ligne (index à partir de 0)"""
+    return (f"(({lignes_xpath})[{ligne + 1}]"
+            f"//*[contains(concat(' ', normalize-space(@class), ' '), ' s-inplace-input ')])[{colonne + 1}]")
+
+
+def indexer_bc_articles(lignes: List[Dict[str, Any]], n_bc: str,
+                        codes: List[str]) -> Tuple[Optional[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Repérer dans une photo de l'arbre 'Sélection commandes' le BC et ses lignes articles
+
+    Args:
+        lignes: Lignes lues par DriverManager.read_grid (niveau 0 = BC, 1 = article)
+        n_bc: Numéro du bon de commande
+        codes: Codes articles recherchés
+
+    Returns:
+        (ligne du BC ou None, {code article: [lignes de ce BC qui commencent par ce code]})
+    """
+    bc_ligne = None
+    trouves: Dict[str, List[Dict[str, Any]]] = {}
+
+    for ligne in lignes:
+        if ligne['niveau'] == 0:
+            if bc_ligne is not None:
+                break  # BC suivant: fin des lignes du BC recherché
+            if n_bc in ligne['texte']:
+                bc_ligne = ligne
+        elif ligne['niveau'] == 1 and bc_ligne is not None:
+            # Code le plus long en cas de préfixe commun (A1 / A12)
+            code = max((c for c in codes if ligne['texte'].startswith(c)), key=len, default=None)
+            if code:
+                trouves.setdefault(code, []).append(ligne)
+
+    return bc_ligne, trouves
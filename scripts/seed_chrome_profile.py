@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Préparer le profil Chrome modèle copié par chaque session (core/chrome_profiles.py)
+
+Ouvre Chrome sur le profil modèle, se connecte à Sage X3 et charge les modules
+demandés pour remplir le cache statique de Syracuse (scripts, styles, images),
+puis se déconnecte et retire les fichiers de verrou du modèle.
+
+Exemples d'utilisation:
+    python scripts/seed_chrome_profile.py
+    python scripts/seed_chrome_profile.py --url "<url module GESITM>" --url "<url module GESPIH>"
+    python scripts/seed_chrome_profile.py --template /opt/rpa/chrome_template --headless
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le dossier parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.settings import SELENIUM_CONFIG
+from core.chrome_profiles import FICHIERS_EXCLUS
+from core.driver_manager import STANDARD, DriverManager
+from core.logger import Logger
+from core.sage_connector import SageConnector
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Préparer le profil Chrome modèle des robots Sage X3')
+
+    parser.add_argument(
+        '--template',
+        type=str,
+        default=SELENIUM_CONFIG['profile_template'],
+        help='Dossier du profil modèle (défaut: CHROME_PROFILE_TEMPLATE)'
+    )
+
+    parser.add_argument(
+        '--url',
+        action='append',
+        default=[],
+        help='URL de module à charger pour remplir le cache (répétable)'
+    )
+
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help='Exécuter en mode headless (sans interface)'
+    )
+
+    args = parser.parse_args()
+
+    logger = Logger.get_logger('seed_chrome_profile', 'scripts')
+    template = Path(args.template)
+    logger.info(f"🌱 Préparation du profil modèle: {template}")
+
+    # Profil explicite: Chrome travaille directement dans le modèle ; profil standard pour tout mettre en cache
+    driver_manager = DriverManager(headless=args.headless, profile_path=str(template), browser_profile=STANDARD)
+    connecteur = SageConnector(driver_manager)
+
+    try:
+        if not connecteur.connect():
+            logger.error("❌ Connexion Sage X3 impossible, profil modèle non préparé")
+            sys.exit(1)
+
+        for url in args.url:
+            if not connecteur.navigate_to_module(url):
+                logger.warning(f"⚠️ Module non chargé: {url}")
+
+        # Pas de session Sage dans le modèle: chaque robot se connecte avec son propre profil
+        connecteur.disconnect()
+
+    except KeyboardInterrupt:
+        logger.warning("\n⚠️ Interruption par l'utilisateur")
+        sys.exit(1)
+
+    finally:
+        driver_manager.stop()
+
+    for nom in FICHIERS_EXCLUS:
+        chemin = template / nom
+        if chemin.is_symlink() or chemin.is_file():
+            chemin.unlink()
+
+    logger.info(f"✅ Profil modèle prêt ({sum(1 for _ in template.rglob('*'))} fichiers)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Générateurs de fichiers Excel synthétiques pour chaque module
+
+Produisent des entrées réalistes à grande échelle (100k lignes et plus) avec des
+distributions configurables : nombre de fournisseurs, DAs / BCs par fournisseur,
+taux de doublons et de cellules vides.
+
+Exemples d'utilisation:
+    python -m tests.fixtures.generators bonne_commande --rows 100000 --out data/input/excel/bc_100k.xlsx
+    python -m tests.fixtures.generators receiption --rows 5000 --fournisseurs 50 --taux-vides 0.01
+"""
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MARQUES = ['LEASING', 'ETUDE', 'CHANTIER', 'ATELIER', 'SIEGE']
+ACHETEURS = ['ACH01', 'ACH02', 'ACH03', 'ACH04']
+COMPTES = ['44110000', '44120000', '44170000']
+
+# Colonnes dont les valeurs peuvent être vidées (celles que les robots valident)
+COLONNES_VIDABLES = {
+    'bonne_commande': ['Numero_DA', 'Code_Fournisseur', 'Code_Article', 'Montant', 'Marque'],
+    'receiption': ['CodeFrs', 'BLFrs', 'DateBC', 'N_BC', 'CodeArticle', 'Quantite', 'Poids', 'Marque'],
+    'lettrage': ['Compte', 'Code', 'Facture', 'N-Avis'],
+    'facturation': ['Code', 'DFF', 'FactureFrs', 'Date', 'BR'],
+}
+
+
+def _poids_fournisseurs(fournisseurs: int, repartition: str) -> np.ndarray:
+    """Poids de tirage des fournisseurs ('uniforme' ou 'zipf' : quelques gros fournisseurs)"""
+    if repartition == 'zipf':
+        poids = 1.0 / np.arange(1, fournisseurs + 1)
+    elif repartition == 'uniforme':
+        poids = np.ones(fournisseurs)
+    else:
+        raise ValueError(f"Répartition inconnue: {repartition}")
+    return poids / poids.sum()
+
+
+def _tirer_fournisseurs(rng: np.random.Generator, rows: int, fournisseurs: int, repartition: str) -> np.ndarray:
+    """Indice fournisseur de chaque ligne (tous les fournisseurs présents si rows le permet)"""
+    fournisseurs = max(1, min(fournisseurs, rows))
+    tirage = rng.choice(fournisseurs, size=rows, p=_poids_fournisseurs(fournisseurs, repartition))
+    tirage[:fournisseurs] = np.arange(fournisseurs)
+    return np.sort(tirage, kind='stable')
+
+
+def _codes(prefixe: str, valeurs: np.ndarray, largeur: int) -> np.ndarray:
+    """Codes formatés en bloc (ex: T0042, DA00001234)"""
+    return np.char.add(prefixe, np.char.zfill(valeurs.astype(str), largeur)).astype(object)
+
+
+def _dates(rng: np.random.Generator, rows: int, debut: str = '2025-01-01', jours: int = 365) -> pd.Series:
+    return pd.Series(pd.Timestamp(debut) + pd.to_timedelta(rng.integers(0, jours, size=rows), unit='D'))
+
+
+def _appliquer_bruit(df: pd.DataFrame, rng: np.random.Generator, colonnes: List[str],
+                     taux_doublons: float, taux_vides: float) -> pd.DataFrame:
+    """
+    Ajouter des doublons exacts et des cellules vides
+
+    Args:
+        df: DataFrame propre
+        rng: Générateur aléatoire
+        colonnes: Colonnes pouvant être vidées
+        taux_doublons: Part des lignes remplacées par la copie d'une autre ligne
+        taux_vides: Probabilité qu'une cellule de `colonnes` soit vide
+
+    Returns:
+        DataFrame bruité (même nombre de lignes)
+    """
+    rows = len(df)
+    nb_doublons = int(round(rows * taux_doublons))
+    if nb_doublons and rows > 1:
+        cibles = rng.choice(rows, size=nb_doublons, replace=False)
+        sources = rng.integers(0, rows, size=nb_doublons)
+        df.iloc[cibles] = df.iloc[sources].to_numpy()
+    if taux_vides:
+        for col in colonnes:
+            masque = rng.random(rows) < taux_vides
+            if masque.any():
+                df[col] = df[col].astype(object)
+                df.loc[masque, col] = np.nan
+    return df
+
+
+def generer_bonne_commande(rows: int, fournisseurs: int = 50, das_par_fournisseur: int = 20,
+                           articles: int = 5000, taux_affaire: float = 0.2, repartition: str = 'zipf',
+                           taux_doublons: float = 0.0, taux_vides: float = 0.0,
+                           seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    Générer un fichier bonne commande (Numero_DA, Acheteur, Code_Fournisseur, ...)
+
+    Args:
+        rows: Nombre de lignes
+        fournisseurs: Nombre de fournisseurs distincts
+        das_par_fournisseur: Nombre max de DAs par fournisseur
+        articles: Taille du catalogue d'articles
+        taux_affaire: Part des lignes avec une affaire renseignée
+        repartition: 'zipf' (quelques gros fournisseurs) ou 'uniforme'
+        taux_doublons: Part de lignes dupliquées
+        taux_vides: Probabilité de cellule vide dans les colonnes validées
+        seed: Graine aléatoire
+
+    Returns:
+        DataFrame au schéma du robot bonne commande
+    """
+    rng = np.random.default_rng(seed)
+    frs = _tirer_fournisseurs(rng, rows, fournisseurs, repartition)
+    da = frs * das_par_fournisseur + rng.integers(0, das_par_fournisseur, size=rows)
+    code_frs = _codes('T', frs + 1000, 4)
+
+    df = pd.DataFrame({
+        'Numero_DA': _codes('DA', da + 1, 8),
+        'Acheteur': np.array(ACHETEURS, dtype=object)[da % len(ACHETEURS)],
+        'Code_Fournisseur': code_frs,
+        'Email_Fournisseur': np.char.add(np.char.lower(code_frs.astype(str)), '@fournisseur.ma').astype(object),
+        'TEL_Fournisseu': _codes('05', frs + 22000000, 8),
+        'Code_Article': _codes('A', rng.integers(1, articles + 1, size=rows), 5),
+        'Montant': np.round(rng.lognormal(mean=6, sigma=1, size=rows), 2),
+        'Marque': np.array(MARQUES, dtype=object)[rng.integers(0, len(MARQUES), size=rows)],
+        'Affaire': np.where(rng.random(rows) < taux_affaire,
+                            _codes('AFF', rng.integers(1, 500, size=rows), 4), ''),
+        'email_expediteur': 'acheteur@example.com',
+    })
+    return _appliquer_bruit(df, rng, COLONNES_VIDABLES['bonne_commande'], taux_doublons, taux_vides)
+
+
+def generer_receiption(rows: int, fournisseurs: int = 50, bcs_par_fournisseur: int = 10,
+                       articles: int = 5000, repartition: str = 'zipf',
+                       taux_doublons: float = 0.0, taux_vides: float = 0.0,
+                       seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    Générer un fichier réception (CodeFrs, BLFrs, DateBC, N_BC, CodeArticle, ...)
+
+    Args:
+        rows: Nombre de lignes
+        fournisseurs: Nombre de fournisseurs distincts
+        bcs_par_fournisseur: Nombre max de BCs par fournisseur
+        articles: Taille du catalogue d'articles
+        repartition: 'zipf' ou 'uniforme'
+        taux_doublons: Part de lignes dupliquées
+        taux_vides: Probabilité de cellule vide dans les colonnes validées
+        seed: Graine aléatoire
+
+    Returns:
+        DataFrame au schéma du robot réception
+    """
+    rng = np.random.default_rng(seed)
+    frs = _tirer_fournisseurs(rng, rows, fournisseurs, repartition)
+    bc = frs * bcs_par_fournisseur + rng.integers(0, bcs_par_fournisseur, size=rows)
+    bl = np.char.add(np.char.add('FN°', np.char.zfill((frs + 1).astype(str), 4)), '/2025').astype(object)
+
+    df = pd.DataFrame({
+        'CodeFrs': _codes('T', frs + 1000, 4),
+        'BLFrs': bl,
+        'DateBC': _dates(rng, rows),
+        'N_BC': _codes('BC', bc + 100000, 6),
+        'CodeArticle': _codes('A', rng.integers(1, articles + 1, size=rows), 5),
+        'Quantite': rng.integers(1, 20, size=rows),
+        'N_B_transport': bl,
+        'Matricule': np.where(rng.random(rows) < 0.5, 'XX', _codes('MAT', rng.integers(1, 99, size=rows), 3)),
+        'Poids': np.round(rng.uniform(0.01, 50, size=rows), 2),
+        'Marque': np.array(MARQUES, dtype=object)[rng.integers(0, len(MARQUES), size=rows)],
+        'email_expediteur': 'magasin@example.com',
+    })
+    return _appliquer_bruit(df, rng, COLONNES_VIDABLES['receiption'], taux_doublons, taux_vides)
+
+
+def generer_lettrage(rows: int, fournisseurs: int = 500, repartition: str = 'uniforme',
+                     taux_doublons: float = 0.0, taux_vides: float = 0.0,
+                     seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    Générer un fichier lettrage (Compte, Code, Facture, N-Avis, Nom)
+
+    Args:
+        rows: Nombre de lignes
+        fournisseurs: Nombre de fournisseurs distincts
+        repartition: 'zipf' ou 'uniforme'
+        taux_doublons: Part de lignes dupliquées
+        taux_vides: Probabilité de cellule vide dans les colonnes validées
+        seed: Graine aléatoire
+
+    Returns:
+        DataFrame au schéma du robot lettrage
+    """
+    rng = np.random.default_rng(seed)
+    frs = _tirer_fournisseurs(rng, rows, fournisseurs, repartition)
+    numeros = np.arange(rows) + 100000
+
+    df = pd.DataFrame({
+        'Compte': np.array(COMPTES, dtype=object)[frs % len(COMPTES)],
+        'Code': _codes('T', frs + 1000, 4),
+        'Facture': _codes('FF', numeros, 6),
+        'N-Avis': _codes('ECAHI', numeros, 6),
+        'Nom': np.char.add('Fournisseur ', (frs + 1).astype(str)).astype(object),
+    })
+    return _appliquer_bruit(df, rng, COLONNES_VIDABLES['lettrage'], taux_doublons, taux_vides)
+
+
+def generer_facturation(rows: int, fournisseurs: int = 500, repartition: str = 'zipf',
+                        taux_doublons: float = 0.0, taux_vides: float = 0.0,
+                        seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    Générer un fichier facturation (Code, DFF, FactureFrs, Date, BR)
+
+    Args:
+        rows: Nombre de lignes
+        fournisseurs: Nombre de fournisseurs distincts
+        repartition: 'zipf' ou 'uniforme'
+        taux_doublons: Part de lignes dupliquées
+        taux_vides: Probabilité de cellule vide dans les colonnes validées
+        seed: Graine aléatoire
+
+    Returns:
+        DataFrame au schéma du robot facturation
+    """
+    rng = np.random.default_rng(seed)
+    frs = _tirer_fournisseurs(rng, rows, fournisseurs, repartition)
+    dff = _dates(rng, rows)
+
+    df = pd.DataFrame({
+        'Code': _codes('T', frs + 1000, 4),
+        'DFF': dff.dt.strftime('%d/%m/%Y'),
+        'FactureFrs': np.char.add(np.char.zfill((np.arange(rows) + 1).astype(str), 5), '/2025').astype(object),
+        'Date': (dff + pd.to_timedelta(rng.integers(0, 30, size=rows), unit='D')).dt.strftime('%d/%m/%Y'),
+        'BR': _codes('BR', np.arange(rows) + 300000, 6),
+        'Nom': np.char.add('Fournisseur ', (frs + 1).astype(str)).astype(object),
+    })
+    return _appliquer_bruit(df, rng, COLONNES_VIDABLES['facturation'], taux_doublons, taux_vides)
+
+
+GENERATEURS = {
+    'bonne_commande': generer_bonne_commande,
+    'receiption': generer_receiption,
+    'lettrage': generer_lettrage,
+    'facturation': generer_facturation,
+}
+
+
+def generer_excel(module: str, rows: int, filepath: str, **distribution) -> Path:
+    """
+    Générer et écrire un fichier Excel synthétique
+
+    Args:
+        module: bonne_commande, receiption, lettrage ou facturation
+        rows: Nombre de lignes
+        filepath: Fichier de destination
+        **distribution: Paramètres du générateur (fournisseurs, taux_vides, seed, ...)
+
+    Returns:
+        Chemin du fichier écrit
+    """
+    df = GENERATEURS[module](rows, **distribution)
+    path = Path(filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_excel(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Générer un fichier Excel synthétique')
+    parser.add_argument('module', choices=sorted(GENERATEURS))
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--out', required=True, help='Fichier Excel de sortie')
+    parser.add_argument('--fournisseurs', type=int, default=None)
+    parser.add_argument('--repartition', choices=['zipf', 'uniforme'], default=None)
+    parser.add_argument('--taux-doublons', type=float, default=0.0)
+    parser.add_argument('--taux-vides', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    distribution: Dict = {'taux_doublons': args.taux_doublons, 'taux_vides': args.taux_vides, 'seed': args.seed}
+    if args.fournisseurs is not None:
+        distribution['fournisseurs'] = args.fournisseurs
+    if args.repartition is not None:
+        distribution['repartition'] = args.repartition
+
+    print(f"✅ {generer_excel(args.module, args.rows, args.out, **distribution)}")
+
+
+if __name__ == '__main__':
+    main()
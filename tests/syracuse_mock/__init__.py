@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Serveur Syracuse de substitution pour exécuter les robots hors ligne
+(tests d'intégration, benchmarks)
+"""
+import re
+
+from .app import DEFAULT_CONFIG, DEMO_DATA, MockState, create_app, module_url
+
+_FUNCTION_RE = re.compile(r'f%3D([A-Z0-9_]+)')
+
+
+def rediriger_robot(robot, base_url: str) -> None:
+    """
+    Faire pointer un robot (et SAGE_CONFIG) vers le serveur de substitution
+
+    Toutes les URLs Syracuse portées par le robot (attributs url_*) sont
+    réécrites en conservant le code fonction Sage.
+
+    Args:
+        robot: Instance de robot (BaseRobot)
+        base_url: URL du serveur (ex: http://127.0.0.1:8124)
+    """
+    from config.settings import SAGE_CONFIG
+
+    SAGE_CONFIG['url'] = base_url.rstrip('/') + '/'
+    for name, value in list(vars(robot).items()):
+        if isinstance(value, str) and '/syracuse-main/' in value:
+            match = _FUNCTION_RE.search(value)
+            if match:
+                setattr(robot, name, module_url(base_url, match.group(1)))
+
+
+__all__ = ['DEFAULT_CONFIG', 'DEMO_DATA', 'MockState', 'create_app', 'module_url', 'rediriger_robot']
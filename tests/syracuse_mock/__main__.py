@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Lancer le serveur Syracuse de substitution
+
+    python -m tests.syracuse_mock --port 8124 --latency-ms 80 --failure-rate 0.05
+"""
+import argparse
+import json
+
+import uvicorn
+
+from .app import create_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur Syracuse de substitution")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8124)
+    parser.add_argument('--latency-ms', type=int, default=None, help="Latence de base des appels")
+    parser.add_argument('--jitter-ms', type=int, default=None, help="Variation aléatoire de la latence")
+    parser.add_argument('--failure-rate', type=float, default=None, help="Probabilité d'échec d'un enregistrement")
+    parser.add_argument('--popup-rate', type=float, default=None, help="Probabilité d'une popup fournisseur")
+    parser.add_argument('--seed', type=int, default=None, help="Graine aléatoire")
+    parser.add_argument('--seed-file', default=None, help="Fichier JSON de données initiales")
+    args = parser.parse_args()
+
+    config = {
+        key: value for key, value in {
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'failure_rate': args.failure_rate,
+            'popup_rate': args.popup_rate,
+            'seed': args.seed,
+        }.items() if value is not None
+    }
+    data = None
+    if args.seed_file:
+        with open(args.seed_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    uvicorn.run(create_app(config, data), host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+"""
+Serveur Syracuse de substitution (FastAPI + HTML statique)
+Reproduit le DOM utilisé par les robots, avec latence et taux d'échec configurables
+"""
+import asyncio
+import copy
+import json
+import os
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.staticfiles import StaticFiles
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+SESSION_COOKIE = 'syracuse.sid'
+
+# Configuration par défaut (surchargeable par variables d'environnement SYRACUSE_MOCK_*)
+DEFAULT_CONFIG = {
+    'titular': 'CPT02',              # Texte du menu utilisateur (SAGE_CONFIG['titular'])
+    'password': '',                   # Mot de passe exigé ('' = tout mot de passe accepté)
+    'latency_ms': 50,                 # Latence de base des appels API
+    'jitter_ms': 0,                   # Variation aléatoire +/- de la latence
+    'page_latency_ms': 200,           # Latence de chargement d'une page (main.html)
+    'save_latency_ms': 300,           # Durée du spinner lors d'un enregistrement
+    'bc_generation_ms': 1000,         # Durée de la génération automatique des BC (XBCAUTO)
+    'failure_rate': 0.0,              # Probabilité d'échec d'un enregistrement
+    'popup_rate': 0.0,                # Probabilité d'une popup d'information fournisseur
+    'replace_popup': True,            # Popup "remplacer les données" à la sélection
+    'auto_create': True,              # Créer à la volée les articles / DAs inconnus
+    'seed': None,                     # Graine du générateur aléatoire
+}
+
+
+def _config_from_env() -> Dict[str, Any]:
+    """Lire la configuration depuis l'environnement"""
+    config = dict(DEFAULT_CONFIG)
+    for key, default in DEFAULT_CONFIG.items():
+        value = os.getenv(f'SYRACUSE_MOCK_{key.upper()}')
+        if value is None:
+            continue
+        if isinstance(default, bool):
+            config[key] = value.lower() == 'true'
+        elif isinstance(default, int):
+            config[key] = int(value)
+        elif isinstance(default, float):
+            config[key] = float(value)
+        else:
+            config[key] = value
+    return config
+
+
+DEMO_DATA = {
+    'articles': [
+        {'code': 'A15007', 'fournisseur': 'T6664', 'affaire': '', 'prix': '120', 'marque': 'LEASING', 'bc_auto': True},
+        {'code': 'A15884', 'fournisseur': 'T6664', 'affaire': '', 'prix': '80', 'marque': 'LEASING', 'bc_auto': False},
+    ],
+    'das': [
+        {'numero': 'DA000101', 'acheteur': 'ACH01', 'fournisseur': 'T6664', 'valide': False},
+    ],
+    'commandes': [
+        {'fournisseur': 'T6664', 'bc': 'BC186553', 'date': '23/05/2025',
+         'articles': [{'code': 'A15007', 'quantite': 1}, {'code': 'A15884', 'quantite': 1}]},
+    ],
+    'receptions': [
+        {'fournisseur': 'T6664', 'br': 'BR189847', 'montant_ht': '200.00', 'taxe': '-40.00'},
+    ],
+    'ecritures': [
+        {'compte': '44110000', 'code': 'T2504', 'numero': 'FF169917', 'type': 'FAF', 'date': '02/01/2025',
+         'debit': '', 'credit': '1 200,00', 'lettre': '', 'libelle': 'Facture'},
+        {'compte': '44110000', 'code': 'T2504', 'numero': 'ECAHI00003', 'type': 'REG', 'date': '15/01/2025',
+         'debit': '1 200,00', 'credit': '', 'lettre': '', 'libelle': 'Règlement'},
+    ],
+}
+
+
+class MockState:
+    """État en mémoire du serveur (données métier + statistiques)"""
+
+    def __init__(self, data: Optional[Dict[str, List[Dict]]] = None):
+        self.reset(data)
+
+    def reset(self, data: Optional[Dict[str, List[Dict]]] = None):
+        """Réinitialiser l'état avec un jeu de données"""
+        data = copy.deepcopy(data if data is not None else DEMO_DATA)
+        self.articles = {}
+        self.das = {}
+        self.commandes = []
+        self.receptions = []
+        self.ecritures = []
+        self.factures = []
+        self.stats = Counter()
+        self._next_bc = 900000
+        self._next_piece = 1
+        self.seed(data)
+
+    def seed(self, data: Dict[str, List[Dict]]):
+        """Ajouter des données (articles, das, commandes, receptions, ecritures)"""
+        for art in data.get('articles', []):
+            self.articles[str(art['code'])] = {
+                'code': str(art['code']),
+                'fournisseur': str(art.get('fournisseur', '')),
+                'affaire': str(art.get('affaire', '')),
+                'prix': str(art.get('prix', '')),
+                'marque': str(art.get('marque', '')),
+                'bc_auto': bool(art.get('bc_auto', False)),
+            }
+        for da in data.get('das', []):
+            self.das[str(da['numero'])] = {
+                'numero': str(da['numero']),
+                'acheteur': str(da.get('acheteur', '')),
+                'fournisseur': str(da.get('fournisseur', '')),
+                'valide': bool(da.get('valide', False)),
+                'commandee': bool(da.get('commandee', False)),
+            }
+        for cmd in data.get('commandes', []):
+            self.commandes.append({
+                'fournisseur': str(cmd['fournisseur']),
+                'bc': str(cmd['bc']),
+                'date': str(cmd.get('date', '')),
+                'articles': [{'code': str(a['code']), 'quantite': a.get('quantite', 1),
+                              'designation': a.get('designation', f"Article {a['code']}")}
+                             for a in cmd.get('articles', [])],
+            })
+        for rec in data.get('receptions', []):
+            self.receptions.append({
+                'fournisseur': str(rec['fournisseur']),
+                'br': str(rec['br']),
+                'montant_ht': str(rec.get('montant_ht', '0.00')),
+                'taxe': str(rec.get('taxe', '0.00')),
+                'facturee': False,
+            })
+        for ecr in data.get('ecritures', []):
+            ligne = {k: str(ecr.get(k, '')) for k in
+                     ('compte', 'code', 'numero', 'type', 'date', 'debit', 'credit', 'lettre', 'libelle')}
+            self.ecritures.append(ligne)
+
+    def next_bc(self) -> str:
+        self._next_bc += 1
+        return f"BC{self._next_bc}"
+
+    def next_piece(self, prefix: str) -> str:
+        numero = f"{prefix}{self._next_piece:06d}"
+        self._next_piece += 1
+        return numero
+
+
+def create_app(config: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, List[Dict]]] = None) -> FastAPI:
+    """
+    Créer l'application Syracuse de substitution
+
+    Args:
+        config: Surcharges de configuration (voir DEFAULT_CONFIG)
+        data: Jeu de données initial (DEMO_DATA par défaut)
+
+    Returns:
+        Application FastAPI
+    """
+    app = FastAPI(title="Syracuse mock", docs_url=None, redoc_url=None)
+    app.state.config = _config_from_env()
+    app.state.config.update(config or {})
+    app.state.mock = MockState(data)
+    app.state.random = random.Random(app.state.config['seed'])
+
+    app.mount('/syracuse-mock/static', StaticFiles(directory=str(STATIC_DIR)), name='static')
+
+    def cfg(key):
+        return app.state.config[key]
+
+    async def delay(kind: str = 'latency_ms'):
+        ms = cfg(kind)
+        jitter = cfg('jitter_ms')
+        if jitter:
+            ms += app.state.random.uniform(-jitter, jitter)
+        if ms > 0:
+            await asyncio.sleep(ms / 1000.0)
+
+    def tirage(key: str) -> bool:
+        return app.state.random.random() < cfg(key)
+
+    def connecte(request: Request) -> bool:
+        return request.cookies.get(SESSION_COOKIE) == 'ok'
+
+    def page(name: str) -> str:
+        html = (STATIC_DIR / name).read_text(encoding='utf-8')
+        return html.replace('{{TITULAR}}', cfg('titular'))
+
+    state = lambda: app.state.mock  # noqa: E731
+
+    # ------------------------------------------------------------------
+    # Pages (login, main)
+    # ------------------------------------------------------------------
+
+    @app.get('/', response_class=HTMLResponse)
+    async def login_page(request: Request):
+        await delay('page_latency_ms')
+        if connecte(request):
+            return RedirectResponse('/syracuse-main/html/main.html', status_code=303)
+        return HTMLResponse(page('login.html'))
+
+    @app.post('/auth/login')
+    async def login(request: Request):
+        await delay()
+        form = await request.form()
+        password = cfg('password')
+        if not form.get('login') or (password and form.get('password') != password):
+            state().stats['login_failed'] += 1
+            return RedirectResponse('/?error=1', status_code=303)
+        state().stats['login'] += 1
+        response = RedirectResponse('/syracuse-main/html/main.html', status_code=303)
+        response.set_cookie(SESSION_COOKIE, 'ok', httponly=True)
+        return response
+
+    @app.get('/auth/logout')
+    async def logout():
+        state().stats['logout'] += 1
+        response = RedirectResponse('/', status_code=303)
+        response.delete_cookie(SESSION_COOKIE)
+        return response
+
+    @app.get('/syracuse-main/html/main.html', response_class=HTMLResponse)
+    async def main_page(request: Request):
+        await delay('page_latency_ms')
+        if not connecte(request):
+            return RedirectResponse('/', status_code=303)
+        state().stats['page_load'] += 1
+        return HTMLResponse(page('main.html'))
+
+    # ------------------------------------------------------------------
+    # Configuration / statistiques / données
+    # ------------------------------------------------------------------
+
+    @app.get('/mock/config')
+    async def get_config():
+        return app.state.config
+
+    @app.post('/mock/config')
+    async def set_config(request: Request):
+        updates = await request.json()
+        inconnues = [k for k in updates if k not in DEFAULT_CONFIG]
+        if inconnues:
+            return JSONResponse({'error': f"Clés inconnues: {inconnues}"}, status_code=400)
+        app.state.config.update(updates)
+        if 'seed' in updates:
+            app.state.random = random.Random(updates['seed'])
+        return app.state.config
+
+    @app.get('/mock/stats')
+    async def get_stats():
+        return dict(state().stats)
+
+    @app.post('/mock/seed')
+    async def seed(request: Request):
+        state().seed(await request.json())
+        return {'ok': True}
+
+    @app.post('/mock/reset')
+    async def reset(request: Request):
+        body = await request.body()
+        state().reset(json.loads(body) if body else {})
+        return {'ok': True}
+
+    # ------------------------------------------------------------------
+    # GESITM - Articles
+    # ------------------------------------------------------------------
+
+    def _article(code: str) -> Optional[Dict]:
+        art = state().articles.get(code)
+        if art is None and cfg('auto_create'):
+            art = {'code': code, 'fournisseur': '', 'affaire': '', 'prix': '', 'marque': '', 'bc_auto': False}
+            state().articles[code] = art
+        return art
+
+    @app.get('/mock/api/articles')
+    async def search_articles(q: str = ''):
+        await delay()
+        state().stats['search'] += 1
+        if q:
+            art = _article(q)
+            trouves = [art] if art else []
+        else:
+            trouves = list(state().articles.values())[:20]
+        return [{'code': a['code']} for a in trouves]
+
+    @app.get('/mock/api/articles/{code}')
+    async def get_article(code: str):
+        await delay()
+        art = _article(code)
+        if art is None:
+            return JSONResponse({'error': f"Article {code} inexistant"}, status_code=404)
+        return art
+
+    @app.post('/mock/api/articles/{code}')
+    async def save_article(code: str, request: Request):
+        await delay('save_latency_ms')
+        values = await request.json()
+        state().stats['save'] += 1
+        if tirage('failure_rate'):
+            state().stats['save_failed'] += 1
+            return {'error': f"Enregistrement impossible pour l'article {code} (verrouillé)"}
+        art = _article(code)
+        for key in ('fournisseur', 'affaire', 'prix', 'marque', 'bc_auto'):
+            if key in values:
+                art[key] = values[key]
+        return {'ok': True}
+
+    # ------------------------------------------------------------------
+    # GESPSH - Demandes d'achat
+    # ------------------------------------------------------------------
+
+    def _da(numero: str) -> Optional[Dict]:
+        da = state().das.get(numero)
+        if da is None and cfg('auto_create'):
+            da = {'numero': numero, 'acheteur': '', 'fournisseur': '', 'valide': False, 'commandee': False}
+            state().das[numero] = da
+        return da
+
+    @app.get('/mock/api/das')
+    async def search_das(q: str = ''):
+        await delay()
+        state().stats['search'] += 1
+        if q:
+            da = _da(q)
+            trouves = [da] if da else []
+        else:
+            trouves = list(state().das.values())[:20]
+        return [{'numero': d['numero']} for d in trouves]
+
+    @app.get('/mock/api/das/{numero}')
+    async def get_da(numero: str):
+        await delay()
+        da = _da(numero)
+        if da is None:
+            return JSONResponse({'error': f"DA {numero} inexistante"}, status_code=404)
+        return da
+
+    @app.post('/mock/api/das/{numero}')
+    async def save_da(numero: str, request: Request):
+        await delay('save_latency_ms')
+        values = await request.json()
+        state().stats['save'] += 1
+        if tirage('failure_rate'):
+            state().stats['save_failed'] += 1
+            return {'error': f"Enregistrement impossible pour la DA {numero}"}
+        _da(numero)['valide'] = bool(values.get('valide'))
+        return {'ok': True}
+
+    # ------------------------------------------------------------------
+    # XBCAUTO - Génération automatique des BC
+    # ------------------------------------------------------------------
+
+    @app.post('/mock/api/bc/generate')
+    async def generate_bc():
+        await delay('bc_generation_ms')
+        state().stats['bc_generation'] += 1
+        par_fournisseur = {}
+        for da in state().das.values():
+            if da['valide'] and not da['commandee']:
+                par_fournisseur.setdefault(da['fournisseur'], []).append(da)
+        generes = []
+        for fournisseur, das in par_fournisseur.items():
+            bc = state().next_bc()
+            for da in das:
+                da['commandee'] = True
+            generes.append({'bc': bc, 'fournisseur': fournisseur, 'das': [d['numero'] for d in das]})
+        return generes
+
+    # ------------------------------------------------------------------
+    # GESPTH2 - Réceptions
+    # ------------------------------------------------------------------
+
+    @app.get('/mock/api/commandes')
+    async def list_commandes(frs: str = ''):
+        await delay()
+        commandes = [c for c in state().commandes if c['fournisseur'] == frs]
+        popup = None
+        if tirage('popup_rate'):
+            popup = f"Fournisseur {frs} : conditions de livraison à vérifier"
+        return {'commandes': commandes, 'popup': popup}
+
+    @app.post('/mock/api/receptions')
+    async def save_reception(request: Request):
+        await delay('save_latency_ms')
+        values = await request.json()
+        state().stats['save'] += 1
+        if tirage('failure_rate'):
+            state().stats['save_failed'] += 1
+            return {'error': "Réception non enregistrée : quantité incohérente"}
+        numero = state().next_piece('BR')
+        state().receptions.append({
+            'fournisseur': values.get('fournisseur', ''), 'br': numero,
+            'montant_ht': '0.00', 'taxe': '0.00', 'facturee': False,
+        })
+        return {'ok': True, 'numero': numero}
+
+    # ------------------------------------------------------------------
+    # GESPIH - Factures
+    # ------------------------------------------------------------------
+
+    @app.get('/mock/api/receptions')
+    async def list_receptions(frs: str = ''):
+        await delay()
+        receptions = [r for r in state().receptions if r['fournisseur'] == frs and not r['facturee']]
+        popup = None
+        if tirage('popup_rate'):
+            popup = f"Fournisseur {frs} : relevé d'identité bancaire à contrôler"
+        return {'receptions': receptions, 'popup': popup}
+
+    @app.post('/mock/api/factures')
+    async def save_facture(request: Request):
+        await delay('save_latency_ms')
+        values = await request.json()
+        state().stats['save'] += 1
+        if tirage('failure_rate'):
+            state().stats['save_failed'] += 1
+            return {'error': "Avertissement : montant HT différent du montant des réceptions"}
+        for rec in state().receptions:
+            if rec['br'] in values.get('receptions', []):
+                rec['facturee'] = True
+        numero = state().next_piece('FAF')
+        state().factures.append(dict(values, numero=numero))
+        return {'ok': True, 'numero': numero}
+
+    # ------------------------------------------------------------------
+    # LETTRAGE
+    # ------------------------------------------------------------------
+
+    @app.get('/mock/api/ecritures')
+    async def list_ecritures(compte: str = '', code: str = ''):
+        await delay()
+        state().stats['search'] += 1
+        return [e for e in state().ecritures if e['compte'] == compte and e['code'] == code]
+
+    @app.post('/mock/api/lettrage')
+    async def lettrer(request: Request):
+        await delay('save_latency_ms')
+        values = await request.json()
+        state().stats['save'] += 1
+        if tirage('failure_rate'):
+            state().stats['save_failed'] += 1
+            return {'error': "Lettrage impossible : écritures déséquilibrées"}
+        lettre = state().next_piece('L')[-3:]
+        for ecr in state().ecritures:
+            if (ecr['compte'], ecr['code']) == (values.get('compte'), values.get('code')) \
+                    and ecr['numero'] in values.get('numeros', []):
+                ecr['lettre'] = lettre
+        return {'ok': True, 'lettre': lettre}
+
+    return app
+
+
+def module_url(base_url: str, function_code: str, folder: str = 'BASE1') -> str:
+    """
+    Construire l'URL d'une fonction Sage sur le serveur de substitution
+    (même format que les URLs Syracuse des robots)
+
+    Args:
+        base_url: URL du serveur (ex: http://127.0.0.1:8124)
+        function_code: Code fonction (GESITM, GESPSH, XBCAUTO, GESPTH2, GESPIH, LETTRAGE)
+        folder: Dossier X3
+
+    Returns:
+        URL du module
+    """
+    return (f"{base_url.rstrip('/')}/syracuse-main/html/main.html?url=%2Ftrans%2Fx3%2Ferp%2F{folder}"
+            f"%2F%24sessions%3Ff%3D{function_code}%252F2%252F%252FM%252F")
@@ -0,0 +1,611 @@
+/*
+ * Syracuse de substitution - rendu des écrans utilisés par les robots
+ * (GESITM, GESPSH, XBCAUTO, GESPTH2, GESPIH, LETTRAGE)
+ */
+(function () {
+    'use strict';
+
+    var content = document.getElementById('s-content');
+    var alerts = document.getElementById('s-alerts');
+    var spin = document.getElementById('s_lock_long_spin');
+
+    // ------------------------------------------------------------------
+    // Utilitaires DOM / API
+    // ------------------------------------------------------------------
+
+    function el(tag, attrs, children) {
+        var node = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (key) {
+            if (key === 'text') {
+                node.textContent = attrs[key];
+            } else if (key === 'style') {
+                node.setAttribute('style', attrs[key]);
+            } else if (key.indexOf('on') === 0) {
+                node.addEventListener(key.substring(2), attrs[key]);
+            } else {
+                node.setAttribute(key, attrs[key]);
+            }
+        });
+        (children || []).forEach(function (child) {
+            if (child) { node.appendChild(child); }
+        });
+        return node;
+    }
+
+    function api(method, path, body) {
+        return fetch(path, {
+            method: method,
+            credentials: 'same-origin',
+            headers: { 'Content-Type': 'application/json' },
+            body: body === undefined ? undefined : JSON.stringify(body)
+        }).then(function (r) { return r.json(); });
+    }
+
+    function withSpinner(promise) {
+        spin.style.display = 'block';
+        return promise.then(function (value) {
+            spin.style.display = 'none';
+            return value;
+        }, function (error) {
+            spin.style.display = 'none';
+            throw error;
+        });
+    }
+
+    // Boîte d'alerte Syracuse (s_alertbox) - résout avec le libellé du bouton cliqué
+    function alertBox(title, message, buttons, useHtmlButtons) {
+        return new Promise(function (resolve) {
+            var footer = el('footer', { 'class': 's_alertbox_footer' });
+            var box = el('div', { 'class': 's_alertbox' }, [
+                el('article', { 'class': 's_alertbox_content' }, [
+                    el('header', { 'class': 's_alertbox_title', text: title }),
+                    el('pre', { 'class': 's_alertbox_msg', text: message })
+                ]),
+                footer
+            ]);
+            (buttons || ['OK']).forEach(function (label) {
+                var btn = useHtmlButtons
+                    ? el('button', { type: 'button', text: label })
+                    : el('a', { href: '#', 'aria-label': label, text: label });
+                btn.addEventListener('click', function (event) {
+                    event.preventDefault();
+                    box.parentNode.removeChild(box);
+                    resolve(label);
+                });
+                footer.appendChild(btn);
+            });
+            alerts.appendChild(box);
+        });
+    }
+
+    function field(label, id, opts) {
+        opts = opts || {};
+        var input = el('input', {
+            id: id,
+            type: opts.type || 'text',
+            'class': 's-inplace-input' + (opts.readonly ? ' s-readonly' : '')
+        });
+        if (opts.readonly) { input.readOnly = true; }
+        if (opts.onchange) { input.addEventListener('change', opts.onchange); }
+        return {
+            node: el('div', { 'class': 's-field' }, [
+                el('label', { 'class': 's-field-title', 'for': id, text: label }),
+                input
+            ]),
+            input: input
+        };
+    }
+
+    function section(title, children) {
+        return el('section', { 'class': 's-h1' }, [
+            el('header', {}, [el('a', { href: '#', text: title })])
+        ].concat([el('div', { 'class': 's-section-body' }, children)]));
+    }
+
+    function onAction(selector, handler) {
+        var node = document.querySelector(selector);
+        var clone = node.cloneNode(true);
+        node.parentNode.replaceChild(clone, node);
+        clone.addEventListener('click', function (event) {
+            event.preventDefault();
+            if (!clone.classList.contains('s-disabled')) { handler(); }
+        });
+        return clone;
+    }
+
+    function notifyResult(response, successMessage) {
+        if (response && response.error) {
+            return alertBox('Erreur', response.error, ['OK']);
+        }
+        if (successMessage) {
+            return alertBox('Information', successMessage, ['OK']);
+        }
+        return Promise.resolve();
+    }
+
+    // Grille de recherche: tr[1] = titres, tr[2] = filtres ; corps cliquable
+    function searchGrid(title, columns, filterColumn, search, onOpen) {
+        var filterCells = columns.map(function (col, i) {
+            return el('td', {}, i === filterColumn ? [el('input', { type: 'text', 'class': 's-inplace-input' })] : []);
+        });
+        var head = el('table', { 'class': 's-grid-table-head' }, [
+            el('tr', {}, columns.map(function (col) { return el('td', { text: col }); })),
+            el('tr', {}, filterCells)
+        ]);
+        var body = el('table', { 'class': 's-grid-table-body' });
+
+        function render(rows) {
+            body.innerHTML = '';
+            rows.forEach(function (row) {
+                var tr = el('tr', { 'class': 's-grid-row' }, columns.map(function (col, i) {
+                    return el('td', {}, [el('div', { 'class': 's-inplace-value-read', text: row[i] || '' })]);
+                }));
+                tr.addEventListener('click', function () { onOpen(row); });
+                body.appendChild(tr);
+            });
+        }
+
+        filterCells[filterColumn].firstChild.addEventListener('change', function (event) {
+            search(event.target.value.trim()).then(render);
+        });
+        search('').then(render);
+
+        return el('div', { 'class': 's-section' }, [
+            el('header', {}, [el('a', { href: '#', text: title })]),
+            el('div', { 'class': 's-grid' }, [head, body])
+        ]);
+    }
+
+    // ------------------------------------------------------------------
+    // Menu utilisateur / fermeture de page
+    // ------------------------------------------------------------------
+
+    var userPopup = document.querySelector('.s-user-popup');
+    document.querySelector('.s-user-menu').addEventListener('click', function (event) {
+        event.preventDefault();
+        userPopup.style.display = userPopup.style.display === 'none' ? 'block' : 'none';
+    });
+    document.querySelector('.s-logout').addEventListener('click', function (event) {
+        event.preventDefault();
+        alertBox('Déconnexion', 'Voulez-vous vous déconnecter ?', ['Oui', 'Non']).then(function (choice) {
+            if (choice === 'Oui') { window.location.href = '/auth/logout'; }
+        });
+    });
+    document.body.addEventListener('keydown', function (event) {
+        if (event.key === 'Escape') { userPopup.style.display = 'none'; }
+    });
+
+    var creationEnCours = false;
+
+    function renderHome() {
+        creationEnCours = false;
+        content.innerHTML = '';
+        content.appendChild(el('div', { 'class': 's-home', text: 'Accueil' }));
+    }
+
+    onAction('a.s_page_close', function () {
+        if (creationEnCours) {
+            alertBox('Question', 'Continuer et abandonner votre création ?', ['Oui', 'Non']).then(function (choice) {
+                if (choice === 'Oui') { renderHome(); }
+            });
+        } else {
+            renderHome();
+        }
+    });
+
+    // ------------------------------------------------------------------
+    // GESITM - Articles
+    // ------------------------------------------------------------------
+
+    function renderArticles() {
+        var current = null;
+        var bcAuto = field('BC Auto.', '2-178-input', { type: 'checkbox' });
+        var fournisseur = field('Fournisseur', '2-179-input');
+        var affaire = field('Affaire', '2-180-input');
+        var prix = field('Prix', '2-181-input', {
+            onchange: function () {
+                var valeur = parseFloat(prix.input.value.replace(/\s/g, '').replace(',', '.'));
+                if (!(valeur > 0)) {
+                    alertBox('Erreur', 'Tarif invalide : ' + prix.input.value, ['OK']);
+                }
+            }
+        });
+        var marque = field('Marque', '2-182-input');
+
+        var grid = searchGrid('Articles', ['Article'], 0, function (q) {
+            return api('GET', '/mock/api/articles?q=' + encodeURIComponent(q)).then(function (rows) {
+                return rows.map(function (r) { return [r.code]; });
+            });
+        }, function (row) {
+            api('GET', '/mock/api/articles/' + encodeURIComponent(row[0])).then(function (art) {
+                current = art.code;
+                bcAuto.input.checked = !!art.bc_auto;
+                fournisseur.input.value = art.fournisseur;
+                affaire.input.value = art.affaire;
+                prix.input.value = art.prix;
+                marque.input.value = art.marque;
+            });
+        });
+
+        content.appendChild(grid);
+        content.appendChild(el('div', { 'class': 's-form' },
+            [bcAuto.node, fournisseur.node, affaire.node, prix.node, marque.node]));
+
+        onAction('div.s_page_action_i_save', function () {
+            if (!current) { return; }
+            withSpinner(api('POST', '/mock/api/articles/' + encodeURIComponent(current), {
+                bc_auto: bcAuto.input.checked,
+                fournisseur: fournisseur.input.value,
+                affaire: affaire.input.value,
+                prix: prix.input.value,
+                marque: marque.input.value
+            })).then(function (r) { return notifyResult(r); });
+        });
+    }
+
+    // ------------------------------------------------------------------
+    // GESPSH - Demandes d'achat
+    // ------------------------------------------------------------------
+
+    function renderDemandesAchat() {
+        var current = null;
+        var acheteur = field('Acheteur', '2-78-input', { readonly: true });
+        var validation = field('Validation Acheteur', '2-80-input', { type: 'checkbox' });
+
+        var grid = searchGrid("Demandes d'achat", ['Site', 'Numéro'], 1, function (q) {
+            return api('GET', '/mock/api/das?q=' + encodeURIComponent(q)).then(function (rows) {
+                return rows.map(function (r) { return ['SITE1', r.numero]; });
+            });
+        }, function (row) {
+            api('GET', '/mock/api/das/' + encodeURIComponent(row[1])).then(function (da) {
+                current = da.numero;
+                acheteur.input.value = da.acheteur;
+                validation.input.checked = !!da.valide;
+            });
+        });
+
+        content.appendChild(grid);
+        content.appendChild(el('div', { 'class': 's-form' }, [acheteur.node, validation.node]));
+
+        onAction('div.s_page_action_i_save', function () {
+            if (!current) { return; }
+            withSpinner(api('POST', '/mock/api/das/' + encodeURIComponent(current), {
+                valide: validation.input.checked
+            })).then(function (r) { return notifyResult(r); });
+        });
+    }
+
+    // ------------------------------------------------------------------
+    // XBCAUTO - Génération automatique des BC
+    // ------------------------------------------------------------------
+
+    function renderGenerationBC() {
+        var body = el('table', { 'class': 's-grid-table-body' });
+        content.appendChild(section('Bons de commande générés', [el('div', { 'class': 's-grid' }, [body])]));
+        withSpinner(api('POST', '/mock/api/bc/generate')).then(function (generes) {
+            generes.forEach(function (g) {
+                var input = el('input', { type: 'text', 'class': 's-inplace-input s-readonly' });
+                input.readOnly = true;
+                input.value = g.bc + ' - ' + g.fournisseur;
+                body.appendChild(el('tr', { 'class': 's-grid-row' }, [el('td', {}, [input])]));
+            });
+        });
+    }
+
+    // ------------------------------------------------------------------
+    // Arbre de sélection (commandes / réceptions)
+    // ------------------------------------------------------------------
+
+    var checkboxSeq = 0;
+
+    function treeRow(level, text, opts) {
+        checkboxSeq += 1;
+        var id = 'sel-' + checkboxSeq + '-input';
+        var checkbox = el('input', { type: 'checkbox', id: id });
+        var cell = el('td', { 'class': 's-tree-cell', style: 'padding-left: ' + (level * 22) + 'px' }, [
+            opts.picker ? el('a', { href: '#', 'class': 's-tree-node-picker s-btn-dir_up' }) : null,
+            checkbox,
+            el('label', { 'for': id }),
+            el('div', { 'class': 's-tree-node-desc-value', text: text })
+        ]);
+        var tr = el('tr', {
+            'class': 's-grid-row s-grid-navig-row',
+            style: opts.hidden ? 'display: none' : ''
+        }, [cell]);
+        if (opts.onchange) { checkbox.addEventListener('change', opts.onchange); }
+        return { tr: tr, checkbox: checkbox, picker: cell.querySelector('a.s-tree-node-picker') };
+    }
+
+    function bindPicker(parent, children) {
+        if (!parent.picker) { return; }
+        parent.picker.addEventListener('click', function (event) {
+            event.preventDefault();
+            var ouvert = parent.picker.classList.contains('s-btn-dir_down');
+            parent.picker.classList.toggle('s-btn-dir_up', ouvert);
+            parent.picker.classList.toggle('s-btn-dir_down', !ouvert);
+            children.forEach(function (child) {
+                child.tr.setAttribute('style', ouvert ? 'display: none' : '');
+            });
+        });
+    }
+
+    function confirmReplace(first) {
+        if (first && window.__mockConfig.replace_popup) {
+            return alertBox('Question',
+                "Voulez-vous remplacer les données avec celles du document d'origine ?", ['Oui', 'Non']);
+        }
+        return Promise.resolve('Oui');
+    }
+
+    // ------------------------------------------------------------------
+    // GESPTH2 - Réceptions
+    // ------------------------------------------------------------------
+
+    function renderReceptions() {
+        var lignes = [];
+        var fournisseur = null;
+        var tree = el('table', { 'class': 's-grid-table-body s-tree-grid' });
+        var lignesBody = el('table', { 'class': 's-grid-table-body' });
+
+        function ajouterLigne(cmd, art) {
+            var valeurs = [String(lignes.length + 1), art.code, art.designation, 'UN', String(art.quantite),
+                String(art.quantite), '', '', '', '', '', '', ''];
+            var inputs = valeurs.map(function (v) {
+                var input = el('input', { type: 'text', 'class': 's-inplace-input' });
+                input.value = v;
+                return input;
+            });
+            lignes.push({ bc: cmd.bc, code: art.code, inputs: inputs });
+            lignesBody.appendChild(el('tr', { 'class': 's-grid-row' }, inputs.map(function (input) {
+                return el('td', {}, [input]);
+            })));
+        }
+
+        function ouvrirSelection() {
+            tree.innerHTML = '';
+            api('GET', '/mock/api/commandes?frs=' + encodeURIComponent(fournisseur || '')).then(function (r) {
+                r.commandes.forEach(function (cmd) {
+                    var children = [];
+                    var parent = treeRow(0, cmd.bc + ' - ' + cmd.date, { picker: true });
+                    tree.appendChild(parent.tr);
+                    cmd.articles.forEach(function (art) {
+                        var child = treeRow(1, art.code + ' ' + art.designation, {
+                            hidden: true,
+                            onchange: function (event) {
+                                if (!event.target.checked) { return; }
+                                confirmReplace(lignes.length === 0).then(function () { ajouterLigne(cmd, art); });
+                            }
+                        });
+                        children.push(child);
+                        tree.appendChild(child.tr);
+                    });
+                    bindPicker(parent, children);
+                });
+            });
+        }
+
+        function nouvelleReception() {
+            content.innerHTML = '';
+            lignes = [];
+            lignesBody.innerHTML = '';
+            tree.innerHTML = '';
+            creationEnCours = true;
+
+            var frs = field('Fournisseur', '2-50-input', {
+                onchange: function (event) {
+                    fournisseur = event.target.value.trim();
+                    api('GET', '/mock/api/commandes?frs=' + encodeURIComponent(fournisseur)).then(function (r) {
+                        if (r.popup) { alertBox('Information', r.popup, ['OK']); }
+                    });
+                }
+            });
+            var date = field('Date réception', '2-52-input');
+            var bl = field('BL fournisseur', '2-54-input');
+            var selection = el('a', { href: '#', title: 'Sélection commandes', text: 'Sélection commandes' });
+            selection.addEventListener('click', function (event) {
+                event.preventDefault();
+                ouvrirSelection();
+            });
+
+            content.appendChild(el('div', { 'class': 's-form' }, [frs.node, date.node, bl.node]));
+            content.appendChild(el('aside', { 'class': 's-selection-panel' }, [selection, tree]));
+            content.appendChild(el('section', { 'class': 's-h1' }, [
+                el('div', { 'class': 's-section-title', text: 'Lignes' }),
+                el('div', { 'class': 's-grid' }, [lignesBody])
+            ]));
+
+            onAction('div.s_page_action_i_save', function () {
+                withSpinner(api('POST', '/mock/api/receptions', {
+                    fournisseur: fournisseur,
+                    date: date.input.value,
+                    bl: bl.input.value,
+                    lignes: lignes.map(function (l) {
+                        return { bc: l.bc, code: l.code, valeurs: l.inputs.map(function (i) { return i.value; }) };
+                    })
+                })).then(function (r) {
+                    if (!r.error) { creationEnCours = false; }
+                    return notifyResult(r, r.error ? null : 'Réception ' + r.numero + ' créée');
+                });
+            });
+        }
+
+        onAction('.s_page_action_add', nouvelleReception);
+        content.appendChild(el('div', { 'class': 's-home', text: 'Réceptions' }));
+    }
+
+    // ------------------------------------------------------------------
+    // GESPIH - Factures
+    // ------------------------------------------------------------------
+
+    function renderFactures() {
+        var fournisseur = null;
+        var selectionnees = [];
+        var tree = el('table', { 'class': 's-grid-table-body s-tree-grid' });
+        var champs = {};
+
+        function ouvrirSelection() {
+            tree.innerHTML = '';
+            selectionnees = [];
+            api('GET', '/mock/api/receptions?frs=' + encodeURIComponent(fournisseur || '')).then(function (r) {
+                var children = [];
+                var parent = treeRow(0, 'Réceptions ' + (fournisseur || ''), { picker: true });
+                tree.appendChild(parent.tr);
+                r.receptions.forEach(function (rec) {
+                    var child = treeRow(1, rec.br + ' ' + rec.montant_ht, {
+                        hidden: true,
+                        onchange: function (event) {
+                            if (!event.target.checked) { return; }
+                            confirmReplace(selectionnees.length === 0).then(function (choice) {
+                                if (choice !== 'Oui') { return; }
+                                selectionnees.push(rec.br);
+                                champs.ht.input.value = rec.montant_ht;
+                                champs.taxe.input.value = rec.taxe;
+                            });
+                        }
+                    });
+                    children.push(child);
+                    tree.appendChild(child.tr);
+                });
+                bindPicker(parent, children);
+            });
+        }
+
+        function nouvelleFacture() {
+            content.innerHTML = '';
+            tree.innerHTML = '';
+            selectionnees = [];
+            creationEnCours = true;
+
+            champs = {
+                type: field('Type', '2-73-input'),
+                fournisseur: field('Fournisseur', '2-81-input', {
+                    onchange: function (event) {
+                        fournisseur = event.target.value.trim();
+                        api('GET', '/mock/api/receptions?frs=' + encodeURIComponent(fournisseur)).then(function (r) {
+                            if (r.popup) { alertBox('Information', r.popup, ['OK']); }
+                        });
+                    }
+                }),
+                ancien: field('Facture d\'origine', '2-85-input'),
+                dff: field('Date facture fournisseur', '2-87-input'),
+                date: field('Date comptable', '2-98-input'),
+                factureFrs: field('Document fournisseur', '2-99-input'),
+                reference: field('Référence interne', '2-111-input'),
+                htSaisi: field('Montant HT saisi', '2-182-input'),
+                ht: field('Montant HT lignes', '2-183-input', { readonly: true }),
+                taxeSaisie: field('Taxes saisies', '2-189-input'),
+                taxe: field('Taxes calculées', '2-190-input', { readonly: true })
+            };
+            var selection = el('a', { href: '#', title: 'Sélection réceptions', text: 'Sélection réceptions' });
+            selection.addEventListener('click', function (event) {
+                event.preventDefault();
+                ouvrirSelection();
+            });
+
+            content.appendChild(el('div', { 'class': 's-form' }, Object.keys(champs).map(function (k) {
+                return champs[k].node;
+            })));
+            content.appendChild(el('aside', { 'class': 's-selection-panel' }, [selection, tree]));
+
+            onAction('.s_page_action_i_save', function () {
+                var valeurs = {};
+                Object.keys(champs).forEach(function (k) { valeurs[k] = champs[k].input.value; });
+                valeurs.receptions = selectionnees;
+                withSpinner(api('POST', '/mock/api/factures', valeurs)).then(function (r) {
+                    if (r.error) { return alertBox('Avertissement', r.error, ['OK']); }
+                    creationEnCours = false;
+                    return alertBox('Information', 'Facture ' + r.numero + ' créée', ['OK']);
+                });
+            });
+        }
+
+        onAction('.s_page_action_add', nouvelleFacture);
+        content.appendChild(el('div', { 'class': 's-home', text: 'Factures' }));
+    }
+
+    // ------------------------------------------------------------------
+    // LETTRAGE
+    // ------------------------------------------------------------------
+
+    function renderLettrage() {
+        var compte = field('Compte', '2-60-input');
+        var code = field('Tiers', '2-62-input');
+        var fixedBody = el('table', { 'class': 's-grid-fixed-table-body' });
+        var scrollBody = el('table', { 'class': 's-grid-table-body' });
+        var ecritures = [];
+
+        function cellInput(value) {
+            var input = el('input', { type: 'text', 'class': 's-inplace-input' });
+            input.value = value || '';
+            return el('td', {}, [input]);
+        }
+
+        function rechercher() {
+            return withSpinner(api('GET', '/mock/api/ecritures?compte=' + encodeURIComponent(compte.input.value.trim())
+                + '&code=' + encodeURIComponent(code.input.value.trim()))).then(function (rows) {
+                ecritures = rows;
+                fixedBody.innerHTML = '';
+                scrollBody.innerHTML = '';
+                rows.forEach(function (e, i) {
+                    var id = 'lett-' + i + '-input';
+                    fixedBody.appendChild(el('tr', { 'class': 's-grid-row' }, [
+                        el('td', {}, [el('input', { type: 'checkbox', id: id })]),
+                        cellInput(e.date), cellInput(e.type), cellInput(e.numero), cellInput(e.lettre)
+                    ]));
+                    scrollBody.appendChild(el('tr', { 'class': 's-grid-row' }, [
+                        cellInput(e.debit), cellInput(e.credit), cellInput(e.lettre ? 'Lettrée' : 'Non lettrée'),
+                        cellInput(e.libelle)
+                    ]));
+                });
+            });
+        }
+
+        var recherche = el('a', { href: '#', title: 'Recherche', text: 'Recherche' });
+        recherche.addEventListener('click', function (event) {
+            event.preventDefault();
+            rechercher();
+        });
+
+        var lettrage = el('a', { href: '#', title: 'Lettrage', 'class': 's-mn-prefer-link', text: 'Lettrage' });
+        lettrage.addEventListener('click', function (event) {
+            event.preventDefault();
+            var numeros = [];
+            fixedBody.querySelectorAll('input[type=checkbox]').forEach(function (cb, i) {
+                if (cb.checked) { numeros.push(ecritures[i].numero); }
+            });
+            withSpinner(api('POST', '/mock/api/lettrage', {
+                compte: compte.input.value.trim(), code: code.input.value.trim(), numeros: numeros
+            })).then(function (r) {
+                if (r.error) { return alertBox('Erreur', r.error, ['OK']); }
+                return alertBox('Information', 'Lettrage ' + r.lettre + ' effectué', ['OK'], true).then(rechercher);
+            });
+        });
+
+        content.appendChild(el('div', { 'class': 's-form' }, [compte.node, code.node, recherche, lettrage]));
+        content.appendChild(el('div', { 'class': 's-grid' }, [fixedBody, scrollBody]));
+    }
+
+    // ------------------------------------------------------------------
+    // Routage selon la fonction Sage (paramètre url=...f=CODE...)
+    // ------------------------------------------------------------------
+
+    var inner = new URLSearchParams(window.location.search).get('url') || '';
+    var match = /f=([A-Z0-9_]+)/.exec(inner);
+    var fonction = match ? match[1] : 'HOME';
+
+    var ecrans = {
+        GESITM: renderArticles,
+        GESPSH: renderDemandesAchat,
+        XBCAUTO: renderGenerationBC,
+        GESPTH2: renderReceptions,
+        GESPTV: renderReceptions,
+        GESPIH: renderFactures,
+        LETTRAGE: renderLettrage
+    };
+
+    api('GET', '/mock/config').then(function (config) {
+        window.__mockConfig = config;
+        content.innerHTML = '';
+        (ecrans[fonction] || renderHome)();
+    });
+})();
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du cache d'articles entre exécutions (utils/article_cache.py)
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.article_cache import ArticleCache
+
+VALEURS = {'fournisseur': 'T1000', 'montant': '580.90', 'marque': 'SIEGE', 'affaire': ''}
+
+
+def test_confirmation_persistee_entre_executions(tmp_path):
+    path = tmp_path / 'articles.json'
+    ArticleCache(path, ttl=3600).confirmer('A01366', **VALEURS)
+
+    cache = ArticleCache(path, ttl=3600)
+    assert cache.est_a_jour('A01366', **dict(VALEURS, montant='580,9', marque='siege'))
+    assert not cache.est_a_jour('A01366', **dict(VALEURS, montant='600'))
+    assert not cache.est_a_jour('A99999', **VALEURS)
+
+
+def test_entree_expiree(tmp_path):
+    path = tmp_path / 'articles.json'
+    ArticleCache(path, ttl=3600).confirmer('A01366', **VALEURS)
+    entrees = json.loads(path.read_text(encoding='utf-8'))
+    entrees['A01366']['confirme_le'] = time.time() - 7200
+    path.write_text(json.dumps(entrees), encoding='utf-8')
+
+    assert not ArticleCache(path, ttl=3600).est_a_jour('A01366', **VALEURS)
+
+
+def test_invalidation_et_desactivation(tmp_path):
+    path = tmp_path / 'articles.json'
+    cache = ArticleCache(path, ttl=3600)
+    cache.confirmer('A01366', **VALEURS)
+    cache.invalider('A01366')
+
+    assert not ArticleCache(path, ttl=3600).est_a_jour('A01366', **VALEURS)
+
+    inactif = ArticleCache(tmp_path / 'autre.json', ttl=0)
+    inactif.confirmer('A01366', **VALEURS)
+    assert not inactif.est_a_jour('A01366', **VALEURS)
+    assert not (tmp_path / 'autre.json').exists()
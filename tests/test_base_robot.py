@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de BaseRobot : connexion Sage anticipée pendant la lecture de l'Excel
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.base_robot import BaseRobot
+
+
+class ConnecteurLent:
+    """Connecteur Sage factice : la connexion prend `duree` secondes"""
+
+    def __init__(self, duree: float = 0.3, succes: bool = True):
+        self.duree = duree
+        self.succes = succes
+        self.is_connected = False
+        self.thread_connexion = None
+        self.connexions = 0
+        self.deconnexions = 0
+
+    def connect(self) -> bool:
+        self.thread_connexion = threading.current_thread()
+        time.sleep(self.duree)
+        self.connexions += 1
+        self.is_connected = self.succes
+        return self.succes
+
+    def disconnect(self):
+        self.deconnexions += 1
+        self.is_connected = False
+
+
+class RobotTest(BaseRobot):
+    def __init__(self, connecteur):
+        super().__init__('test')
+        self.sage_connector = connecteur
+        self.journal = []
+
+    def execute(self, lecture: float = 0.3):
+        time.sleep(lecture)  # lecture de l'Excel
+        self.journal.append(('lecture_terminee', self.sage_connector.connexions))
+        self.journal.append(('connexion', self.connect_sage()))
+        return 'ok'
+
+
+def test_connexion_en_parallele_de_la_lecture():
+    connecteur = ConnecteurLent(duree=0.4)
+    robot = RobotTest(connecteur)
+
+    debut = time.perf_counter()
+    assert robot.run(lecture=0.4) == 'ok'
+    duree = time.perf_counter() - debut
+
+    assert duree < 0.75
+    assert connecteur.connexions == 1
+    assert connecteur.thread_connexion is not threading.main_thread()
+    assert robot.journal[-1] == ('connexion', True)
+    assert connecteur.deconnexions == 1
+
+
+def test_echec_lecture_attend_la_connexion_avant_nettoyage():
+    connecteur = ConnecteurLent(duree=0.2, succes=False)
+    robot = RobotTest(connecteur)
+    robot.execute = lambda: 1 / 0
+
+    try:
+        robot.run()
+    except ZeroDivisionError:
+        pass
+
+    assert connecteur.connexions == 1
+    assert connecteur.deconnexions == 1
+    assert robot._connexion_anticipee is None
+
+
+def test_connect_sage_sans_run_reste_synchrone():
+    connecteur = ConnecteurLent(duree=0.0)
+    robot = RobotTest(connecteur)
+
+    assert robot.connect_sage() is True
+    assert connecteur.thread_connexion is threading.main_thread()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des outils de benchmark (jeux de données, instrumentation, contrôle de régression)
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from benchmarks.datasets import generer_dataset
+from benchmarks.gate import charger_baseline, cle, comparer, comparer_profils, sauvegarder_baseline
+from benchmarks.instrumentation import instrumenter
+
+
+def test_dataset_bonne_commande_coherent_avec_le_serveur(tmp_path):
+    excel_path, data = generer_dataset('bonne_commande', 40, tmp_path)
+    df = pd.read_excel(excel_path)
+
+    assert len(df) == 40
+    assert df['Code_Fournisseur'].nunique() == 2
+    assert {d['numero'] for d in data['das']} == set(df['Numero_DA'])
+
+
+def test_instrumentation_sleep_et_resultats():
+    class RobotFactice:
+        def __init__(self):
+            self.resultats = []
+
+        def add_result(self, result):
+            self.resultats.append(result)
+
+    robot = RobotFactice()
+    with instrumenter(robot) as probe:
+        time.sleep(0.01)
+        robot.add_result({'statut': 'Succes'})
+        robot.add_result({'statut': 'Succes'})
+
+    resume = probe.summary(rows=2)
+
+    assert robot.resultats == [{'statut': 'Succes'}, {'statut': 'Succes'}]
+    assert 'add_result' not in vars(robot)
+    assert resume['work_units'] == 2
+    assert resume['slept_seconds_per_row'] >= 0.005
+    assert resume['rows_per_minute'] > 0
+
+
+def test_controle_regression(tmp_path):
+    reference = {'robot': 'lettrage', 'rows': 10, 'rows_per_minute': 60.0, 'p95_row_seconds': 2.0,
+                 'webdriver_calls_per_row': 40, 'slept_seconds_per_row': 5.0, 'error': None}
+    baseline_path = sauvegarder_baseline(tmp_path / 'baseline.json', [reference])
+    baseline = charger_baseline(baseline_path)
+
+    assert comparer([dict(reference, rows_per_minute=58.0)], baseline) == []
+    regressions = comparer([dict(reference, rows_per_minute=40.0, webdriver_calls_per_row=60)], baseline)
+
+    assert len(regressions) == 2
+    assert any('rows_per_minute' in r for r in regressions)
+    assert comparer([dict(reference, rows=100)], baseline) == []
+
+
+def test_comparaison_des_profils_chrome():
+    standard = {'robot': 'facturation', 'rows': 10, 'rows_per_minute': 50.0, 'p95_row_seconds': 3.0,
+                'browser_profile': 'standard', 'error': None}
+    performance = dict(standard, rows_per_minute=75.0, p95_row_seconds=2.0, browser_profile='performance')
+
+    assert cle(standard) == 'facturation/10'
+    assert cle(performance) == 'facturation/10/performance'
+    assert comparer_profils([standard, performance]) == [
+        'facturation/10/performance: 50.0 → 75.0 lignes/min (+50%), p95 3.0s → 2.0s'
+    ]
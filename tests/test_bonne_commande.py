@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du robot Bonne de Commande : mode lot et écriture différentielle des articles
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+import pytest
+
+from modules.bonne_commande.bonne_commande_robot import BonneCommandeRobot, attribuer_bc, champs_a_modifier
+
+
+def test_attribuer_bc_par_fournisseur():
+    lignes = [
+        ('BC100001 - T1000', 'BC100001 - T1000'),
+        ('BC100002', 'BC100002 T10001 Fournisseur'),
+        ('BC100001 - T1000', 'BC100001 - T1000'),
+        ('BC100003', 'ligne sans fournisseur'),
+        ('', 'vide'),
+    ]
+
+    bc, non_attribues = attribuer_bc(lignes, ['T1000', 'T10001'])
+
+    assert bc == {'T1000': ['100001'], 'T10001': ['100002']}
+    assert non_attribues == ['100003']
+    assert attribuer_bc([('BC7', 'BC7')], ['T1'])[0] == {'T1': ['7']}
+
+
+def test_mode_lot_strict_par_fournisseur_et_generation_unique():
+    robot = BonneCommandeRobot(mode='lot')
+    robot.web_endpoint_config = dict(robot.web_endpoint_config, enabled=False)
+    appels = []
+
+    def articles(data):
+        appels.append(('articles', data['fournisseur']))
+        robot.articles_traites = 2
+        return data['fournisseur'] != 'T2'
+
+    def das(data):
+        appels.append(('das', data['fournisseur']))
+        robot.das_traitees = 1
+        return data['fournisseur'] != 'T3'
+
+    def generation(codes):
+        appels.append(('generation', tuple(codes)))
+        return {'T1': ['101'], 'T4': ['104']}
+
+    robot._traiter_tous_articles = articles
+    robot._traiter_toutes_das = das
+    robot._generer_bons_de_commande_lot = generation
+
+    fournisseurs = {code: {'fournisseur': code} for code in ('T1', 'T2', 'T3', 'T4')}
+    robot._traiter_par_lot(fournisseurs, '')
+
+    assert appels == [
+        ('articles', 'T1'), ('articles', 'T2'), ('articles', 'T3'), ('articles', 'T4'),
+        ('das', 'T1'), ('das', 'T3'), ('das', 'T4'),
+        ('generation', ('T1', 'T4')),
+    ]
+    bilans = {r['fournisseur']: r for r in robot.resultats if r['type'] == 'BILAN_FINAL'}
+    assert bilans['T1']['statut'] == 'SUCCES' and bilans['T1']['bc_numbers'] == ['101']
+    assert bilans['T2']['phase'] == 'Articles' and bilans['T2']['statut'] == 'ECHEC'
+    assert bilans['T3']['phase'] == 'Demandes_Achat' and bilans['T3']['das_traitees'] == 1
+    assert bilans['T4']['articles_traites'] == 2 and bilans['T4']['bc_numbers'] == ['104']
+
+
+def test_champs_a_modifier_ignore_les_valeurs_identiques():
+    actuelles = {'BC Auto.': True, 'Fournisseur': 'T1000 ', 'Affaire': '', 'Prix': '1 234,50', 'Marque': 'siege'}
+
+    assert champs_a_modifier(actuelles, 'T1000', '1234.5', 'SIEGE', '') == []
+    assert champs_a_modifier(actuelles, 'T1000', '1234.5', 'SIEGE', 'AFF01') == ['Affaire']
+    assert champs_a_modifier(dict(actuelles, **{'BC Auto.': False}), 'T2000', '99', 'SIEGE', '') == [
+        'BC Auto.', 'Fournisseur', 'Prix']
+    assert champs_a_modifier({}, 'T1000', '10', 'SIEGE', '') == ['BC Auto.', 'Fournisseur', 'Prix', 'Marque']
+
+
+class Element:
+    """Élément (et driver) factice : toute recherche renvoie un élément cliquable"""
+
+    def find_element(self, *args):
+        return self
+
+    def click(self):
+        pass
+
+    clear = click
+
+    def send_keys(self, *args):
+        pass
+
+
+def test_article_inchange_sans_enregistrement():
+    robot = BonneCommandeRobot()
+    robot.lire_valeurs_par_labels = lambda labels: {
+        'BC Auto.': True, 'Fournisseur': 'T1000', 'Affaire': 'AFF01', 'Prix': '580,9', 'Marque': 'SIEGE'}
+    robot.enregistrer_article = lambda: pytest.fail("aucun enregistrement attendu")
+    robot.driver_manager.driver = Element()
+
+    resultat = robot.traiter_article('A01366', 'T1000', '580.90', 'SIEGE', 'AFF01')
+
+    assert resultat['statut'] == 'Inchangé'
+    robot.add_result(resultat)
+    assert robot.generate_summary()['succes'] == 1
+    assert robot.generate_summary()['inchanges'] == 1
+
+
+def test_tarif_refuse_detecte_par_les_popups_affichees():
+    robot = BonneCommandeRobot()
+    robot.lire_valeurs_par_labels = lambda labels: {
+        'BC Auto.': True, 'Fournisseur': 'T1000', 'Affaire': 'AFF01', 'Prix': '10', 'Marque': 'SIEGE'}
+    robot.enregistrer_article = lambda: pytest.fail("aucun enregistrement attendu")
+    robot.driver_manager.driver = Element()
+    robot.labels.localiser = lambda label: ('id', label)
+    robot.form_filler.remplir = lambda champs, verifier=True: None
+    robot.handle_error_with_screenshot = lambda **kwargs: {'screenshot': None}
+    robot.driver_manager.read_alerts = lambda: [{'titre': 'Erreur', 'message': 'Tarif hors plage'}]
+
+    resultat = robot.traiter_article('A01366', 'T1000', '580.90', 'SIEGE', 'AFF01')
+
+    assert resultat['statut'] == 'Echec'
+    assert 'Tarif hors plage' in resultat['message']
+
+
+def test_mode_lot_bilans_gardent_l_erreur_de_generation():
+    robot = BonneCommandeRobot(mode='lot')
+    envois = []
+    robot.save_report = lambda **kwargs: None
+    robot.send_results_to_web = lambda email: envois.append((robot.error_screenshot, list(robot.popup_messages)))
+    robot._traiter_tous_articles = lambda data: True
+    robot._traiter_toutes_das = lambda data: True
+
+    def generation(codes):
+        robot.error_screenshot = 'capture-generation'
+        robot.popup_messages.append({'message': 'Génération impossible'})
+        return {}
+
+    robot._generer_bons_de_commande_lot = generation
+
+    robot._traiter_par_lot({code: {'fournisseur': code} for code in ('T1', 'T2')}, '')
+
+    assert envois == [('capture-generation', [{'message': 'Génération impossible'}])] * 2
+
+
+def test_mode_fournisseur_bilans_au_meme_format_que_le_lot():
+    robot = BonneCommandeRobot(mode='fournisseur')
+    robot.web_endpoint_config = dict(robot.web_endpoint_config, enabled=False)
+    bilans = []
+    robot.save_report = lambda **kwargs: bilans.append(robot.resultats[-1])
+    robot._lire_et_valider_excel = lambda fichier: pd.DataFrame({'email_expediteur': ['achat@exemple.fr']})
+    robot._regrouper_donnees = lambda df: {code: {'fournisseur': code} for code in ('T1', 'T2')}
+    robot._afficher_resume = lambda fournisseurs: None
+    robot.connect_sage = robot.disconnect_sage = lambda: None
+    robot.modules.fermer_tout = lambda: None
+    robot._traiter_tous_articles = lambda data: data['fournisseur'] == 'T1'
+    robot._traiter_toutes_das = lambda data: True
+    robot._generer_bon_de_commande = lambda data: ['101']
+
+    robot.execute('bc.xlsx')
+
+    assert [(b['fournisseur'], b['phase'], b['statut']) for b in bilans] == [
+        ('T1', 'Complete', 'SUCCES'), ('T2', 'Articles', 'ECHEC')]
+    assert bilans[0]['bc_numbers'] == ['101'] and 'bc_numbers' not in bilans[1]
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des profils Chrome isolés par session (core/chrome_profiles.py)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.chrome_profiles import ChromeProfilePool
+
+
+def _modele(tmp_path):
+    modele = tmp_path / 'modele'
+    (modele / 'Default' / 'Cache').mkdir(parents=True)
+    (modele / 'Default' / 'Cache' / 'syracuse.js').write_text('cache', encoding='utf-8')
+    (modele / 'SingletonLock').write_text('hote-1234', encoding='utf-8')
+    return modele
+
+
+def test_profils_distincts_copies_du_modele_sans_verrou(tmp_path):
+    pool = ChromeProfilePool(_modele(tmp_path), racine=tmp_path / 'sessions', recycler=0)
+
+    premier, second = pool.allouer(), pool.allouer()
+
+    assert premier != second
+    for profil in (premier, second):
+        assert (profil / 'Default' / 'Cache' / 'syracuse.js').read_text(encoding='utf-8') == 'cache'
+        assert not (profil / 'SingletonLock').exists()
+
+    pool.liberer(premier)
+    assert not premier.exists()
+
+
+def test_profil_recycle_puis_reutilise(tmp_path):
+    pool = ChromeProfilePool(_modele(tmp_path), racine=tmp_path / 'sessions', recycler=1)
+    profil = pool.allouer()
+    (profil / 'Default' / 'Cookies').write_text('session', encoding='utf-8')
+    (profil / 'SingletonLock').write_text('hote-1234', encoding='utf-8')
+
+    pool.liberer(profil)
+    libres = list((tmp_path / 'sessions').glob('libre-*'))
+    assert len(libres) == 1 and not (libres[0] / 'SingletonLock').exists()
+
+    reutilise = pool.allouer()
+    assert (reutilise / 'Default' / 'Cookies').exists()
+    assert not list((tmp_path / 'sessions').glob('libre-*'))
+
+
+def test_profils_orphelins_supprimes(tmp_path):
+    racine = tmp_path / 'sessions'
+    orphelin = racine / 'actif-999999999-abcd1234'
+    orphelin.mkdir(parents=True)
+
+    ChromeProfilePool(None, racine=racine).allouer()
+
+    assert not orphelin.exists()
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des primitives groupées window.__rpa exposées par DriverManager
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.driver_manager import JS_APPEL_RPA, PERFORMANCE, RPA_ABSENT, RPA_HELPERS_JS, STANDARD, DriverManager
+
+
+class PageFactice:
+    """Driver minimal : window.__rpa absent tant que la bibliothèque n'est pas injectée"""
+
+    def __init__(self, grilles):
+        self.grilles = grilles
+        self.injectee = False
+        self.appels = 0
+
+    def execute_script(self, script, *args):
+        self.appels += 1
+        if script == RPA_HELPERS_JS:
+            self.injectee = True
+            return None
+        assert script == JS_APPEL_RPA
+        if not self.injectee:
+            return RPA_ABSENT
+        methode, arguments = args
+        if methode == 'readGrid':
+            return self.grilles[arguments[0]]
+        if methode == 'tickCheckboxes':
+            return {'coches': [i for i in arguments[0] if i != 'x'], 'deja': [], 'absents': ['x']}
+
+    def navigate(self):
+        self.injectee = False
+
+
+def _manager(driver):
+    manager = DriverManager(headless=True)
+    manager.driver = driver
+    return manager
+
+
+def test_bibliotheque_injectee_une_fois_par_page():
+    driver = PageFactice({'tr': [{'index': 0, 'valeurs': ['a']}]})
+    manager = _manager(driver)
+
+    assert manager.read_grid('tr') == [{'index': 0, 'valeurs': ['a']}]
+    assert driver.appels == 3  # appel, injection, nouvel appel
+    manager.read_grid('tr')
+    assert driver.appels == 4
+
+    driver.navigate()
+    assert manager.tick_checkboxes(['cb1', 'x']) == {'coches': ['cb1'], 'deja': [], 'absents': ['x']}
+    assert driver.appels == 7
+
+
+def test_extraction_ecritures_lettrage_en_deux_lectures():
+    from modules.lettrage.lettrage_robot import LettrageRobot
+
+    fixe = [
+        {'checkbox_id': 'cb1', 'valeurs': ['01/01/25', 'FAC', 'F001', '']},
+        {'checkbox_id': None, 'valeurs': []},
+        {'checkbox_id': 'cb3', 'valeurs': ['02/01/25', 'REG', 'AV01', 'A']},
+    ]
+    defilante = [
+        {'valeurs': ['1 200,50', '', 'Non lettré', 'Facture']},
+        {'valeurs': []},
+        {'valeurs': ['', '1200.5', 'Lettré', 'Règlement']},
+    ]
+    driver = PageFactice({
+        '.s-grid-fixed-table-body tr.s-grid-row': fixe,
+        '.s-grid-table-body tr.s-grid-row': defilante,
+    })
+    robot = LettrageRobot()
+    robot.driver_manager = _manager(driver)
+
+    ecritures = robot.extraire_ecritures()
+
+    assert [e['index'] for e in ecritures] == [1, 3]
+    assert ecritures[0]['debit'] == 1200.5 and ecritures[0]['numero'] == 'F001'
+    assert ecritures[1]['credit'] == 1200.5 and ecritures[1]['lettre'] == 'A'
+    assert driver.appels == 4
+
+
+class JournalFactice(PageFactice):
+    """Page dont l'observateur a relevé des popups (journal remis à zéro à chaque page)"""
+
+    def __init__(self):
+        super().__init__({})
+        self.journal = []
+
+    def execute_script(self, script, *args):
+        if script == JS_APPEL_RPA and self.injectee and args[0] == 'alertLog':
+            self.appels += 1
+            return self.journal[args[1][0]:]
+        return super().execute_script(script, *args)
+
+    def navigate(self):
+        super().navigate()
+        self.journal = []
+
+
+def test_journal_des_popups_consulte_sans_doublon():
+    driver = JournalFactice()
+    manager = _manager(driver)
+    driver.injectee = True
+    driver.journal = [{'seq': 1, 'message': 'Tarif invalide'}, {'seq': 2, 'message': 'Ligne modifiée'}]
+
+    assert [p['seq'] for p in manager.new_alerts()] == [1, 2]
+    assert manager.new_alerts() == []
+
+    driver.navigate()
+    driver.journal = [{'seq': 1, 'message': 'Fournisseur bloqué'}]
+    assert [p['message'] for p in manager.new_alerts()] == ['Fournisseur bloqué']
+
+
+class SpinnerFactice:
+    """Spinner affiché pendant un nombre donné de tranches d'attente"""
+
+    def __init__(self, tranches_visibles):
+        self.tranches_visibles = tranches_visibles
+        self.tranches = []
+        self.script_timeout = 30
+
+    def set_script_timeout(self, timeout):
+        self.script_timeout = timeout
+
+    def execute_async_script(self, script, methode, arguments):
+        assert methode == 'waitSpinner'
+        self.tranches.append(arguments[0])
+        return {'visible': len(self.tranches) <= self.tranches_visibles, 'duree': arguments[0]}
+
+
+def test_attente_spinner_par_tranches_avec_progression_et_echeance():
+    progression = []
+    driver = SpinnerFactice(tranches_visibles=2)
+    manager = _manager(driver)
+
+    assert manager.wait_spinner(timeout=60, progress=progression.append, chunk=0.01)
+    assert len(driver.tranches) == 3 and len(progression) == 2
+    assert driver.script_timeout == manager.script_timeout  # timeout du driver restauré
+
+    driver = SpinnerFactice(tranches_visibles=10 ** 6)
+    manager = _manager(driver)
+    assert not manager.wait_spinner(timeout=0.05, chunk=0.01)
+    assert driver.tranches[-1] <= 10  # dernière tranche bornée par l'échéance
+
+
+class OngletsCdp:
+    """Driver minimal : commandes DevTools reçues par onglet"""
+
+    def __init__(self):
+        self.current_window_handle = 'onglet-0'
+        self.commandes = []
+        self.switch_to = self
+
+    def new_window(self, type_hint):
+        self.current_window_handle = 'onglet-1'
+
+    def execute_cdp_cmd(self, commande, parametres):
+        self.commandes.append((self.current_window_handle, commande))
+
+
+def test_profil_performance_applique_a_chaque_onglet(tmp_path):
+    manager = DriverManager(headless=True, profile_path=str(tmp_path), browser_profile=PERFORMANCE)
+    options = manager._get_chrome_options()
+    assert options.page_load_strategy == 'eager'
+    assert any(a.startswith('--window-size=') for a in options.arguments)
+    assert options.experimental_options['prefs']['profile.managed_default_content_settings.images'] == 2
+
+    manager.driver = OngletsCdp()
+    manager._appliquer_profil_onglet()
+    manager.new_tab()
+    assert [c for o, c in manager.driver.commandes if o == 'onglet-1'] == \
+        ['Network.enable', 'Network.setBlockedURLs', 'Page.addScriptToEvaluateOnNewDocument']
+
+    standard = DriverManager(headless=True, profile_path=str(tmp_path), browser_profile=STANDARD)
+    assert standard._get_chrome_options().page_load_strategy == 'normal'
+    standard.driver = OngletsCdp()
+    standard.new_tab()
+    assert standard.driver.commandes == []
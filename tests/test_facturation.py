@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du robot Facturation : sélection des réceptions et mode session
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from modules.facturation.FacturationRobot import FacturationRobot, ordonner_par_fournisseur, trouver_reception
+
+
+def _ligne(index, niveau, texte, visible=True):
+    return {'index': index, 'niveau': niveau, 'texte': texte, 'visible': visible,
+            'checkbox_id': f'sel-{index}-input', 'coche': False, 'replie': None, 'valeurs': []}
+
+
+def test_reception_et_parent_depuis_une_photo():
+    lignes = [
+        _ligne(0, 0, 'T1000 - Fournisseur A'),
+        _ligne(1, 1, 'BR100 - 01/01/2025', visible=False),
+        _ligne(2, 1, 'BR101 - 02/01/2025', visible=False),
+        _ligne(3, 0, 'T2000 - Fournisseur B'),
+        _ligne(4, 1, 'BR200 - 03/01/2025'),
+    ]
+
+    ligne, parent = trouver_reception(lignes, 'BR101')
+    assert (ligne['index'], parent['index']) == (2, 0)  # le parent, pas la ligne précédente
+
+    ligne, parent = trouver_reception(lignes, 'BR200')
+    assert (ligne['index'], parent['index']) == (4, 3)
+    assert trouver_reception(lignes, 'BR999') == (None, None)
+
+
+def test_mode_session_recharge_seulement_apres_erreur():
+    robot = FacturationRobot(mode='session')
+    robot.save_report = lambda **kwargs: None
+    appels = []
+
+    robot.navigate_to_module = lambda url: appels.append('navigation') or True
+    robot._page_prete = lambda: True
+
+    def traiter(url, code, facture, dff, date, br, nom):
+        appels.append(br)
+        return {'codeFournisseur': code, 'statut': 'Echec' if br == 'BR2' else 'Succes'}
+
+    robot.traiter_fournisseur = traiter
+    df = pd.DataFrame({
+        'Code': ['T1', 'T2', 'T1', 'T2'], 'Nom': ['A', 'B', 'A', 'B'], 'FactureFrs': ['1', '2', '3', '4'],
+        'DFF': ['01/01/2025'] * 4, 'Date': ['02/01/2025'] * 4, 'BR': ['BR1', 'BR2', 'BR3', 'BR4'],
+    })
+
+    robot._traiter_session(df, 'url')
+
+    # T1 regroupé avant T2 ; rechargement uniquement après l'échec de BR2
+    assert appels == ['navigation', 'BR1', 'BR3', 'BR2', 'navigation', 'BR4']
+    assert [r['statut'] for r in robot.resultats] == ['Succes', 'Succes', 'Echec', 'Succes']
+    assert [l['BR'] for l in ordonner_par_fournisseur(df.to_dict('records'))] == ['BR1', 'BR3', 'BR2', 'BR4']
+
+
+def test_popup_fournisseur_deja_vu_attendue_brievement():
+    robot = FacturationRobot()
+    attentes = []
+
+    class FauxDriverManager:
+        def wait_alert(self, timeout=5, quiet=0.3):
+            attentes.append((timeout, quiet))
+            return [{'message': 'Fournisseur bloqué'}] if len(attentes) == 2 else []
+
+        def read_alerts(self):
+            raise AssertionError("lecture immédiate: la popup asynchrone serait manquée")
+
+        def click_alert_button(self, libelles):
+            return {'titre': 'Information', 'bouton': 'OK', 'message': 'Fournisseur bloqué'}
+
+    robot.driver_manager = FauxDriverManager()
+
+    assert robot.gere_popup_info('T1') is None
+    assert robot.gere_popup_info('T1') == 'Fournisseur bloqué'
+    assert attentes == [(3, 0.3), (1.5, 0.15)]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des générateurs de fichiers synthétiques (tests/fixtures/generators.py)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from tests.fixtures.generators import (
+    COLONNES_VIDABLES, generer_bonne_commande, generer_excel, generer_facturation,
+    generer_lettrage, generer_receiption,
+)
+
+COLONNES_BONNE_COMMANDE = ['Numero_DA', 'Acheteur', 'Code_Fournisseur', 'Email_Fournisseur', 'TEL_Fournisseu',
+                           'Code_Article', 'Montant', 'Marque', 'Affaire', 'email_expediteur']
+COLONNES_RECEIPTION = ['CodeFrs', 'BLFrs', 'DateBC', 'N_BC', 'CodeArticle', 'Quantite',
+                       'N_B_transport', 'Matricule', 'Poids', 'Marque']
+
+
+def test_schemas_des_modules():
+    assert list(generer_bonne_commande(10).columns) == COLONNES_BONNE_COMMANDE
+    assert set(COLONNES_RECEIPTION) <= set(generer_receiption(10).columns)
+    assert set(generer_lettrage(10).columns) >= {'Compte', 'Code', 'Facture', 'N-Avis', 'Nom'}
+    assert set(generer_facturation(10).columns) >= {'Code', 'DFF', 'FactureFrs', 'Date', 'BR'}
+
+
+def test_distribution_fournisseurs_et_das():
+    df = generer_bonne_commande(2000, fournisseurs=25, das_par_fournisseur=3, seed=1)
+
+    assert df['Code_Fournisseur'].nunique() == 25
+    das_par_frs = df.groupby('Code_Fournisseur')['Numero_DA'].nunique()
+    assert das_par_frs.max() <= 3
+    # Une DA n'appartient qu'à un seul fournisseur
+    assert df.groupby('Numero_DA')['Code_Fournisseur'].nunique().max() == 1
+
+
+def test_doublons_et_vides():
+    df = generer_receiption(5000, taux_doublons=0.1, taux_vides=0.05, seed=2)
+
+    assert len(df) == 5000
+    assert df.duplicated().sum() > 0
+    taux = df[COLONNES_VIDABLES['receiption']].isna().mean()
+    assert ((taux > 0.03) & (taux < 0.07)).all()
+
+
+def test_reproductible_et_grande_echelle():
+    a = generer_lettrage(100000, seed=3)
+    b = generer_lettrage(100000, seed=3)
+
+    assert len(a) == 100000
+    pd.testing.assert_frame_equal(a, b)
+
+
+def test_ecriture_excel(tmp_path):
+    path = generer_excel('facturation', 50, tmp_path / 'facturation.xlsx', fournisseurs=5)
+    df = pd.read_excel(path)
+
+    assert len(df) == 50
+    assert df['Code'].nunique() == 5
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du moteur de saisie groupée (core/form_filler.py)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from core.driver_manager import DriverManager
+from core.form_filler import JS_APPLIQUER, JS_LIRE, SCRIPT, FormField, FormFiller
+
+
+class Input:
+    def __init__(self, formulaire, identifiant, valeur=''):
+        self.formulaire = formulaire
+        self.identifiant = identifiant
+        self.valeur = valeur
+
+    def click(self):
+        self.formulaire.appels.append(('click', self.identifiant))
+
+    def send_keys(self, *touches):
+        self.formulaire.appels.append(('send_keys', self.identifiant))
+        texte = ''.join(touches)
+        assert texte.startswith(Keys.CONTROL + 'a' + Keys.NULL) and texte.endswith(Keys.TAB)
+        self.valeur = self.formulaire.reformater(self.identifiant, texte[3:-1])
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+class FormulaireFactice:
+    """Driver minimal : inputs par id, scripts de saisie et de lecture simulés"""
+
+    def __init__(self, *identifiants):
+        self.inputs = {i: Input(self, i) for i in identifiants}
+        self.appels = []
+        self.reformater = lambda identifiant, valeur: valeur
+
+    def find_element(self, by, value):
+        if by == By.ID and value in self.inputs:
+            return self.inputs[value]
+        raise NoSuchElementException(value)
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, methode, arguments):
+        self.appels.append(('spinner', methode))
+        return {'visible': False, 'duree': 0}
+
+    def execute_script(self, script, champs):
+        self.appels.append(('script', len(champs)))
+        if script == JS_APPLIQUER:
+            absents = []
+            for champ in champs:
+                if champ['cible']['value'] not in self.inputs:
+                    absents.append(champ['nom'])
+                    continue
+                self.inputs[champ['cible']['value']].valeur = champ['valeur']
+            return absents
+        assert script == JS_LIRE
+        return [self.inputs[c['value']].valeur if c['value'] in self.inputs else None for c in champs]
+
+
+def _filler(driver):
+    manager = DriverManager(headless=True)
+    manager.driver = driver
+    return FormFiller(manager, timeout=1)
+
+
+def test_champs_script_groupes_et_relecture_unique():
+    driver = FormulaireFactice('type', 'frs', 'ref1', 'ref2', 'ref3')
+
+    ecarts = _filler(driver).remplir([
+        FormField((By.ID, 'type'), 'FAC', synchro=True),
+        FormField((By.ID, 'frs'), 'T1000'),
+        FormField((By.ID, 'ref1'), 'F-01', strategie=SCRIPT),
+        FormField((By.ID, 'ref2'), 'F-01', strategie=SCRIPT),
+        FormField((By.ID, 'ref3'), 'F-01', strategie=SCRIPT),
+    ])
+
+    assert ecarts == {}
+    assert driver.appels == [
+        ('click', 'type'), ('send_keys', 'type'), ('spinner', 'waitSpinner'),
+        ('click', 'frs'), ('send_keys', 'frs'),
+        ('script', 3),  # trois champs en un seul appel
+        ('script', 5),  # relecture
+    ]
+
+
+def test_relecture_signale_les_ecarts_et_compare_les_nombres():
+    driver = FormulaireFactice('prix', 'marque')
+    driver.reformater = lambda identifiant, valeur: '1 234,500' if identifiant == 'prix' else 'AUTRE'
+
+    ecarts = _filler(driver).remplir([
+        FormField((By.ID, 'prix'), '1234.5', numerique=True),
+        FormField((By.ID, 'marque'), 'SIEGE', nom='Marque'),
+    ])
+
+    assert ecarts == {'Marque': ('SIEGE', 'AUTRE')}
+
+
+def test_champ_script_introuvable():
+    driver = FormulaireFactice('ref1')
+
+    with pytest.raises(NoSuchElementException, match='absent'):
+        _filler(driver).remplir([
+            FormField((By.ID, 'ref1'), 'X', strategie=SCRIPT),
+            FormField((By.ID, 'inconnu'), 'X', strategie=SCRIPT, nom='absent'),
+        ])
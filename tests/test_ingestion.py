@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de la couche d'ingestion vectorisée (utils/ingestion.py)
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.fixtures.generators import generer_bonne_commande, generer_lettrage
+from utils.excel_handler import ExcelHandler
+from utils.ingestion import (
+    formater_dates, lire_excel_module, lire_excel_module_par_lots,
+    regrouper_fournisseur_bc, regrouper_fournisseur_da,
+)
+
+
+def _ecrire(tmp_path, df, nom='entree.xlsx'):
+    path = tmp_path / nom
+    df.to_excel(path, index=False)
+    return str(path)
+
+
+def test_lecture_bonne_commande_lignes_vides_et_textes(tmp_path):
+    df = generer_bonne_commande(6, fournisseurs=2, seed=0)
+    df['Montant'] = [120, 80, np.nan, 95, 60, 45]
+    df.loc[4, 'Marque'] = '   '
+    df['Colonne_Inutile'] = 'x'
+
+    lu = lire_excel_module(_ecrire(tmp_path, df), 'bonne_commande')
+
+    assert list(lu.index) == [0, 1, 3, 5]
+    assert lu.loc[0, 'Montant'] == '120'
+    assert 'Colonne_Inutile' not in lu.columns
+    assert (lu['Affaire'].notna()).all()
+
+
+def test_colonnes_requises_manquantes(tmp_path):
+    path = _ecrire(tmp_path, pd.DataFrame({'Compte': ['44110000'], 'Code': ['T1']}))
+
+    with pytest.raises(ValueError, match='Colonnes manquantes'):
+        lire_excel_module(path, 'lettrage')
+
+
+def test_dates_converties_en_bloc(tmp_path):
+    serie = pd.Series(['2026-01-06 00:00:00', '23/05/2025', '2025-12-31', 'inconnue'])
+    assert list(formater_dates(serie)) == ['06/01/2026', '23/05/2025', '31/12/2025', 'inconnue']
+
+    df = pd.DataFrame({
+        'CodeFrs': ['T6664', 'T6664', 'T3581'], 'BLFrs': ['FN°0037/2025'] * 3,
+        'DateBC': [datetime(2025, 5, 23), datetime(2025, 5, 23), '01/11/2021'],
+        'N_BC': ['BC186553', 'BC186553', 'BC165170'], 'CodeArticle': [' A15007', 'A15884', 'A12585'],
+        'Quantite': [1, 2, 1], 'N_B_transport': ['FN°0037/2025', None, 'FN°0065/2025'],
+        'Matricule': ['XX', 'XX', None], 'Poids': [0.01, 0.01, 0.5], 'Marque': ['LEASING', 'LEASING', 'ETUDE'],
+    })
+    structure = regrouper_fournisseur_bc(lire_excel_module(_ecrire(tmp_path, df), 'receiption'))
+
+    assert list(structure) == ['T6664', 'T3581']
+    assert structure['T6664']['date_bc'] == '23/05/2025'
+    assert structure['T3581']['date_bc'] == '01/11/2021'
+    articles = structure['T6664']['bons_commande']['BC186553']['articles']
+    assert articles[0] == {'code': 'A15007', 'quantite': '1', 'n_b_transport': 'FN°0037/2025',
+                           'matricule': 'XX', 'poids': '0.01', 'marque': 'LEASING'}
+    assert articles[1]['n_b_transport'] == ''
+
+
+def test_regroupement_fournisseur_da_equivalent_a_la_boucle():
+    df = generer_bonne_commande(500, fournisseurs=7, das_par_fournisseur=4, articles=60, seed=4).astype(str)
+
+    attendu = {}
+    for _, row in df.iterrows():
+        frs = attendu.setdefault(row['Code_Fournisseur'], {
+            'fournisseur': row['Code_Fournisseur'], 'email': row['Email_Fournisseur'],
+            'tel': row['TEL_Fournisseu'], 'das': {}, 'tous_articles': {}})
+        da = frs['das'].setdefault(row['Numero_DA'], {'acheteur': row['Acheteur'], 'articles': []})
+        da['articles'].append({'code': row['Code_Article'], 'montant': row['Montant'],
+                               'marque': row['Marque'], 'affaire': row['Affaire']})
+        frs['tous_articles'].setdefault(row['Code_Article'], {
+            'montant': row['Montant'], 'fournisseur': row['Code_Fournisseur'],
+            'marque': row['Marque'], 'affaire': row['Affaire']})
+
+    assert regrouper_fournisseur_da(df) == attendu
+
+
+def test_regles_rejettent_les_lignes_avant_navigateur(tmp_path):
+    df = pd.DataFrame({
+        'Numero_DA': ['DA1', 'DA1', 'DA2', 'DA3', 'DA3', 'DA4'],
+        'Acheteur': ['ACH01'] * 6,
+        'Code_Fournisseur': ['T10', 'T10', 'X20', 'T30', 'T31', 'T40'],
+        'Email_Fournisseur': ['f@x.ma'] * 6, 'TEL_Fournisseu': ['0522'] * 6,
+        'Code_Article': ['A1', 'A1', 'A2', 'A3', 'A4', 'A5'],
+        'Montant': ['10,5', '12', '8', '9', '7', '-1'],
+        'Marque': ['SIEGE'] * 6, 'Affaire': [''] * 6,
+    })
+
+    path = _ecrire(tmp_path, df)
+    lu = lire_excel_module(path, 'bonne_commande', regles_metier=True)
+
+    # doublon DA+article, fournisseur hors format, DA sur deux fournisseurs, montant négatif
+    assert list(lu.index) == [0]
+    # Règles métier non demandées: seules les cellules obligatoires vides rejettent une ligne
+    assert len(lire_excel_module(path, 'bonne_commande', regles_metier=False)) == 6
+
+
+def test_evaluate_rules_masques_par_ligne():
+    df = pd.DataFrame({'N_BC': ['BC1', 'B2', None], 'Quantite': ['1', 'abc', '0,5'], 'Marque': ['ETUDE', 'X', 'SIEGE']})
+    handler = ExcelHandler()
+    regles = {
+        'N_BC': {'not_null': True, 'pattern': r'^BC\d+$'},
+        'Quantite': {'min': 1},
+        'Marque': {'values': ['ETUDE', 'SIEGE']},
+    }
+
+    masques = handler.evaluate_rules(df, regles)
+
+    assert list(masques.any(axis=1)) == [False, True, True]
+    assert masques.loc[1, ('Quantite', 'non numérique(s)')]
+    assert masques.loc[2, ('Quantite', 'hors plage [1, +inf]')]
+    assert handler.validate_data(df, {**regles, 'Absente': {}}) == [
+        'Colonne manquante: Absente',
+        'N_BC: 1 valeur(s) null',
+        r'N_BC: 1 valeur(s) hors format ^BC\d+$',
+        'Quantite: 1 valeur(s) non numérique(s)',
+        'Quantite: 1 valeur(s) hors plage [1, +inf]',
+        'Marque: 1 valeur(s) non autorisée(s)',
+    ]
+
+
+def test_lecture_par_lots_identique_a_la_lecture_complete(tmp_path):
+    df = generer_lettrage(230, fournisseurs=40, taux_doublons=0.05, taux_vides=0.02, seed=3)
+    df.loc[200] = df.loc[10]  # doublon situé dans un autre lot
+    path = _ecrire(tmp_path, df)
+
+    lots = lire_excel_module_par_lots(path, 'lettrage', taille_lot=50, regles_metier=True)
+    premier = next(lots)
+    assert len(premier) <= 50
+    streaming = pd.concat([premier, *lots])
+
+    complet = lire_excel_module(path, 'lettrage', regles_metier=True)
+    assert 200 not in streaming.index
+    pd.testing.assert_frame_equal(streaming[complet.columns], complet, check_dtype=False)
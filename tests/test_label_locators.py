@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du cache label -> input (core/label_locators.py)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from core.driver_manager import JS_APPEL_RPA, DriverManager
+from core.form_filler import JS_LIRE, FormFiller
+from core.label_locators import LabelLocatorCache
+
+
+class EcranFactice:
+    """Driver minimal : labels Syracuse associés à des inputs par id"""
+
+    def __init__(self, champs):
+        self.champs = champs  # {label: (id, valeur)}
+        self.parcours = 0
+
+    def execute_script(self, script, *args):
+        if script == JS_APPEL_RPA:
+            assert args[0] == 'labelInputs'
+            self.parcours += 1
+            return [{'label': label, 'id': i, 'cle': None} for label, (i, _) in self.champs.items()]
+        assert script == JS_LIRE
+        valeurs = {i: v for i, v in self.champs.values()}
+        return [valeurs.get(c['value']) if c['by'] == By.ID else None for c in args[0]]
+
+    def find_element(self, by, value):
+        if by == By.ID and value in {i for i, _ in self.champs.values()}:
+            return value
+        raise NoSuchElementException(value)
+
+    def find_elements(self, by, value):
+        try:
+            return [self.find_element(by, value)]
+        except NoSuchElementException:
+            return []
+
+
+def _cache(driver):
+    manager = DriverManager(headless=True)
+    manager.driver = driver
+    return LabelLocatorCache(manager), manager
+
+
+def test_un_seul_parcours_par_page():
+    driver = EcranFactice({'Fournisseur': ('2-10', 'F001'), 'Prix': ('2-12', '10,5')})
+    cache, manager = _cache(driver)
+
+    assert cache.trouver('Fournisseur') == '2-10'
+    assert cache.localiser('Prix') == (By.ID, '2-12')
+    assert cache.lire(FormFiller(manager), ['Fournisseur', 'Prix']) == {'Fournisseur': 'F001', 'Prix': '10,5'}
+    assert driver.parcours == 1
+
+    manager.page_changed()
+    cache.trouver('Prix')
+    assert driver.parcours == 2
+
+
+def test_cache_recharge_si_input_remplace():
+    driver = EcranFactice({'Marque': ('2-20', 'SIEGE')})
+    cache, _ = _cache(driver)
+    cache.trouver('Marque')
+
+    driver.champs['Marque'] = ('2-21', 'SIEGE')
+    assert cache.trouver('Marque') == '2-21'
+    assert driver.parcours == 2
+    assert cache.localiser('Inconnu')[0] == By.XPATH  # repli sur la recherche XPath
+
+
+def test_localisateur_de_saisie_recharge_si_input_remplace():
+    driver = EcranFactice({'Prix': ('2-12', '10,5')})
+    cache, _ = _cache(driver)
+    assert cache.localiser('Prix') == (By.ID, '2-12')
+
+    # Input recréé par Syracuse après un contrôle serveur, même page
+    driver.champs['Prix'] = ('2-13', '10,5')
+    assert cache.localiser('Prix') == (By.ID, '2-13')
+    assert driver.parcours == 2
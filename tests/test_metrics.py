@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des métriques Prometheus (registre, file d'attente, endpoint /metrics)
+"""
+import sys
+import json
+import urllib.request
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import metrics
+from core.metrics import MetricsRegistry
+
+
+def test_rendu_compteur_et_histogramme():
+    registry = MetricsRegistry()
+    runs = registry.counter('rpa_test_runs_total', 'Exécutions', ('robot', 'outcome'))
+    duree = registry.histogram('rpa_test_step_seconds', 'Étapes', ('step',), buckets=(1, 5))
+
+    runs.inc(robot='LettrageRobot', outcome='success')
+    runs.inc(robot='LettrageRobot', outcome='success')
+    duree.observe(0.5, step='connexion')
+    duree.observe(3, step='connexion')
+
+    texte = registry.render()
+
+    assert '# TYPE rpa_test_runs_total counter' in texte
+    assert 'rpa_test_runs_total{robot="LettrageRobot",outcome="success"} 2.0' in texte
+    assert 'rpa_test_step_seconds_bucket{step="connexion",le="1.0"} 1' in texte
+    assert 'rpa_test_step_seconds_bucket{step="connexion",le="5.0"} 2' in texte
+    assert 'rpa_test_step_seconds_bucket{step="connexion",le="+Inf"} 2' in texte
+    assert 'rpa_test_step_seconds_count{step="connexion"} 2' in texte
+
+
+def test_profondeur_file_par_type(tmp_path, monkeypatch):
+    from utils import queue_manager
+
+    queue_file = tmp_path / 'tasks.json'
+    queue_file.write_text(json.dumps([
+        {'id': '1', 'status': 'pending', 'task_type': 'bon_commande'},
+        {'id': '2', 'status': 'pending', 'task_type': 'bon_commande'},
+        {'id': '3', 'status': 'processing', 'task_type': 'receiption'},
+        {'id': '4', 'status': 'completed', 'task_type': 'receiption'},
+    ]), encoding='utf-8')
+    monkeypatch.setattr(queue_manager, 'QUEUE_FILE', queue_file)
+
+    metrics.collect_queue_depth()
+
+    assert metrics.QUEUE_DEPTH.value(task_type='bon_commande', status='pending') == 2
+    assert metrics.QUEUE_DEPTH.value(task_type='receiption', status='processing') == 1
+    assert metrics.QUEUE_DEPTH.value(task_type='receiption', status='pending') == 0
+
+
+def test_latences_tache():
+    maintenant = datetime(2026, 1, 1, 12, 0, 0)
+    task = {
+        'task_type': 'test_latence',
+        'created_at': (maintenant - timedelta(seconds=30)).isoformat(),
+        'started_at': maintenant.isoformat(),
+    }
+
+    metrics.observe_task(task, now=maintenant)
+    metrics.observe_task(task, status='completed', now=maintenant + timedelta(seconds=90))
+
+    assert metrics.TASK_WAIT_SECONDS.count(task_type='test_latence') == 1
+    assert metrics.TASK_DURATION_SECONDS.count(task_type='test_latence', status='completed') == 1
+
+
+def test_exporteur_http_worker():
+    server = metrics.start_http_exporter(port=0, host='127.0.0.1')
+    assert server is not None
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+            texte = response.read().decode('utf-8')
+        assert 'rpa_browsers_live' in texte
+        assert 'rpa_web_delivery_backlog' in texte
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_endpoint_api_metrics():
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    client = TestClient(app)
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'rpa_queue_depth' in response.text
+    assert 'rpa_api_tasks' in response.text
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du gestionnaire d'onglets de modules Sage (core/module_sessions.py)
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.webdriver.common.by import By
+
+from core.driver_manager import DriverManager
+from core.module_sessions import ModuleSessionManager
+
+PRET = (By.XPATH, "//header[.//a[contains(text(), 'Articles')]]")
+
+
+class NavigateurOnglets:
+    """Driver minimal : onglets et page chargée par onglet"""
+
+    def __init__(self):
+        self.window_handles = ['onglet-0']
+        self.current_window_handle = 'onglet-0'
+        self.pages = {'onglet-0': None}
+        self.popup = False
+        self.switch_to = SimpleNamespace(window=self._basculer, new_window=self._nouvel_onglet)
+
+    def _basculer(self, handle):
+        self.current_window_handle = handle
+
+    def _nouvel_onglet(self, type_hint):
+        handle = f"onglet-{len(self.window_handles)}"
+        self.window_handles.append(handle)
+        self.pages[handle] = None
+        self.current_window_handle = handle
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def find_element(self, by, value):
+        return SimpleNamespace(send_keys=lambda *a: None)
+
+    def find_elements(self, by, value):
+        return [1] if self.pages[self.current_window_handle] else []
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, methode, arguments):
+        assert methode == 'waitAlert'
+        return [{'message': 'Article inexistant'}] if self.popup else []
+
+
+def _gestionnaire():
+    driver = NavigateurOnglets()
+    navigations, fermetures = [], []
+
+    def naviguer(url):
+        navigations.append(url)
+        driver.pages[driver.current_window_handle] = url
+        return True
+
+    def fermer_page(confirm_abandon=False):
+        fermetures.append(driver.current_window_handle)
+        driver.pages[driver.current_window_handle] = None
+        return True
+
+    manager = DriverManager(headless=True)
+    manager.driver = driver
+    gestionnaire = ModuleSessionManager(manager, naviguer, fermer_page)
+    return gestionnaire, driver, navigations, fermetures
+
+
+def test_onglets_reutilises_entre_fournisseurs():
+    gestionnaire, driver, navigations, _ = _gestionnaire()
+
+    for _ in range(3):
+        gestionnaire.ouvrir('GESITM', 'url-articles', pret=PRET)
+        assert driver.current_window_handle == 'onglet-0'
+        gestionnaire.ouvrir('GESPSH', 'url-das', pret=PRET)
+        assert driver.current_window_handle == 'onglet-1'
+
+    assert navigations == ['url-articles', 'url-das']
+    assert driver.window_handles == ['onglet-0', 'onglet-1']
+
+
+def test_rechargement_si_page_invalide():
+    gestionnaire, driver, navigations, fermetures = _gestionnaire()
+    gestionnaire.ouvrir('GESITM', 'url-articles', pret=PRET)
+
+    gestionnaire.invalider('GESITM')
+    gestionnaire.ouvrir('GESITM', 'url-articles', pret=PRET)
+
+    driver.popup = True
+    gestionnaire.ouvrir('GESITM', 'url-articles', pret=PRET)
+
+    assert navigations == ['url-articles'] * 3
+    assert fermetures == ['onglet-0', 'onglet-0']
+
+
+def test_fermer_tout_garde_le_premier_onglet():
+    gestionnaire, driver, _, fermetures = _gestionnaire()
+    gestionnaire.ouvrir('GESITM', 'url-articles', pret=PRET)
+    gestionnaire.ouvrir('GESPSH', 'url-das', pret=PRET)
+    gestionnaire.ouvrir('XBCAUTO', 'url-bc', recharger=True)
+
+    gestionnaire.fermer_tout()
+
+    assert fermetures == ['onglet-0', 'onglet-1', 'onglet-2']
+    assert driver.window_handles == ['onglet-0']
+    assert driver.current_window_handle == 'onglet-0'
+    assert gestionnaire.onglets == {}
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Tests des index de grilles du robot Réception
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.receiption.ReceiptionRobot import indexer_bc_articles
+
+
+def _ligne(index, niveau, texte, replie=None):
+    return {'index': index, 'niveau': niveau, 'texte': texte, 'visible': niveau == 0,
+            'checkbox_id': f'sel-{index}-input', 'coche': False, 'replie': replie, 'valeurs': []}
+
+
+def test_index_bc_articles_limite_au_bc_recherche():
+    lignes = [
+        _ligne(0, 0, 'BC100 - 01/01/2025', replie=True),
+        _ligne(1, 1, 'A1 - Câble'),
+        _ligne(2, 0, 'BC200 - 02/01/2025', replie=False),
+        _ligne(3, 1, 'A1 - Câble'),
+        _ligne(4, 1, 'A12 - Prise'),
+        _ligne(5, 1, 'A1 - Câble (reliquat)'),
+        _ligne(6, 2, 'A9 - détail'),
+        _ligne(7, 0, 'BC300 - 03/01/2025'),
+        _ligne(8, 1, 'A9 - Vis'),
+    ]
+
+    bc, trouves = indexer_bc_articles(lignes, 'BC200', ['A1', 'A12', 'A9'])
+
+    assert bc['index'] == 2
+    assert {code: [l['index'] for l in ls] for code, ls in trouves.items()} == {'A1': [3, 5], 'A12': [4]}
+    assert indexer_bc_articles(lignes, 'BC999', ['A1']) == (None, {})
+
+
+def test_index_lignes_et_cellules_modifiees_seulement():
+    from modules.receiption.ReceiptionRobot import cellules_a_modifier, indexer_lignes_articles
+
+    def valeurs(code, quantite='', transport='', poids=''):
+        v = [''] * 13
+        v[1], v[5], v[9], v[11] = code, quantite, transport, poids
+        return v
+
+    lignes = [
+        {'index': 0, 'valeurs': valeurs('A1 Câble', '2,000', 'FN01', '0.5')},
+        {'index': 1, 'valeurs': valeurs('A1 Câble')},
+        {'index': 2, 'valeurs': valeurs('B7 Prise')},
+    ]
+    articles = [
+        {'code': 'A1', 'quantite': '2', 'n_b_transport': 'FN01', 'matricule': '', 'poids': '0,50', 'marque': ''},
+        {'code': 'A1', 'quantite': '3', 'n_b_transport': '', 'matricule': '', 'poids': '', 'marque': 'ETUDE'},
+        {'code': 'Z9', 'quantite': '1', 'n_b_transport': '', 'matricule': '', 'poids': '', 'marque': ''},
+    ]
+
+    index = indexer_lignes_articles(lignes, articles)
+
+    assert {i: l['index'] for i, l in index.items()} == {0: 0, 1: 1}
+    assert cellules_a_modifier(index[0], articles[0]) == []
+    assert cellules_a_modifier(index[1], articles[1]) == [('quantite', 5), ('marque', 12)]
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de la bibliothèque window.__rpa (core/static/rpa_helpers.js) exécutée sous Node
+avec un DOM minimal (ignorés si Node n'est pas installé)
+"""
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from core.driver_manager import RPA_HELPERS_JS
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='Node.js non installé')
+
+# DOM réduit à ce qu'utilisent les primitives de popups: boîtes .s_alertbox et MutationObserver
+DOM_MINIMAL = """
+var observateurs = [];
+function MutationObserver(callback) { this.callback = callback; }
+MutationObserver.prototype.observe = function () { observateurs.push(this); };
+MutationObserver.prototype.disconnect = function () { observateurs.splice(observateurs.indexOf(this), 1); };
+function muter(noeuds) {
+    observateurs.slice().forEach(function (o) { o.callback([{ addedNodes: noeuds }]); });
+}
+
+var boites = [];
+function boite(message, affichee) {
+    var b = {
+        nodeType: 1, parentElement: null, style: { display: affichee ? '' : 'none' },
+        matches: function (sel) { return sel === '.s_alertbox'; },
+        querySelector: function (sel) {
+            return sel === '.s_alertbox_msg' ? { textContent: message } : null;
+        },
+        querySelectorAll: function () { return []; }
+    };
+    boites.push(b);
+    return b;
+}
+
+var document = {
+    body: {},
+    querySelectorAll: function (sel) { return sel === '.s_alertbox' ? boites.slice() : []; },
+    querySelector: function (sel) { return sel === '.s_alertbox' ? (boites[0] || null) : null; },
+    getElementById: function () { return null; },
+    contains: function (noeud) { return boites.indexOf(noeud) >= 0; }
+};
+var window = { getComputedStyle: function () { return { visibility: 'visible' }; } };
+"""
+
+
+def _executer(scenario: str):
+    """Charger la bibliothèque dans le DOM minimal, jouer le scénario et lire son résultat JSON"""
+    script = DOM_MINIMAL + RPA_HELPERS_JS + "\nvar rpa = window.__rpa;\n" + scenario
+    sortie = subprocess.run(['node', '-e', script], capture_output=True, text=True, timeout=10, check=True)
+    return json.loads(sortie.stdout)
+
+
+def test_attente_popup_ignore_une_popup_refermee_restee_dans_le_dom():
+    resultat = _executer("""
+        boite('Ancienne confirmation', false);
+        rpa.waitAlert(2000, 150, function (alertes) { console.log(JSON.stringify(alertes)); });
+        setTimeout(function () { muter([]); }, 20);
+        setTimeout(function () { muter([boite('Confirmer le lettrage ?', true)]); }, 60);
+    """)
+
+    assert [a['message'] for a in resultat] == ['Confirmer le lettrage ?']
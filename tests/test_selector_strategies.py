@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du registre des stratégies de sélection apprises (utils/selector_strategies.py)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.common.exceptions import NoSuchElementException
+
+from utils.selector_strategies import StrategyRegistry
+
+
+def _variantes(essais, gagnante):
+    def variante(nom):
+        def essayer():
+            essais.append(nom)
+            if nom != gagnante:
+                raise NoSuchElementException(nom)
+            return f"bouton-{nom}"
+        return essayer
+    return [(nom, variante(nom)) for nom in ('prefer_link', 'title', 'texte')]
+
+
+def test_gagnante_essayee_en_premier_apres_rechargement(tmp_path):
+    path = tmp_path / 'strategies.json'
+    essais = []
+
+    registre = StrategyRegistry(path, version='V12')
+    assert registre.essayer('GESLET/bouton', _variantes(essais, 'texte')) == ('texte', 'bouton-texte')
+    assert essais == ['prefer_link', 'title', 'texte']
+    registre.sauvegarder()
+
+    essais.clear()
+    registre = StrategyRegistry(path, version='V12')
+    assert registre.essayer('GESLET/bouton', _variantes(essais, 'texte'))[0] == 'texte'
+    assert essais == ['texte']
+    assert registre.statistiques('GESLET/bouton') == {
+        'prefer_link': {'succes': 0, 'echecs': 1},
+        'title': {'succes': 0, 'echecs': 1},
+        'texte': {'succes': 2, 'echecs': 0},
+    }
+
+
+def test_apprentissage_propre_a_la_version(tmp_path):
+    path = tmp_path / 'strategies.json'
+    StrategyRegistry(path, version='V12').essayer('GESLET/bouton', _variantes([], 'title'))
+
+    essais = []
+    registre = StrategyRegistry(path, version='V2024')
+    assert registre.essayer('GESLET/bouton', _variantes(essais, 'inconnue')) == (None, None)
+    assert essais == ['prefer_link', 'title', 'texte']
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du serveur Syracuse de substitution
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+
+from tests.syracuse_mock import create_app, module_url, rediriger_robot
+
+RAPIDE = {'latency_ms': 0, 'page_latency_ms': 0, 'save_latency_ms': 0, 'bc_generation_ms': 0, 'seed': 1}
+
+
+def _client(**config):
+    return TestClient(create_app(dict(RAPIDE, **config)))
+
+
+def test_login_cree_session_et_redirige():
+    client = _client()
+
+    assert 'id="go-basic"' in client.get('/').text
+    response = client.post('/auth/login', data={'login': 'CPT02', 'password': 'x'}, follow_redirects=False)
+
+    assert response.status_code == 303
+    assert response.headers['location'] == '/syracuse-main/html/main.html'
+    page = client.get(module_url('', 'GESITM'))
+    assert 's_lock_long_spin' in page.text
+    assert '>CPT02<' in page.text
+
+
+def test_main_sans_session_renvoie_au_login():
+    client = _client()
+    response = client.get('/syracuse-main/html/main.html', follow_redirects=False)
+
+    assert response.status_code == 303
+    assert response.headers['location'] == '/'
+
+
+def test_configuration_latence_et_echecs():
+    client = _client()
+
+    assert client.post('/mock/config', json={'inconnue': 1}).status_code == 400
+    client.post('/mock/config', json={'failure_rate': 1.0})
+
+    response = client.post('/mock/api/articles/A15007', json={'prix': '10'})
+    assert 'error' in response.json()
+    assert client.get('/mock/stats').json()['save_failed'] == 1
+
+
+def test_generation_bc_groupee_par_fournisseur():
+    client = _client()
+    client.post('/mock/reset', json={'das': [
+        {'numero': 'DA1', 'fournisseur': 'T1'},
+        {'numero': 'DA2', 'fournisseur': 'T1'},
+        {'numero': 'DA3', 'fournisseur': 'T2'},
+    ]})
+    for numero in ('DA1', 'DA2', 'DA3'):
+        client.post(f'/mock/api/das/{numero}', json={'valide': True})
+
+    generes = client.post('/mock/api/bc/generate').json()
+
+    assert {g['fournisseur']: g['das'] for g in generes} == {'T1': ['DA1', 'DA2'], 'T2': ['DA3']}
+    assert client.post('/mock/api/bc/generate').json() == []
+
+
+def test_redirection_urls_robot():
+    from config.settings import SAGE_CONFIG
+
+    class RobotFactice:
+        def __init__(self):
+            self.url_article = ("http://192.168.1.241:8124/syracuse-main/html/main.html?url=%2Ftrans%2Fx3%2Ferp"
+                                "%2FBASE1%2F%24sessions%3Ff%3DGESITM%252F2%252F%252FM%252F")
+            self.nom = 'robot'
+
+    robot = RobotFactice()
+    ancienne_url = SAGE_CONFIG['url']
+    try:
+        rediriger_robot(robot, 'http://127.0.0.1:9999')
+        assert SAGE_CONFIG['url'] == 'http://127.0.0.1:9999/'
+    finally:
+        SAGE_CONFIG['url'] = ancienne_url
+
+    assert robot.url_article == module_url('http://127.0.0.1:9999', 'GESITM')
+    assert robot.nom == 'robot'
+    assert _client().get('/syracuse-mock/static/syracuse_mock.js').status_code == 200
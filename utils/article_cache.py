@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Cache local (JSON) des articles déjà écrits dans Sage X3
+Mémorise, par code article, les dernières valeurs confirmées (fournisseur,
+prix, marque, affaire) et leur date pour éviter de retoucher un article à
+jour d'une tâche à l'autre.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import DATA_DIR
+from core.logger import Logger
+
+CACHE_FILE = DATA_DIR / 'cache' / 'articles_bonne_commande.json'
+CHAMPS = ('fournisseur', 'montant', 'marque', 'affaire')
+
+
+def _normaliser(champ: str, valeur: Any) -> str:
+    """Forme comparable d'une valeur (prix en nombre, textes sans casse)"""
+    texte = str(valeur if valeur is not None else '').strip()
+    if champ == 'montant':
+        try:
+            return repr(float(texte.replace(' ', '').replace(',', '.')))
+        except ValueError:
+            pass
+    return texte.upper()
+
+
+class ArticleCache:
+    """Cache des valeurs d'articles confirmées, avec durée de validité"""
+
+    def __init__(self, path: Path = CACHE_FILE, ttl: int = 86400):
+        """
+        Initialiser le cache
+
+        Args:
+            path: Fichier JSON du cache
+            ttl: Durée de validité d'une entrée en secondes (0 = cache désactivé)
+        """
+        self.logger = Logger.get_logger('ArticleCache', 'utils')
+        self.path = Path(path)
+        self.ttl = ttl
+        self.entrees: Dict[str, Dict[str, Any]] = self._charger() if ttl > 0 else {}
+
+    def est_a_jour(self, code_article: str, **valeurs) -> bool:
+        """
+        Vérifier si l'article a été confirmé avec ces valeurs dans le TTL
+
+        Args:
+            code_article: Code de l'article
+            **valeurs: fournisseur, montant, marque, affaire
+
+        Returns:
+            True si l'article peut être ignoré
+        """
+        entree = self.entrees.get(code_article)
+        if not entree or self.ttl <= 0:
+            return False
+        if time.time() - entree.get('confirme_le', 0) > self.ttl:
+            return False
+        return all(
+            entree.get(champ) == _normaliser(champ, valeurs.get(champ, ''))
+            for champ in CHAMPS
+        )
+
+    def confirmer(self, code_article: str, **valeurs):
+        """
+        Enregistrer les valeurs confirmées dans Sage pour un article
+
+        Args:
+            code_article: Code de l'article
+            **valeurs: fournisseur, montant, marque, affaire
+        """
+        if self.ttl <= 0:
+            return
+        entree = {champ: _normaliser(champ, valeurs.get(champ, '')) for champ in CHAMPS}
+        entree['confirme_le'] = time.time()
+        self.entrees[code_article] = entree
+        self._sauvegarder()
+
+    def invalider(self, code_article: str):
+        """
+        Retirer un article du cache (enregistrement en échec)
+
+        Args:
+            code_article: Code de l'article
+        """
+        if self.entrees.pop(code_article, None) is not None:
+            self.logger.info(f"🗑️ Article {code_article} retiré du cache")
+            self._sauvegarder()
+
+    def age(self, code_article: str) -> Optional[float]:
+        """Âge en secondes de l'entrée d'un article (None si absent)"""
+        entree = self.entrees.get(code_article)
+        return time.time() - entree['confirme_le'] if entree else None
+
+    def _charger(self) -> Dict[str, Dict[str, Any]]:
+        """Lire le fichier de cache (vide si absent ou illisible)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entrees = json.load(f)
+            limite = time.time() - self.ttl
+            return {code: e for code, e in entrees.items() if e.get('confirme_le', 0) >= limite}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"⚠️ Cache articles illisible, ignoré: {e}")
+            return {}
+
+    def _sauvegarder(self):
+        """Écrire le cache de façon atomique (fichier temporaire + remplacement)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporaire = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump(self.entrees, f, ensure_ascii=False, indent=2)
+            os.replace(temporaire, self.path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Sauvegarde du cache articles impossible: {e}")
@@ -3,8 +3,10 @@
 Utilitaires pour la manipulation de fichiers Excel
 """
 import pandas as pd
+from datetime import date, datetime
+from openpyxl import load_workbook
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from core.logger import Logger
 
 class ExcelHandler:
@@ -13,20 +15,29 @@ class ExcelHandler:
     def __init__(self):
         self.logger = Logger.get_logger('ExcelHandler', 'utils')
     
-    def read_excel(self, filepath: str, required_columns: List[str] = None) -> pd.DataFrame:
+    def read_excel(self, filepath: str, required_columns: List[str] = None,
+                   usecols: List[str] = None, dtype: Any = None) -> pd.DataFrame:
         """
         Lire un fichier Excel avec validation
         
         Args:
             filepath: Chemin du fichier
             required_columns: Colonnes requises
+            usecols: Colonnes à lire (les autres sont ignorées, les absentes tolérées)
+            dtype: Types explicites (ex: str ou {'Montant': str})
         
         Returns:
             DataFrame pandas
         """
         try:
             self.logger.info(f"📖 Lecture Excel: {filepath}")
-            df = pd.read_excel(filepath)
+            options = {}
+            if usecols is not None:
+                colonnes = set(usecols)
+                options['usecols'] = lambda col: col in colonnes
+            if dtype is not None:
+                options['dtype'] = dtype
+            df = pd.read_excel(filepath, **options)
             
             self.logger.info(f"✅ {len(df)} ligne(s) lues")
             
@@ -42,6 +53,74 @@ class ExcelHandler:
             self.logger.error(f"❌ Erreur lecture Excel: {e}")
             raise
     
+    def iter_excel(self, filepath: str, required_columns: List[str] = None,
+                   usecols: List[str] = None, chunk_size: int = 500) -> Iterator[pd.DataFrame]:
+        """
+        Lire un fichier Excel par lots en streaming (openpyxl en lecture seule)
+        
+        Seul le lot courant est en mémoire : la consommation reste stable quelle
+        que soit la taille du fichier. Les cellules sont rendues en texte comme
+        read_excel(dtype=str) (vides → NaN, 120.0 → '120').
+        
+        Args:
+            filepath: Chemin du fichier
+            required_columns: Colonnes requises (vérifiées dès l'en-tête)
+            usecols: Colonnes à lire (les autres sont ignorées, les absentes tolérées)
+            chunk_size: Nombre de lignes par lot
+        
+        Yields:
+            DataFrame texte par lot, index = numéro de ligne de données (0 = première)
+        """
+        self.logger.info(f"📖 Lecture Excel en streaming: {filepath}")
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(v).strip() if v is not None else '' for v in next(rows, ())]
+            
+            if required_columns:
+                missing = [col for col in required_columns if col not in header]
+                if missing:
+                    self.logger.error(f"❌ Erreur lecture Excel: Colonnes manquantes: {missing}")
+                    raise ValueError(f"Colonnes manquantes: {missing}")
+            
+            wanted = set(usecols) if usecols is not None else set(header)
+            positions = [(i, col) for i, col in enumerate(header) if col and col in wanted]
+            
+            debut = 0
+            lot = []
+            for row in rows:
+                lot.append(row)
+                if len(lot) >= chunk_size:
+                    yield self._lot_texte(lot, positions, debut)
+                    debut += len(lot)
+                    lot = []
+            if lot:
+                yield self._lot_texte(lot, positions, debut)
+                debut += len(lot)
+            
+            self.logger.info(f"✅ {debut} ligne(s) lues")
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _lot_texte(rows: List[tuple], positions: List[tuple], debut: int) -> pd.DataFrame:
+        """Construire un DataFrame texte à partir de lignes openpyxl"""
+        def texte(value):
+            if value is None or (isinstance(value, str) and value == ''):
+                return None
+            if isinstance(value, float) and value.is_integer():
+                return str(int(value))
+            if isinstance(value, (datetime, date)):
+                return str(pd.Timestamp(value))
+            return str(value)
+        
+        data = {
+            col: [texte(row[i]) if i < len(row) else None for row in rows]
+            for i, col in positions
+        }
+        return pd.DataFrame(data, index=pd.RangeIndex(debut, debut + len(rows)), dtype=object)
+    
     def write_excel(self, df: pd.DataFrame, filepath: str, sheet_name: str = 'Sheet1'):
         """
         Écrire un DataFrame dans Excel
@@ -68,30 +147,116 @@ class ExcelHandler:
         
         Args:
             df: DataFrame à valider
-            rules: Dictionnaire de règles de validation
+            rules: Dictionnaire de règles de validation (voir evaluate_rules)
         
         Returns:
             Liste des erreurs (vide si tout est ok)
         """
-        errors = []
+        errors = [f"Colonne manquante: {column}" for column in rules if column not in df.columns]
+        
+        comptes = self.evaluate_rules(df, rules).sum()
+        for (column, erreur), count in comptes.items():
+            if count:
+                errors.append(f"{column}: {int(count)} valeur(s) {erreur}")
+        
+        return errors
+    
+    def evaluate_rules(self, df: pd.DataFrame, rules: Dict[str, Any],
+                       state: Dict[Any, Any] = None) -> pd.DataFrame:
+        """
+        Évaluer des règles déclaratives, chaque règle en une opération vectorisée
+        
+        Règles supportées par colonne:
+            not_null: True → cellule NaN ou blanche interdite
+            type: 'string' | 'numeric' (nombres au format 1234.5 ou 1 234,5)
+            pattern: expression régulière que la valeur entière doit respecter
+            min / max: bornes numériques incluses (impliquent type numeric)
+            values: énumération des valeurs autorisées
+            unique: True, ou liste de colonnes formant la clé avec la colonne
+            reference: colonne qui doit être unique pour une même valeur
+                       (ex: un Numero_DA → un seul Code_Fournisseur)
+        
+        Hors not_null, les cellules vides ne sont pas contrôlées.
+        
+        Args:
+            df: DataFrame à valider
+            rules: {colonne: {règle: paramètre}}
+            state: Dictionnaire conservé entre appels pour valider un fichier
+                   lu par lots (clés déjà vues pour unique et reference)
+        
+        Returns:
+            DataFrame booléen aligné sur df (True = erreur), colonnes (colonne, erreur)
+        """
+        masques = {}
         
         for column, rule in rules.items():
             if column not in df.columns:
-                errors.append(f"Colonne manquante: {column}")
                 continue
             
-            # Vérifier les valeurs null
+            serie = df[column]
+            texte = serie.astype(str).str.strip()
+            vides = serie.isna() | texte.eq('')
+            presentes = ~vides
+            
             if rule.get('not_null', False):
-                null_count = df[column].isnull().sum()
-                if null_count > 0:
-                    errors.append(f"{column}: {null_count} valeur(s) null")
-            
-            # Vérifier le type
-            if 'type' in rule:
-                expected_type = rule['type']
-                if expected_type == 'string':
-                    invalid = df[~df[column].apply(lambda x: isinstance(x, str) or pd.isna(x))]
-                    if len(invalid) > 0:
-                        errors.append(f"{column}: {len(invalid)} valeur(s) non-string")
+                masques[(column, 'null')] = vides
+            
+            if rule.get('type') == 'string':
+                if serie.dtype == object:
+                    masques[(column, 'non-string')] = presentes & serie.str.len().isna()
+                else:
+                    masques[(column, 'non-string')] = presentes
+            
+            if rule.get('type') == 'numeric' or 'min' in rule or 'max' in rule:
+                if pd.api.types.is_numeric_dtype(serie):
+                    nombres = serie
+                else:
+                    nombres = pd.to_numeric(
+                        texte.str.replace(r'\s', '', regex=True).str.replace(',', '.', regex=False),
+                        errors='coerce'
+                    )
+                masques[(column, 'non numérique(s)')] = presentes & nombres.isna()
+                
+                hors_plage = pd.Series(False, index=df.index)
+                if 'min' in rule:
+                    hors_plage |= nombres < rule['min']
+                if 'max' in rule:
+                    hors_plage |= nombres > rule['max']
+                if 'min' in rule or 'max' in rule:
+                    bornes = f"[{rule.get('min', '-inf')}, {rule.get('max', '+inf')}]"
+                    masques[(column, f"hors plage {bornes}")] = presentes & hors_plage
+            
+            if 'pattern' in rule:
+                conformes = texte.str.fullmatch(rule['pattern'])
+                masques[(column, f"hors format {rule['pattern']}")] = presentes & ~conformes
+            
+            if 'values' in rule:
+                autorisees = {str(v) for v in rule['values']}
+                masques[(column, 'non autorisée(s)')] = presentes & ~texte.isin(autorisees)
+            
+            if rule.get('unique'):
+                cle = [column] + (list(rule['unique']) if isinstance(rule['unique'], (list, tuple)) else [])
+                libelle = 'en doublon' if len(cle) == 1 else f"en doublon ({' + '.join(cle)})"
+                doublons = df.duplicated(subset=cle, keep='first')
+                if state is not None:
+                    vues = state.setdefault((column, 'unique'), set())
+                    cles = list(zip(*(df[c] for c in cle)))
+                    doublons |= pd.Series([k in vues for k in cles], index=df.index)
+                    vues.update(cles)
+                masques[(column, libelle)] = presentes & doublons
+            
+            if 'reference' in rule:
+                reference = rule['reference']
+                nb_references = df.groupby(serie, sort=False)[reference].transform('nunique')
+                incoherentes = nb_references.gt(1)
+                if state is not None:
+                    connues = state.setdefault((column, 'reference'), {})
+                    attendues = serie.map(connues)
+                    incoherentes |= attendues.notna() & attendues.ne(df[reference])
+                    for valeur, ref in zip(serie[presentes], df.loc[presentes, reference]):
+                        connues.setdefault(valeur, ref)
+                masques[(column, f"liée(s) à plusieurs {reference}")] = presentes & incoherentes
         
-        return errors
+        if not masques:
+            return pd.DataFrame(index=df.index)
+        return pd.DataFrame(masques, index=df.index)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Lecture et regroupement vectorisés des fichiers Excel des robots
+
+Un seul passage pandas par étape : lecture des seules colonnes utiles (toutes
+en texte), règles de validation évaluées en masques par ligne, conversion des
+dates en bloc, puis regroupement par groupby au lieu de boucles iterrows().
+Les lignes rejetées ici n'ouvrent jamais de session navigateur.
+"""
+from typing import Any, Dict, Iterator, Optional
+
+import pandas as pd
+
+from config.settings import VALIDATION_CONFIG
+from core.logger import Logger
+from utils.excel_handler import ExcelHandler
+
+# Schéma des fichiers d'entrée par module
+#   required : colonnes obligatoires (erreur si absentes)
+#   optional : colonnes lues si présentes
+#   non_vides: colonnes dont une cellule vide rend la ligne invalide
+#   dates    : colonnes converties au format JJ/MM/AAAA
+#   regles_metier: règles ExcelHandler.evaluate_rules (format, plages, doublons, références),
+#                  appliquées seulement sur demande (VALIDATION_REGLES_METIER ou paramètre)
+SCHEMAS = {
+    'bonne_commande': {
+        'required': ['Numero_DA', 'Acheteur', 'Code_Fournisseur', 'Email_Fournisseur', 'TEL_Fournisseu',
+                     'Code_Article', 'Montant', 'Marque', 'Affaire'],
+        'optional': ['email_expediteur'],
+        'non_vides': ['Numero_DA', 'Code_Fournisseur', 'Code_Article', 'Montant', 'Marque'],
+        'dates': [],
+        'regles_metier': {
+            'Code_Fournisseur': {'pattern': r'^T\d+$'},
+            'Numero_DA': {'reference': 'Code_Fournisseur'},
+            'Code_Article': {'unique': ['Numero_DA']},
+            'Montant': {'min': 0},
+        },
+    },
+    'receiption': {
+        'required': ['CodeFrs', 'BLFrs', 'DateBC', 'N_BC', 'CodeArticle', 'Quantite',
+                     'N_B_transport', 'Matricule', 'Poids', 'Marque'],
+        'optional': ['email_expediteur'],
+        'non_vides': ['CodeFrs', 'BLFrs', 'DateBC', 'N_BC', 'CodeArticle', 'Quantite', 'Poids', 'Marque'],
+        'dates': ['DateBC'],
+        'regles_metier': {
+            'CodeFrs': {'pattern': r'^T\d+$'},
+            'N_BC': {'pattern': r'^BC\d+$', 'reference': 'CodeFrs'},
+            'Quantite': {'min': 0},
+            'Poids': {'min': 0},
+        },
+    },
+    'lettrage': {
+        'required': ['Compte', 'Code', 'Facture', 'N-Avis'],
+        'optional': ['Nom'],
+        'non_vides': [],
+        'dates': [],
+        'regles_metier': {
+            'Code': {'pattern': r'^T\d+$'},
+            'Facture': {'unique': ['Code', 'N-Avis']},
+        },
+    },
+    'facturation': {
+        'required': ['Code', 'DFF', 'FactureFrs', 'Date', 'BR'],
+        'optional': ['Nom'],
+        'non_vides': [],
+        'dates': ['DFF', 'Date'],
+        'regles_metier': {
+            'Code': {'pattern': r'^T\d+$'},
+            'FactureFrs': {'unique': ['Code']},
+        },
+    },
+}
+
+logger = Logger.get_logger('Ingestion', 'utils')
+
+
+def regles_module(module: str, regles_metier: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Règles de validation d'un module (schéma + configuration)
+
+    Par défaut seules les cellules obligatoires vides rejettent une ligne ;
+    les règles métier (format des codes, doublons...) sont à activer.
+
+    Args:
+        module: Clé de SCHEMAS
+        regles_metier: Appliquer les règles métier (défaut: VALIDATION_CONFIG['regles_metier'])
+
+    Returns:
+        {colonne: {règle: paramètre}} pour ExcelHandler.evaluate_rules
+    """
+    schema = SCHEMAS[module]
+    if regles_metier is None:
+        regles_metier = VALIDATION_CONFIG['regles_metier']
+    regles = {col: dict(regle) for col, regle in schema['regles_metier'].items()} if regles_metier else {}
+    for col in schema['non_vides']:
+        regles.setdefault(col, {})['not_null'] = True
+    if VALIDATION_CONFIG['marques'] and 'Marque' in schema['required']:
+        regles.setdefault('Marque', {})['values'] = VALIDATION_CONFIG['marques']
+    return regles
+
+
+def formater_dates(serie: pd.Series) -> pd.Series:
+    """
+    Convertir une colonne de dates au format JJ/MM/AAAA en bloc
+
+    Les dates Excel (lues en texte 'AAAA-MM-JJ HH:MM:SS') et les chaînes ISO
+    sont converties ; les valeurs déjà au format JJ/MM/AAAA ou non reconnues
+    sont conservées telles quelles.
+
+    Args:
+        serie: Colonne lue en texte
+
+    Returns:
+        Colonne de dates formatées
+    """
+    texte = serie.str.strip()
+    iso = texte.str.match(r'^\d{4}-\d{2}-\d{2}', na=False)
+    if not iso.any():
+        return texte
+    converties = pd.to_datetime(texte[iso].str[:10], format='%Y-%m-%d', errors='coerce').dt.strftime('%d/%m/%Y')
+    return texte.mask(iso & converties.reindex(texte.index).notna(), converties)
+
+
+def lire_excel_module(filepath: str, module: str, excel_handler: Optional[ExcelHandler] = None,
+                      regles_metier: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Lire, nettoyer et valider le fichier Excel d'un module
+
+    Args:
+        filepath: Chemin du fichier Excel
+        module: Clé de SCHEMAS (bonne_commande, receiption, lettrage, facturation)
+        excel_handler: ExcelHandler à utiliser (optionnel)
+        regles_metier: Appliquer les règles métier (défaut: configuration)
+
+    Returns:
+        DataFrame texte, lignes invalides retirées (index d'origine conservé),
+        colonnes optionnelles absentes ajoutées vides
+    """
+    schema = SCHEMAS[module]
+    excel_handler = excel_handler or ExcelHandler()
+    colonnes = schema['required'] + schema['optional']
+
+    df = excel_handler.read_excel(filepath, required_columns=schema['required'], usecols=colonnes, dtype=str)
+    df = _valider(df, module, excel_handler, regles_metier=regles_metier)
+
+    logger.info(f"✅ {len(df)} ligne(s) valides à traiter")
+    return df
+
+
+def lire_excel_module_par_lots(filepath: str, module: str, taille_lot: int = 500,
+                               excel_handler: Optional[ExcelHandler] = None,
+                               regles_metier: Optional[bool] = None) -> Iterator[pd.DataFrame]:
+    """
+    Lire, nettoyer et valider le fichier Excel d'un module par lots
+
+    Même résultat que lire_excel_module, mais le fichier est parcouru en
+    streaming : le premier lot est disponible avant la fin de la lecture et
+    la mémoire ne dépend que de taille_lot. Les doublons et références sont
+    contrôlés sur tout le fichier, pas seulement à l'intérieur d'un lot.
+
+    Args:
+        filepath: Chemin du fichier Excel
+        module: Clé de SCHEMAS
+        taille_lot: Nombre de lignes lues par lot
+        excel_handler: ExcelHandler à utiliser (optionnel)
+        regles_metier: Appliquer les règles métier (défaut: configuration)
+
+    Yields:
+        DataFrame texte des lignes valides du lot (lots vides non émis)
+    """
+    schema = SCHEMAS[module]
+    excel_handler = excel_handler or ExcelHandler()
+    colonnes = schema['required'] + schema['optional']
+    etat = {}
+    total = 0
+
+    for lot in excel_handler.iter_excel(filepath, required_columns=schema['required'],
+                                        usecols=colonnes, chunk_size=taille_lot):
+        lot = _valider(lot, module, excel_handler, etat, regles_metier)
+        total += len(lot)
+        if len(lot):
+            yield lot
+
+    logger.info(f"✅ {total} ligne(s) valides traitées")
+
+
+def _valider(df: pd.DataFrame, module: str, excel_handler: ExcelHandler,
+             etat: Optional[Dict[Any, Any]] = None, regles_metier: Optional[bool] = None) -> pd.DataFrame:
+    """Compléter, valider et normaliser un DataFrame texte lu pour un module"""
+    schema = SCHEMAS[module]
+    for col in schema['optional']:
+        if col not in df.columns:
+            df[col] = ''
+
+    erreurs = excel_handler.evaluate_rules(df, regles_module(module, regles_metier), etat)
+    invalides = erreurs.any(axis=1)
+    if invalides.any():
+        for idx, ligne in erreurs[invalides].iterrows():
+            details = ', '.join(f"{col} {erreur}" for col, erreur in ligne.index[ligne])
+            logger.warning(f"⚠️ Ligne {idx+1} ignorée - {details}")
+        logger.warning(f"⚠️ {int(invalides.sum())} ligne(s) invalide(s) ignorée(s)")
+        df = df[~invalides]
+
+    # Cellules optionnelles vides → ''
+    df = df.fillna('')
+    for col in schema['dates']:
+        df[col] = formater_dates(df[col])
+
+    return df
+
+
+def regrouper_fournisseur_da(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Regrouper un fichier bonne commande par Fournisseur → DA → Articles
+
+    Returns:
+        {code_fournisseur: {fournisseur, email, tel, das: {numero_da: {acheteur, articles}},
+                            tous_articles: {code_article: {montant, fournisseur, marque, affaire}}}}
+    """
+    fournisseurs = {}
+    articles = df.rename(columns={'Code_Article': 'code', 'Montant': 'montant',
+                                  'Marque': 'marque', 'Affaire': 'affaire'})
+
+    for code_fournisseur, groupe in articles.groupby('Code_Fournisseur', sort=False):
+        premier = groupe.iloc[0]
+        uniques = groupe.drop_duplicates('code')
+        fournisseurs[code_fournisseur] = {
+            'fournisseur': code_fournisseur,
+            'email': premier['Email_Fournisseur'],
+            'tel': premier['TEL_Fournisseu'],
+            'das': {
+                numero_da: {
+                    'acheteur': lignes['Acheteur'].iat[0],
+                    'articles': lignes[['code', 'montant', 'marque', 'affaire']].to_dict('records'),
+                }
+                for numero_da, lignes in groupe.groupby('Numero_DA', sort=False)
+            },
+            'tous_articles': {
+                code: {'montant': montant, 'fournisseur': code_fournisseur, 'marque': marque, 'affaire': affaire}
+                for code, montant, marque, affaire in zip(
+                    uniques['code'], uniques['montant'], uniques['marque'], uniques['affaire'])
+            },
+        }
+
+    return fournisseurs
+
+
+def regrouper_fournisseur_bc(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Regrouper un fichier réception par Fournisseur → BC → Articles
+
+    Returns:
+        {code_frs: {bl_frs, date_bc, bons_commande: {n_bc: {articles: [...]}}}}
+    """
+    structure = {}
+    articles = df.assign(CodeArticle=df['CodeArticle'].str.strip()).rename(columns={
+        'CodeArticle': 'code', 'Quantite': 'quantite', 'N_B_transport': 'n_b_transport',
+        'Matricule': 'matricule', 'Poids': 'poids', 'Marque': 'marque',
+    })
+    colonnes = ['code', 'quantite', 'n_b_transport', 'matricule', 'poids', 'marque']
+
+    for code_frs, groupe in articles.groupby('CodeFrs', sort=False):
+        premier = groupe.iloc[0]
+        structure[code_frs] = {
+            'bl_frs': premier['BLFrs'],
+            'date_bc': premier['DateBC'],
+            'bons_commande': {
+                n_bc: {'articles': lignes[colonnes].to_dict('records')}
+                for n_bc, lignes in groupe.groupby('N_BC', sort=False)
+            },
+        }
+
+    return structure
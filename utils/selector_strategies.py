@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Registre des stratégies de sélection apprises (JSON)
+Quand plusieurs variantes permettent de trouver un élément (liste de XPaths,
+popup Syracuse ou alerte JavaScript...), le registre retient celle qui a
+réussi pour chaque écran et version de Sage, et l'essaie en premier la fois
+suivante : une variante en échec coûte une attente implicite ou une exception.
+Les compteurs succès / échecs sont conservés d'une exécution à l'autre.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import DATA_DIR, SAGE_CONFIG
+from core.logger import Logger
+
+STRATEGIES_FILE = DATA_DIR / 'cache' / 'strategies_selecteurs.json'
+
+Variante = Tuple[str, Callable[[], Any]]
+
+
+class StrategyRegistry:
+    """Variantes de sélection ordonnées par l'expérience, par écran et version de Sage"""
+
+    def __init__(self, path: Path = STRATEGIES_FILE, version: Optional[str] = None):
+        """
+        Initialiser le registre
+
+        Args:
+            path: Fichier JSON des statistiques
+            version: Version de Sage (défaut: SAGE_CONFIG['version'])
+        """
+        self.logger = Logger.get_logger('StrategyRegistry', 'utils')
+        self.path = Path(path)
+        self.version = version or SAGE_CONFIG['version']
+        self.donnees: Dict[str, Dict[str, Any]] = self._charger()
+        self.modifie = False
+
+    def essayer(self, ecran: str, variantes: Sequence[Variante]) -> Tuple[Optional[str], Any]:
+        """
+        Essayer les variantes, la dernière gagnante de l'écran en premier
+
+        Une variante réussit si elle retourne autre chose que None ; une
+        exception ou None compte comme un échec et passe à la suivante.
+
+        Args:
+            ecran: Écran concerné (ex: 'lettrage/bouton_lettrage')
+            variantes: (nom, fonction sans argument) dans l'ordre par défaut
+
+        Returns:
+            (nom de la variante gagnante, résultat), ou (None, None) si toutes échouent
+        """
+        fonctions = dict(variantes)
+        for nom in self.ordonner(ecran, [nom for nom, _ in variantes]):
+            try:
+                resultat = fonctions[nom]()
+            except Exception as e:
+                self.logger.debug(f"Variante {ecran}/{nom} en échec: {e}")
+                resultat = None
+
+            if resultat is not None:
+                self._noter(ecran, nom, succes=True)
+                return nom, resultat
+            self._noter(ecran, nom, succes=False)
+        return None, None
+
+    def ordonner(self, ecran: str, noms: List[str]) -> List[str]:
+        """
+        Ordre d'essai: dernière variante gagnante, puis l'ordre par défaut
+
+        Args:
+            ecran: Écran concerné
+            noms: Variantes dans l'ordre par défaut
+
+        Returns:
+            Variantes dans l'ordre d'essai
+        """
+        preferee = self._ecran(ecran).get('preferee')
+        if preferee in noms:
+            return [preferee] + [nom for nom in noms if nom != preferee]
+        return list(noms)
+
+    def statistiques(self, ecran: str) -> Dict[str, Dict[str, int]]:
+        """Compteurs {variante: {'succes': n, 'echecs': n}} d'un écran"""
+        return self._ecran(ecran).get('variantes', {})
+
+    def sauvegarder(self):
+        """Écrire les statistiques de façon atomique si elles ont changé"""
+        if not self.modifie:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporaire = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump(self.donnees, f, ensure_ascii=False, indent=2)
+            os.replace(temporaire, self.path)
+            self.modifie = False
+        except Exception as e:
+            self.logger.warning(f"⚠️ Sauvegarde des stratégies impossible: {e}")
+
+    def _ecran(self, ecran: str) -> Dict[str, Any]:
+        """Entrée d'un écran pour la version de Sage courante"""
+        return self.donnees.setdefault(self.version, {}).setdefault(ecran, {})
+
+    def _noter(self, ecran: str, nom: str, succes: bool):
+        """Compter un essai ; une nouvelle gagnante est écrite tout de suite"""
+        entree = self._ecran(ecran)
+        compteurs = entree.setdefault('variantes', {}).setdefault(nom, {'succes': 0, 'echecs': 0})
+        compteurs['succes' if succes else 'echecs'] += 1
+        self.modifie = True
+
+        if succes and entree.get('preferee') != nom:
+            self.logger.info(f"🧭 Variante retenue pour {ecran}: {nom}")
+            entree['preferee'] = nom
+            self.sauvegarder()
+
+    def _charger(self) -> Dict[str, Dict[str, Any]]:
+        """Lire le fichier des statistiques (vide si absent ou illisible)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"⚠️ Stratégies illisibles, ignorées: {e}")
+            return {}
@@ -5,6 +5,7 @@ Lance ce script et laisse-le tourner en arrière-plan
 """
 import sys
 import time
+from datetime import datetime
 from pathlib import Path
 
 # Ajouter le dossier parent au path
@@ -14,6 +15,7 @@ from utils.queue_manager import get_next_task, update_task
 from modules.bonne_commande.bonne_commande_robot import BonneCommandeRobot
 from modules.receiption.ReceiptionRobot import ReceiptionRobot
 from core.logger import Logger
+from core.metrics import start_http_exporter, observe_task
 
 logger = Logger.get_logger('WorkerRPA', 'workers')
 
@@ -22,6 +24,9 @@ def main():
     logger.info("🚀 WORKER RPA DÉMARRÉ")
     logger.info("="*80)
     logger.info("En attente de tâches...")
+
+    # Exporteur /metrics local (profondeur de file, latences, navigateurs...)
+    start_http_exporter()
     
     while True:
         try:
@@ -37,6 +42,8 @@ def main():
                 logger.info(f"{'='*80}")
 
                 update_task(task['id'], "processing")
+                observe_task(task)
+                task['started_at'] = datetime.now().isoformat()
 
                 try:
                     # Lancer le robot approprié selon le type de tâche
@@ -52,10 +59,12 @@ def main():
                         raise ValueError(f"Type de tâche inconnu: {task_type}")
 
                     update_task(task['id'], "completed")
+                    observe_task(task, status="completed")
                     logger.info(f"✅ Tâche {task['id']} terminée avec succès")
 
                 except Exception as e:
                     update_task(task['id'], "failed", error=str(e))
+                    observe_task(task, status="failed")
                     logger.error(f"❌ Tâche {task['id']} échouée: {e}")
                     import traceback
                     logger.error(traceback.format_exc())